@@ -0,0 +1,142 @@
+import io
+import os
+import shutil
+import subprocess
+import time
+import pandas as pd
+from query_profiler import profiler
+from schema import LOCK_SCREW_SCHEMA, apply_schema
+
+try:
+    import pyodbc
+except ImportError:  # e.g. Linux hosts without the Access ODBC driver stack
+    pyodbc = None
+
+ACCESS_DRIVER = "Microsoft Access Driver (*.mdb, *.accdb)"
+
+# Column types every backend returns for LockScrewData (see schema.py)
+LOCK_SCREW_TYPES = LOCK_SCREW_SCHEMA
+
+def apply_types(df, types=LOCK_SCREW_TYPES):
+    """Cast the known columns of a frame so that every backend returns identical dtypes."""
+    # Text columns hold strings whatever type the driver returned, before they become categoricals
+    for col, dtype in types.items():
+        if col in df.columns and dtype == "category":
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str)).astype(object)
+    return apply_schema(df, types)
+
+class OdbcReader:
+    """Reads Access files through the Microsoft Access ODBC driver (Windows)."""
+
+    name = "odbc"
+
+    @staticmethod
+    def available():
+        return pyodbc is not None and ACCESS_DRIVER in pyodbc.drivers()
+
+    def query(self, file_path, query, params=None):
+        """
+        Connects to an Access database, executes a query, and returns the results as a DataFrame.
+
+        Parameters:
+            file_path (str): Full path to the Access database file (*.mdb or *.accdb).
+            query (str): SQL query to execute.
+            params (list, optional): Values bound to the `?` placeholders in the query.
+
+        Returns:
+            pandas.DataFrame: Query results as a DataFrame, or None on error.
+        """
+        try:
+            # Ensure the file exists
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"The file {file_path} does not exist.")
+            if pyodbc is None:
+                raise ImportError("pyodbc is not installed.")
+
+            # Define the connection string
+            conn_str = (
+                rf'DRIVER={{{ACCESS_DRIVER}}};'
+                rf'DBQ={file_path};'
+            )
+
+            # Establish the connection
+            conn = pyodbc.connect(conn_str)
+
+            # Execute the query and fetch results into a DataFrame (as pd.read_sql_query does)
+            started = time.perf_counter()
+            cursor = conn.cursor()
+            cursor.execute(query, params or [])
+            rows = cursor.fetchall()
+            fetched = time.perf_counter()
+            columns = [desc[0] for desc in cursor.description]
+            df = pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns, coerce_float=True)
+            profiler.record(f"access:{self.name}", query, df, fetched - started, time.perf_counter() - fetched)
+            # Close the connection
+            conn.close()
+
+            return df
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+    def read_table(self, file_path, table, time_col=None, since=None):
+        """Read a whole table, or only the rows with `time_col` >= `since`."""
+        if since is None:
+            df = self.query(file_path, f"SELECT * FROM {table}")
+        else:
+            df = self.query(file_path, f"SELECT * FROM {table} WHERE {time_col} >= ?", params=[since.to_pydatetime()])
+        return apply_types(df) if df is not None else None
+
+class MdbToolsReader:
+    """
+    Reads Access files with the mdbtools `mdb-export` command (Linux, no ODBC driver needed).
+    mdb-export always exports the full table, so `since` is applied after parsing.
+    """
+
+    name = "mdbtools"
+
+    @staticmethod
+    def available():
+        return shutil.which("mdb-export") is not None
+
+    def read_table(self, file_path, table, time_col=None, since=None):
+        """Read a whole table, or only the rows with `time_col` >= `since`."""
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"The file {file_path} does not exist.")
+            started = time.perf_counter()
+            result = subprocess.run(
+                ["mdb-export", "-D", "%Y-%m-%d %H:%M:%S", "-T", "%Y-%m-%d %H:%M:%S", file_path, table],
+                capture_output=True, check=True
+            )
+            exported = time.perf_counter()
+            string_cols = [col for col, dtype in LOCK_SCREW_TYPES.items() if dtype == "category"]
+            df = pd.read_csv(io.BytesIO(result.stdout), dtype={col: str for col in string_cols})
+            profiler.record(f"access:{self.name}", f"SELECT * FROM {table}", df, exported - started, time.perf_counter() - exported)
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+        # Filter before typing, so that categories only hold the values of the returned rows (as with ODBC)
+        if since is not None:
+            df = df[pd.to_datetime(df[time_col]) >= since].reset_index(drop=True)
+        return apply_types(df)
+
+READERS = {reader.name: reader for reader in (OdbcReader, MdbToolsReader)}
+
+def get_reader(name=None):
+    """
+    Return an Access reader backend.
+
+    Parameters:
+        name (str, optional): "odbc" or "mdbtools". Defaults to the SCREW_ACCESS_READER
+            environment variable, then to the first backend available on this host.
+    """
+    name = name or os.environ.get("SCREW_ACCESS_READER")
+    if name:
+        return READERS[name]()
+    for reader in READERS.values():
+        if reader.available():
+            return reader()
+    # Fall back to ODBC so that errors are reported the same way as before
+    return OdbcReader()
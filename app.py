@@ -16,6 +16,21 @@ if getattr(sys, 'frozen', False):
 else:
     cwd = os.path.dirname(os.path.abspath(__file__))  # If running as a script
     print(cwd)
+
+# Screw machine stations: {value: label}
+STATIONS = {
+    'station1': 'Station 1',
+    'station2': 'Station 2',
+    'station3': 'Station 3'
+}
+
+def station_file_path(station, selected_date):
+    """Return the database file of a station for the month of selected_date."""
+    if selected_date.strftime("%Y-%m") == datetime.datetime.now().strftime("%Y-%m"):
+        return os.path.join(cwd, f"{station}.accdb")  # Current month
+    year_month = selected_date.strftime("%Y%m")
+    return os.path.join(cwd, "DatabaseBackup", f"{station}-{year_month}.accdb")  # Historical data
+
 # App Layout
 app.layout = html.Div([
     # Header with Title, Date Picker, and Numbers
@@ -48,11 +63,7 @@ app.layout = html.Div([
                             html.Label("Select Station:", className="date-picker-label"),  # Match Date Picker label
                             dcc.Dropdown(
                                 id='station-dropdown',
-                                options=[
-                                    {'label': 'Station 1', 'value': 'station1'},
-                                    {'label': 'Station 2', 'value': 'station2'},
-                                    {'label': 'Station 3', 'value': 'station3'}
-                                ],
+                                options=[{'label': label, 'value': value} for value, label in STATIONS.items()],
                                 value='station1',  # Default selection
                                 clearable=False,
                                 className="station-dropdown"
@@ -120,6 +131,17 @@ app.layout = html.Div([
         ],
         className='graph-wrapper'
     ),
+    # Plant-wide overview comparing all stations
+    html.Div(
+        [
+            dcc.Graph(
+                id='station-overview-plot',
+                className='dcc-graph',
+                config={'displayModeBar': False}
+            )
+        ],
+        className='overview-container'
+    ),
     # Interval for periodic updates
     dcc.Interval(
         id='interval-component',
@@ -135,15 +157,13 @@ app.layout = html.Div([
     Input('station-dropdown', 'value')]  # Add station input
 )
 def refresh_data(n_intervals, selected_station):
-    global station_df
     selected_date = datetime.date.today()
     
     # Determine the database file path
     station_file = os.path.join(cwd, f"{selected_station}.accdb")
-    query = "SELECT * FROM LockScrewData"
     
-    # Refresh the data
-    station_df = su.query_access_db(station_file, query)
+    # Warm the shared cache (only rows newer than the last refresh are read)
+    su.load_station_cached(station_file)
 
     return selected_date.strftime('%Y-%m-%d')  # Keep the current date as default
 
@@ -161,42 +181,45 @@ def update_plots(selected_date, selected_station):
     selected_date = pd.to_datetime(selected_date)
     current_month = datetime.datetime.now().strftime("%Y-%m")
     selected_month = selected_date.strftime("%Y-%m")
+    station_file = station_file_path(selected_station, selected_date)
 
-    # Determine the correct database file path
-    if selected_month == current_month:
-        station_file = os.path.join(cwd, f"{selected_station}.accdb")  # Current month
-    else:
-        year_month = selected_date.strftime("%Y%m")
-        station_file = os.path.join(cwd, "DatabaseBackup", f"{selected_station}-{year_month}.accdb")  # Historical data
+    # Left and right tables are loaded and processed concurrently
+    summaries = su.summarize_stations({selected_station: station_file}, current_month=selected_month == current_month)
 
-    # Query the database
-    query = "SELECT * FROM LockScrewData"
-    df = su.query_access_db(station_file, query)
-    print(df)
-    # Process data
-    left_df = su.process_data(df, "Left")
-    right_df = su.process_data(df, "Right")
-    left_df = su.identify_sequences(left_df)
-    right_df = su.identify_sequences(right_df)
-    left_df = su.adjust_hour_per_sequence(left_df)
-    right_df = su.adjust_hour_per_sequence(right_df)
-    left_pass_summary = su.compute_pass_rate(left_df)
-    right_pass_summary = su.compute_pass_rate(right_df)
-    # Compute daily yield
-    left_yield = su.daily_yield(left_pass_summary, selected_date)
-    right_yield = su.daily_yield(right_pass_summary, selected_date)
-    # Generate plots
-    left_pass_plot = su.plot_pass_summary(left_pass_summary, "Left", selected_date)
-    right_pass_plot = su.plot_pass_summary(right_pass_summary, "Right", selected_date)
-
-    # Filter data for left and right tables
-    left_defect_df = su.filter_by_date_n_table(df, selected_date, "Left")
-    right_defect_df = su.filter_by_date_n_table(df, selected_date, "Right")
-    left_defect_plot = su.create_stacked_bar_chart(left_defect_df, "Left")
-    right_defect_plot = su.create_stacked_bar_chart(right_defect_df, "Right")
+    outputs = {}
+    for table_side in ("Left", "Right"):
+        summary = summaries.get((selected_station, table_side))
+        if summary is None:
+            # The station file could not be loaded (summarize_stations reported why)
+            message = f"No data for {STATIONS.get(selected_station, selected_station)} ({table_side} table)"
+            outputs[table_side] = ("N/A", su.empty_figure(message), su.empty_figure(message))
+            continue
+        pass_summary, defects = summary
+        # Compute daily yield and generate the plots
+        daily_yield = su.daily_yield(pass_summary, selected_date)
+        pass_plot = su.plot_pass_summary(pass_summary, table_side, selected_date)
+        # Filter hourly defect counts for the selected date
+        defect_plot = su.create_stacked_bar_chart(su.filter_defects_by_date(defects, selected_date), table_side)
+        outputs[table_side] = (daily_yield, pass_plot, defect_plot)
 
+    (left_yield, left_pass_plot, left_defect_plot), (right_yield, right_pass_plot, right_defect_plot) = outputs["Left"], outputs["Right"]
     return left_yield, right_yield, left_pass_plot, right_pass_plot, left_defect_plot, right_defect_plot
 
+@app.callback(
+    Output('station-overview-plot', 'figure'),
+    [Input('date-picker', 'date')]
+)
+def update_overview(selected_date):
+    selected_date = pd.to_datetime(selected_date)
+    current_month = datetime.datetime.now().strftime("%Y-%m")
+    station_files = {station: station_file_path(station, selected_date) for station in STATIONS}
+
+    # All stations (and both tables of each) are loaded and processed concurrently
+    summaries = su.summarize_stations(station_files, current_month=selected_date.strftime("%Y-%m") == current_month)
+    overview_df = su.station_yield_overview(summaries, selected_date)
+    overview_df["Station"] = overview_df["Station"].map(STATIONS)
+    return su.plot_station_overview(overview_df, selected_date)
+
 # Run the app
 if __name__ == '__main__':
     app.run_server(debug=False)
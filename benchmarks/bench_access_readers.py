@@ -0,0 +1,45 @@
+"""
+Read throughput of the Access reader backends available on this host (ODBC driver on
+Windows, mdbtools on Linux) on a station database, full reads and incremental reads of the
+last hour of records.
+
+Usage: python benchmarks/bench_access_readers.py <station.accdb> [table] [repeats]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+import access_reader as ar
+
+def timed(read, repeats):
+    best, df = None, None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        df = read()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df
+
+def main(file_path, table="LockScrewData", repeats=3):
+    readers = [reader() for reader in ar.READERS.values() if reader.available()]
+    if not readers:
+        print("No Access reader backend is available on this host.")
+        return
+    frames = {}
+    for reader in readers:
+        elapsed, df = timed(lambda: reader.read_table(file_path, table), repeats)
+        if df is None:
+            continue
+        frames[reader.name] = df
+        print(f"{reader.name:>9} full read: {len(df):>8} rows in {elapsed:.3f}s ({len(df) / elapsed:,.0f} rows/s)")
+        since = df["LockScrewTime"].max() - pd.Timedelta(hours=1)
+        elapsed, new_rows = timed(lambda: reader.read_table(file_path, table, "LockScrewTime", since), repeats)
+        print(f"{reader.name:>9} last hour: {len(new_rows):>8} rows in {elapsed:.3f}s")
+    if len(frames) == 2:
+        odbc, mdbtools = frames.values()
+        print("frames identical:", odbc.equals(mdbtools) and odbc.dtypes.equals(mdbtools.dtypes))
+
+if __name__ == "__main__":
+    main(sys.argv[1], *sys.argv[2:3], *(int(arg) for arg in sys.argv[3:4]))
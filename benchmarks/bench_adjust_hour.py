@@ -0,0 +1,35 @@
+"""
+adjust_hour_per_sequence on synthetic LockScrewData: the vectorized implementation on a
+month of boards, and the former per-group loop (tests/reference.py) on a smaller sample,
+since it takes minutes at month size.
+
+Usage: python benchmarks/bench_adjust_hour.py [month_boards] [reference_boards]
+"""
+import os
+import sys
+import time
+import warnings
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [root, os.path.join(root, "tests")]
+import reference
+import screw_utils as su
+from synthetic import lock_screw_records
+
+def timed(adjust, df):
+    started = time.perf_counter()
+    adjust(df.copy())
+    return time.perf_counter() - started
+
+def main(month_boards=20000, reference_boards=1000):
+    warnings.simplefilter("ignore", FutureWarning)
+    for n_boards in (reference_boards, month_boards):
+        df = su.identify_sequences(lock_screw_records(n_boards, seed=0))
+        vectorized = timed(su.adjust_hour_per_sequence, df)
+        line = f"{n_boards:>6} boards, {len(df):>7} rows: vectorized {vectorized:.3f}s"
+        if n_boards <= reference_boards:
+            line += f", per-group loop {timed(reference.adjust_hour_per_sequence, df):.3f}s"
+        print(line)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,44 @@
+"""
+Suggestion selection for a failure set: the per-row iterrows loop of algo.ipynb
+(tests/reference.py) against message_classifier.classify_messages.
+
+Runs on a synthetic set by default, or on exported CSVs (e.g. the April failure set):
+    python benchmarks/bench_message_classifier.py [failures.csv suggestions.csv]
+Failures need symptom_label and message columns, suggestions symptom_label and message.
+"""
+import os
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [root, os.path.join(root, "tests")]
+import pandas as pd
+import message_classifier as mc
+import reference
+from synthetic import failure_messages
+
+def main(failures_csv=None, suggestions_csv=None):
+    if failures_csv:
+        failures = pd.read_csv(failures_csv).dropna(subset=["message"])
+        suggestions = pd.read_csv(suggestions_csv)
+    else:
+        failures, suggestions = failure_messages(5000, list(mc.PATTERN_DICT) + ["other"])
+    groups = dict(tuple(suggestions.groupby("symptom_label")))
+
+    started = time.perf_counter()
+    expected = [
+        reference.select_best_message(groups[label], label, message, mc.PATTERN_DICT).name
+        if label in groups else None
+        for label, message in zip(failures["symptom_label"], failures["message"])
+    ]
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = mc.classify_messages(failures, suggestions)
+    bulk = time.perf_counter() - started
+
+    same = [None if value != value else value for value in result] == expected
+    print(f"{len(failures)} rows: iterrows loop {loop:.3f}s, classify_messages {bulk:.3f}s, identical: {same}")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
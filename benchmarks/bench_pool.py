@@ -0,0 +1,76 @@
+"""
+Per-query latency of a serial number lookup, three ways:
+    connect: a new psycopg2 connection per query (the former db_connect)
+    pooled: db_connect on the shared connection pool
+    prepared: db_query with a QueryTemplate prepared once per pooled connection
+
+Runs against DQ_TEST_DSN, or a throwaway local server started with pgserver.
+Usage: python benchmarks/bench_pool.py [n_queries]
+"""
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+import psycopg2
+from psycopg2 import pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data_query as dq
+from query_templates import QueryTemplate
+
+lookup_sql = "SELECT serial_number, station, result FROM bench_testingresult WHERE serial_number = %(sn)s"
+lookup_template = QueryTemplate("bench_lookup", lookup_sql, sn="text")
+
+def connect_per_query(dsn, sn):
+    conn = psycopg2.connect(dsn)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(lookup_sql, {"sn": sn})
+        result = cursor.fetchall()
+        columns = [desc[0] for desc in cursor.description]
+        return pd.DataFrame(result, columns=columns)
+    finally:
+        conn.close()
+
+def timed(run, serials):
+    started = time.perf_counter()
+    for sn in serials:
+        run(sn)
+    return (time.perf_counter() - started) / len(serials) * 1000
+
+def main(n_queries=500):
+    server = None
+    dsn = os.environ.get("DQ_TEST_DSN")
+    if not dsn:
+        import pgserver
+        server = pgserver.get_server(tempfile.mkdtemp(), cleanup_mode="stop")
+        dsn = server.get_uri()
+
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+        cursor.execute('''
+            DROP TABLE IF EXISTS bench_testingresult;
+            CREATE TABLE bench_testingresult AS
+            SELECT 'FWI' || lpad((i % 20000)::text, 5, '0') AS serial_number,
+                   'BB Functional Test' AS station, (i % 3 = 0)::int AS result
+            FROM generate_series(1, 200000) i;
+            CREATE INDEX ON bench_testingresult (serial_number);
+            ANALYZE bench_testingresult;
+        ''')
+    dq._pool = pool.ThreadedConnectionPool(1, 4, dsn)
+    serials = [f"FWI{i % 20000:05d}" for i in range(n_queries)]
+    try:
+        results = {
+            "connect": timed(lambda sn: connect_per_query(dsn, sn), serials),
+            "pooled": timed(lambda sn: dq.db_connect(lookup_sql, {"sn": sn}), serials),
+            "prepared": timed(lambda sn: dq.db_query(lookup_template, {"sn": sn}), serials),
+        }
+    finally:
+        dq.close_pool()
+        if server is not None:
+            server.cleanup()
+    for mode, latency in results.items():
+        print(f"{mode:>9}: {latency:.3f} ms/query")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
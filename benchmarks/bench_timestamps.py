@@ -0,0 +1,85 @@
+"""
+Client-side cost of loading timestamptz columns whose values span a DST change, three ways:
+    text: the former SUBSTRING(CAST(<ts> AS TEXT), 1, 19) string, parsed with pd.to_datetime
+    local session: native timestamps in a session running in DQ_TIMEZONE (mixed UTC offsets,
+        converted with pd.to_datetime(utc=True))
+    utc session: native timestamps in the UTC session data_query uses (one offset, loaded as
+        datetime64[ns, UTC] and converted with tz_convert)
+Each run fetches the rows, builds the DataFrame and normalizes it; fetch and build are reported apart.
+
+Runs against DQ_TEST_DSN, or a throwaway local server started with pgserver.
+Usage: python benchmarks/bench_timestamps.py [n_rows] [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import schema as sc
+
+TIMEZONE = os.environ.get("DQ_TIMEZONE") or "Europe/Berlin"
+
+native_sql = "SELECT date_trunc('second', testing_date) AS testing_date FROM bench_timestamps"
+text_sql = "SELECT SUBSTRING(CAST(testing_date AS TEXT), 1, 19) AS testing_date FROM bench_timestamps"
+
+def load(dsn, timezone, sql, parse):
+    conn = psycopg2.connect(dsn, options=f"-c timezone={timezone}")
+    try:
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        fetched = time.perf_counter()
+        df = pd.DataFrame(rows, columns=[desc[0] for desc in cursor.description])
+        df = parse(df)
+        return df, fetched - started, time.perf_counter() - fetched
+    finally:
+        conn.close()
+
+def parse_text(df):
+    df["testing_date"] = pd.to_datetime(df["testing_date"])
+    return df
+
+def main(n_rows=500000, repeats=3):
+    server = None
+    dsn = os.environ.get("DQ_TEST_DSN")
+    if not dsn:
+        import pgserver
+        server = pgserver.get_server(tempfile.mkdtemp(), cleanup_mode="stop")
+        dsn = server.get_uri()
+
+    sc.TIMEZONE = TIMEZONE
+    modes = {
+        "text": (TIMEZONE, text_sql, parse_text),
+        "local session": (TIMEZONE, native_sql, sc.normalize_timestamps),
+        "utc session": (sc.SESSION_TIMEZONE, native_sql, sc.normalize_timestamps),
+    }
+    try:
+        with psycopg2.connect(dsn) as conn, conn.cursor() as cursor:
+            # Three weeks around the 2024-03-31 change to summer time
+            cursor.execute('''
+                DROP TABLE IF EXISTS bench_timestamps;
+                CREATE TABLE bench_timestamps AS
+                SELECT TIMESTAMPTZ '2024-03-20 00:00:00+00' + (i * INTERVAL '3.6 seconds') AS testing_date
+                FROM generate_series(1, %(n_rows)s) i;
+            ''', {"n_rows": n_rows})
+        results, frames = {}, {}
+        for mode, (timezone, sql, parse) in modes.items():
+            runs = [load(dsn, timezone, sql, parse) for _ in range(repeats)]
+            frames[mode] = runs[0][0]
+            results[mode] = (min(run[1] for run in runs), min(run[2] for run in runs))
+    finally:
+        if server is not None:
+            server.cleanup()
+
+    print(f"{n_rows} rows, best of {repeats}, wall clock in {TIMEZONE}")
+    for mode, (fetch, build) in results.items():
+        print(f"{mode:>14}: fetch {fetch:.3f} s, build {build:.3f} s, total {fetch + build:.3f} s")
+    same = all(frame.equals(frames["text"]) for frame in frames.values())
+    print(f"identical frames: {same}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -1,29 +1,258 @@
 from env import credentials
-import psycopg2
+from psycopg2 import pool
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from collections import Counter, defaultdict
-import json
-
-def db_connect(query):
-    db = credentials["primary_db"]
-    conn = psycopg2.connect(
-        dbname=db["db_name"],
-        user=db["db_user"],
-        password=db["db_password"],
-        host=db["db_host"],
-        port=db["db_port"]
-    )
-    cursor = conn.cursor()
-    cursor.execute(query)
+from contextlib import contextmanager
+import threading
+import time
+import symptom_parser as sp
+import schema as sc
+from symptom_index import SymptomIndex, LabelSearchIndex
+from label_cycles import LabelCycleTracker
+from query_templates import QueryTemplate
+from query_profiler import profiler
+
+# Where create_repair_table, symptom_result and create_intel_table run: "remote" (Postgres)
+# or "local" (local_engine, on the cached extracts)
+engine = "remote"
+
+_pool = None
+# Sessions run in UTC, so timestamptz results load as one datetime64[ns, UTC] column (see schema.TIMEZONE)
+session_options = f"-c timezone={sc.SESSION_TIMEZONE}"
+_prepared = {}  # pooled connection -> names of the statements prepared on it
+# ThreadedConnectionPool.getconn raises PoolError as soon as maxconn connections are out, so
+# checkouts first take one of maxconn slots and wait (up to pool_timeout seconds) for a free one
+pool_timeout = 600
+_slots = None  # (pool, semaphore with one slot per connection of that pool)
+_slots_lock = threading.Lock()
+
+def get_pool():
+    """
+    Returns the process-wide connection pool, creating it on first use.
+    The maximum number of connections is read from `pool_size` in the primary_db credentials.
+    """
+    global _pool
+    if _pool is None:
+        db = credentials["primary_db"]
+        _pool = pool.ThreadedConnectionPool(
+            minconn=1,
+            maxconn=int(db.get("pool_size", 5)),
+            dbname=db["db_name"],
+            user=db["db_user"],
+            password=db["db_password"],
+            host=db["db_host"],
+            port=db["db_port"],
+            options=session_options
+        )
+    return _pool
+
+def close_pool():
+    """Closes every pooled connection (e.g. at the end of a notebook session)."""
+    global _pool
+    if _pool is not None:
+        _pool.closeall()
+        _pool = None
+    _prepared.clear()
+
+def _pool_slots(conn_pool):
+    """Semaphore bounding the connections checked out of `conn_pool` to its maxconn."""
+    global _slots
+    with _slots_lock:
+        if _slots is None or _slots[0] is not conn_pool:
+            _slots = (conn_pool, threading.BoundedSemaphore(conn_pool.maxconn))
+        return _slots[1]
+
+@contextmanager
+def db_cursor(name=None):
+    """
+    Checks a connection out of the pool and yields a cursor on it. When every connection is
+    in use (e.g. by refresh_concurrent workers) it waits for one to be returned.
+    The transaction is ended and the connection returned to the pool on exit, even on error
+    or when a generator holding the cursor is closed early.
+
+    Parameters:
+        name (str, optional): If given, a named (server-side) cursor is opened instead.
+    """
+    conn_pool = get_pool()
+    slots = _pool_slots(conn_pool)
+    if not slots.acquire(timeout=pool_timeout):
+        raise pool.PoolError(f"no free connection after {pool_timeout}s")
+    try:
+        conn = conn_pool.getconn()
+        try:
+            with conn.cursor(name=name) as cursor:
+                yield cursor
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn_pool.putconn(conn)
+    finally:
+        slots.release()
+
+def _execute(cursor, query, params=None, profile_query=None):
+    """
+    Executes `query` on `cursor` and returns the result as a DataFrame, recording the call
+    (under `profile_query`, default `query`) in query_profiler.profiler.
+    """
+    started = time.perf_counter()
+    cursor.execute(query, params)
     result = cursor.fetchall()
+    fetched = time.perf_counter()
     # Get column names
     columns = [desc[0] for desc in cursor.description]
-    # Convert to DataFrame
-    df = pd.DataFrame(result, columns=columns)
+    # Convert to DataFrame with native timestamps as datetime64
+    df = sc.normalize_timestamps(pd.DataFrame(result, columns=columns))
+    if profiler.enabled:
+        plan = None
+        if profiler.explain:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        profiler.record("postgres", profile_query or query, df, fetched - started, time.perf_counter() - fetched, plan)
     return df
 
+def db_connect(query, params=None, compact=False):
+    """
+    Runs `query` and returns the result as a DataFrame.
+    With compact=True the known columns are cast with schema.MANUFACTURING_SCHEMA
+    (categoricals, small ints, datetime64); group categorical columns with observed=True.
+    """
+    with db_cursor() as cursor:
+        df = _execute(cursor, query, params)
+    return sc.apply_schema(df) if compact else df
+
+def db_stream(query, params=None, itersize=50000):
+    """
+    Runs `query` on a named server-side cursor and yields the result as DataFrame chunks,
+    so peak memory is bounded by `itersize` rows regardless of the size of the result.
+
+    Parameters:
+        query (str): SQL query to execute.
+        params (tuple or dict, optional): Values bound to the query placeholders.
+        itersize (int): Number of rows fetched from the server per chunk.
+
+    Yields:
+        DataFrame: Up to `itersize` rows per chunk.
+    """
+    # DECLARE ... CURSOR FOR does not accept a trailing semicolon
+    query = query.strip().rstrip(";")
+    started = time.perf_counter()
+    wall_time = build_time = 0.0
+    n_rows = 0
+    with db_cursor(name="dq_stream") as cursor:
+        cursor.itersize = itersize
+        cursor.execute(query, params)
+        columns = None
+        try:
+            while True:
+                rows = cursor.fetchmany(itersize)
+                fetched = time.perf_counter()
+                wall_time += fetched - started
+                if not rows:
+                    break
+                if columns is None:
+                    columns = [desc[0] for desc in cursor.description]
+                chunk = sc.normalize_timestamps(pd.DataFrame(rows, columns=columns))
+                build_time += time.perf_counter() - fetched
+                n_rows += len(chunk)
+                yield chunk
+                # Time spent by the consumer between chunks is not counted
+                started = time.perf_counter()
+        finally:
+            # One record for the whole stream; bytes are not tracked since chunks are not kept
+            profiler.record("postgres", query, pd.DataFrame(index=range(n_rows)), wall_time, build_time)
+
+def db_stream_to_parquet(query, file_path, params=None, itersize=50000):
+    """
+    Streams the result of `query` straight into a Parquet file, one row group per chunk.
+    Requires pyarrow.
+
+    Returns:
+        int: Number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    total_rows = 0
+    try:
+        for chunk in db_stream(query, params=params, itersize=itersize):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(file_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            total_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total_rows
+
+def db_execute_prepared(name, query, params_list):
+    """
+    Prepares `query` once on a single pooled connection and executes it for every parameter tuple.
+
+    Parameters:
+        name (str): Name of the prepared statement.
+        query (str): SQL using Postgres positional placeholders ($1, $2, ...).
+        params_list (list of tuple): One tuple of values per execution.
+
+    Returns:
+        DataFrame: Results of all executions concatenated in order.
+    """
+    frames = []
+    with db_cursor() as cursor:
+        cursor.execute(f"PREPARE {name} AS {query}")
+        try:
+            for params in params_list:
+                placeholders = ", ".join(["%s"] * len(params))
+                frames.append(_execute(cursor, f"EXECUTE {name} ({placeholders})", params, profile_query=query))
+        except Exception:
+            # A failed EXECUTE aborts the transaction; roll back first so the DEALLOCATE can run
+            # (prepared statements outlive the rollback) and the original error is the one raised
+            cursor.connection.rollback()
+            cursor.execute(f"DEALLOCATE {name}")
+            raise
+        cursor.execute(f"DEALLOCATE {name}")
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def db_query(template, params, prepared=True, compact=False):
+    """
+    Runs a QueryTemplate with bound parameters.
+
+    Parameters:
+        template (QueryTemplate): Query to run.
+        params (dict): Parameter values by name (coerced to the declared types).
+        prepared (bool): PREPARE the template once per pooled connection and EXECUTE it, so
+            Postgres parses and plans it once instead of on every call.
+        compact (bool): Apply schema.MANUFACTURING_SCHEMA to the result (see db_connect).
+
+    Returns:
+        DataFrame: Query results.
+    """
+    params = template.bind(params)
+    with db_cursor() as cursor:
+        if not prepared:
+            df = _execute(cursor, template.sql, params)
+        else:
+            conn = cursor.connection
+            try:
+                if conn not in _prepared:
+                    cursor.execute("SELECT name FROM pg_prepared_statements")
+                    _prepared[conn] = {row[0] for row in cursor.fetchall()}
+                if template.name not in _prepared[conn]:
+                    cursor.execute(template.prepare_sql)
+                    _prepared[conn].add(template.name)
+                df = _execute(cursor, template.execute_sql, params, profile_query=template.sql)
+            except BaseException:
+                # Re-read the prepared statements of this connection on next use
+                _prepared.pop(conn, None)
+                raise
+    return sc.apply_schema(df) if compact else df
+
 def check_duplicate(df, col):
     duplicates_df = df.groupby(col).size().reset_index(name='count')
     duplicates_df = duplicates_df[duplicates_df['count'] > 1]
@@ -84,6 +313,124 @@ test_query = '''
             INNER JOIN unique_sn sn ON sn.serial_number = mtr.serial_number; 
 '''
 
+# Same population as test_query, aggregated server-side (one row per serial number / station)
+kpi_results_cte = '''
+            unique_sn AS (
+                SELECT DISTINCT sn.serial_number, wo.model_name, wo.build_type, wo.skuno
+                FROM public.manufacturing_serialnumber sn
+                INNER JOIN public.manufacturing_workorder wo ON wo.workorder_id = sn.workorder_id
+                WHERE wo.sap_release_date >= '2024-01-01' AND sn.completed = '1'
+            ),
+            test_results AS (
+                SELECT sn.model_name, sn.build_type, sn.skuno, mtr.serial_number, mtr.station,
+                       mtr.result AS test_result
+                FROM public.manufacturing_testingresult mtr
+                INNER JOIN unique_sn sn ON sn.serial_number = mtr.serial_number
+            )'''
+
+# One-time all-pass rate per (model_name, build_type, skuno): share of serial numbers whose
+# every test result is 1 (a NULL result does not count as a pass)
+allpass_kpi_query = f'''
+            WITH {kpi_results_cte},
+            sn_results AS (
+                SELECT model_name, build_type, skuno, serial_number,
+                       BOOL_AND(COALESCE(test_result = 1, FALSE)) AS all_pass
+                FROM test_results
+                WHERE model_name IS NOT NULL AND build_type IS NOT NULL AND skuno IS NOT NULL
+                GROUP BY model_name, build_type, skuno, serial_number
+            )
+            SELECT model_name, build_type, skuno,
+                   COUNT(*) AS total_sn,
+                   COUNT(*) FILTER (WHERE all_pass) AS passed_sn,
+                   (100.0 * COUNT(*) FILTER (WHERE all_pass) / COUNT(*))::float8 AS pass_percentage
+            FROM sn_results
+            GROUP BY model_name, build_type, skuno
+            ORDER BY model_name, build_type, skuno
+        '''
+
+# Failure rate per station for serial numbers with at least one non-passing result
+station_failure_kpi_query = f'''
+            WITH {kpi_results_cte},
+            repaired_sn AS (
+                SELECT serial_number
+                FROM test_results
+                GROUP BY serial_number
+                HAVING BOOL_OR(test_result IS DISTINCT FROM 1)
+            )
+            SELECT tr.model_name, tr.build_type, tr.skuno, tr.station,
+                   COUNT(tr.test_result) AS total_tests,
+                   COUNT(*) FILTER (WHERE tr.test_result = 0) AS failed_tests,
+                   ROUND(100.0 * COUNT(*) FILTER (WHERE tr.test_result = 0) / NULLIF(COUNT(tr.test_result), 0), 2)::float8 AS failure_percentage
+            FROM test_results tr
+            JOIN repaired_sn rs ON rs.serial_number = tr.serial_number
+            WHERE tr.model_name IS NOT NULL AND tr.build_type IS NOT NULL AND tr.skuno IS NOT NULL AND tr.station IS NOT NULL
+            GROUP BY tr.model_name, tr.build_type, tr.skuno, tr.station
+            ORDER BY tr.model_name, tr.build_type, tr.skuno, tr.station
+        '''
+
+# Materialized copies of the KPI queries: view name -> (query, unique key columns)
+KPI_VIEWS = {
+    "kpi_allpass_percentage": (allpass_kpi_query, ["model_name", "build_type", "skuno"]),
+    "kpi_station_failure_percentage": (station_failure_kpi_query, ["model_name", "build_type", "skuno", "station"]),
+}
+
+def create_kpi_views():
+    """
+    Creates the KPI materialized views (if missing) with the unique index that
+    REFRESH ... CONCURRENTLY needs. Requires CREATE rights on the schema.
+    """
+    with db_cursor() as cursor:
+        for view, (query, key_cols) in KPI_VIEWS.items():
+            cursor.execute(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {view} AS {query}")
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {view}_key ON {view} ({', '.join(key_cols)})")
+
+def refresh_kpi_views(concurrently=True):
+    """
+    Recomputes the KPI materialized views (e.g. nightly). With concurrently=True readers are
+    not blocked while the views are rebuilt.
+    """
+    option = " CONCURRENTLY" if concurrently else ""
+    with db_cursor() as cursor:
+        for view in KPI_VIEWS:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW{option} {view}")
+
+def allpass_percentage(materialized=False):
+    """
+    All-pass percentage per (model_name, build_type, skuno) for boards released after 2024,
+    computed in the database (input of plot_allpass_percentage).
+
+    Parameters:
+        materialized (bool): Read the kpi_allpass_percentage view (see create_kpi_views)
+            instead of aggregating the testing results now.
+
+    Returns:
+        DataFrame: model_name, build_type, skuno, total_sn, passed_sn, pass_percentage.
+    """
+    if materialized:
+        return db_connect("SELECT * FROM kpi_allpass_percentage ORDER BY model_name, build_type, skuno")
+    return db_connect(allpass_kpi_query)
+
+def station_failure_percentage(materialized=False, exclude_models=None):
+    """
+    Failure percentage per station and (model_name, build_type, skuno), over the boards with
+    at least one non-passing result, computed in the database (input of
+    plot_failure_percentage_by_model).
+
+    Parameters:
+        materialized (bool): Read the kpi_station_failure_percentage view instead.
+        exclude_models (list, optional): Model names to leave out (e.g. ['CONAN', 'Bondi Beach']).
+
+    Returns:
+        DataFrame: model_name, build_type, skuno, station, total_tests, failed_tests, failure_percentage.
+    """
+    if materialized:
+        failure_df = db_connect("SELECT * FROM kpi_station_failure_percentage ORDER BY model_name, build_type, skuno, station")
+    else:
+        failure_df = db_connect(station_failure_kpi_query)
+    if exclude_models:
+        failure_df = failure_df[~failure_df["model_name"].isin(exclude_models)].reset_index(drop=True)
+    return failure_df
+
 # For boards that released after 2024, plot the one-time all-pass rate 
 def plot_allpass_percentage(result_df):
     result_df_sorted = result_df.sort_values(by=['model_name', 'pass_percentage'], ascending=[True, False]).reset_index(drop=True)
@@ -184,14 +531,59 @@ def plot_failure_percentage_by_model(failure_df, model_names):
     plt.tight_layout()
     plt.show()
 
-def create_repair_table(sn, station):
-    final_query = f'''
+def symptom_lateral(alias="mtr", keep_empty=True):
+    """
+    SQL fragment that explodes `{alias}.symptom_info` into one row per symptom, with
+    symptom_key, symptom_label and symptom_msg trimmed and lowercased server-side.
+    Append it after the FROM/JOIN that introduces the testing result row; the columns are
+    available as sym.symptom_key, sym.symptom_label and sym.symptom_msg.
+
+    Parameters:
+        alias (str): Alias of manufacturing_testingresult in the outer query.
+        keep_empty (bool): Keep test rows without symptoms (with NULL symptom columns).
+    """
+    join = "LEFT JOIN LATERAL" if keep_empty else "JOIN LATERAL"
+    return f'''
+                    {join} (
+                        SELECT
+                            s.key AS symptom_key,
+                            LOWER(BTRIM(s.value->>'symptom_label', E' \\t\\r\\n')) AS symptom_label,
+                            LOWER(BTRIM(s.value->>'symptom_msg', E' \\t\\r\\n')) AS symptom_msg
+                        FROM jsonb_each(
+                            CASE WHEN jsonb_typeof({alias}.symptom_info::jsonb) = 'object'
+                                 THEN {alias}.symptom_info::jsonb ELSE '{{}}'::jsonb END
+                        ) s
+                    ) sym ON TRUE'''
+
+# Normalized (rowid, symptom_label, symptom_msg) relation joinable on manufacturing_testingresult.rowid
+# and manufacturing_repairmain.testing_result_id; create_symptom_view() materializes it as a view
+symptom_view_query = f'''
+            CREATE OR REPLACE VIEW testing_symptom AS
+            SELECT mtr.rowid, mtr.serial_number, mtr.station, mtr.result, mtr.testing_date,
+                   sym.symptom_key, sym.symptom_label, sym.symptom_msg
+            FROM manufacturing_testingresult mtr
+            {symptom_lateral("mtr", keep_empty=False)};
+        '''
+
+def create_symptom_view():
+    """Creates (or replaces) the testing_symptom view. Requires CREATE rights on the schema."""
+    with db_cursor() as cursor:
+        cursor.execute(symptom_view_query)
+
+def _repair_table_sql(normalized_symptoms):
+    if normalized_symptoms:
+        symptom_col = "mtr.rowid, sym.symptom_label"
+        symptom_join = symptom_lateral("mtr")
+    else:
+        symptom_col = "(SELECT STRING_AGG(value->>'symptom_label', ' | ') FROM jsonb_each(mtr.symptom_info::jsonb)) AS symptom_labels"
+        symptom_join = ""
+    return f'''
                     WITH serial_info AS (
                         -- Step 1: Get model_name, build_type, skuno for the given serial_number
                         SELECT wo.model_name, wo.build_type, wo.skuno
                         FROM public.manufacturing_l10serialnumberlog msn
                         JOIN public.manufacturing_workorder wo ON msn.workorder_id = wo.workorder_id
-                        WHERE msn.serial_number = {sn}
+                        WHERE msn.serial_number = %(sn)s
                         LIMIT 1  
                     ),
 
@@ -205,35 +597,80 @@ def create_repair_table(sn, station):
                     -- Step 4: Select required fields from manufacturing_testingresult
                     SELECT 
                         si.model_name, si.build_type, si.skuno, mtr.station, mtr.serial_number, 
-                        SUBSTRING(CAST(rd.created_at AS TEXT) FROM 1 FOR 19) AS repair_detail_created_at,
+                        date_trunc('second', rd.created_at) AS repair_detail_created_at,
                         rd.repair_code, 
                         mtr.result,
-                        (SELECT STRING_AGG(value->>'symptom_label', ' | ') FROM jsonb_each(mtr.symptom_info::jsonb)) AS symptom_labels
+                        {symptom_col}
                     FROM public.manufacturing_testingresult mtr
                     JOIN matching_serials ms ON mtr.serial_number = ms.serial_number
                     LEFT JOIN public.manufacturing_repairmain rm ON mtr.rowid = rm.testing_result_id
                     LEFT JOIN public.manufacturing_repairdetail rd ON rm.failure_sequence = rd.failure_sequence
-                    JOIN serial_info si ON TRUE
-                    WHERE mtr.station = {station};
+                    JOIN serial_info si ON TRUE{symptom_join}
+                    WHERE mtr.station = %(station)s;
                 '''
-    repair_table = db_connect(final_query)
+
+# create_repair_table queries keyed by normalized_symptoms
+repair_table_templates = {
+    False: QueryTemplate("dq_repair_table", _repair_table_sql(False), sn="text", station="text"),
+    True: QueryTemplate("dq_repair_table_normalized", _repair_table_sql(True), sn="text", station="text"),
+}
+
+def create_repair_table(sn, station, normalized_symptoms=False):
+    """
+    Returns the test/repair history at `station` of every serial number sharing the
+    model_name, build_type and skuno of `sn`.
+
+    By default symptoms are aggregated into a ' | '-separated `symptom_labels` string. With
+    normalized_symptoms=True each test row is repeated once per symptom with the trimmed,
+    lowercased `symptom_label` (and the testing result `rowid`) instead.
+    `sn` and `station` are bound as parameters; pre-quoted values ("'FWI2341-09108'") are still accepted.
+    """
+    if engine == "local":
+        import local_engine
+        return local_engine.create_repair_table(sn, station, normalized_symptoms)
+    repair_table = db_query(repair_table_templates[normalized_symptoms], {"sn": sn, "station": station})
     return repair_table
 
-def find_matching_repairs(repair_df, repair_sn):
+def find_matching_repairs(repair_df, repair_sn, index=None):
     """
     Finds matching serial numbers based on symptom labels and retrieves repair data,
     excluding rows where all results are 0.
     
     Parameters:
-        repair_df (DataFrame): The repair dataset containing serial_number, symptom_labels, and result.
+        repair_df (DataFrame): The repair dataset containing serial_number, symptom_labels, and result,
+            or the normalized form (one row per symptom_label) from create_repair_table(..., normalized_symptoms=True).
         repair_sn (str): The target serial number for finding symptom label matches.
+        index (SymptomIndex, optional): Index built from repair_df. When given, the lookup only
+            touches the rows of the matching serial numbers instead of scanning the whole table.
     
     Returns:
         DataFrame: Filtered repair dataset containing matching serial numbers with relevant repair history.
     """
+    if index is not None:
+        target_sn = repair_sn.replace("'", "")
+        symptom_set = index.labels_for(target_sn)
+        match_df = repair_df.iloc[index.rows_for(index.matching_serials(target_sn))]
+        valid_sn = match_df.loc[match_df["result"] != 0, "serial_number"].unique()
+        match_df = match_df[match_df["serial_number"].isin(valid_sn)]
+        if "symptom_labels" in match_df.columns:
+            match_df["symptom_labels"] = match_df["symptom_labels"].apply(
+                lambda x: "|".join(sorted(set(l.strip().lower() for l in x.split('|')))) if isinstance(x, str) else x
+            )
+        return symptom_set, match_df
+
     # Step 1: Remove rows where result = 1
     filtered_df = repair_df[repair_df["result"] != 1]
 
+    # Normalized symptoms are already trimmed and lowercased server-side: no string splitting needed
+    if "symptom_label" in repair_df.columns:
+        target_sn = repair_sn.replace("'", "")
+        symptom_set = set(filtered_df.loc[filtered_df["serial_number"] == target_sn, "symptom_label"].dropna())
+        matching_sn = filtered_df.loc[filtered_df["symptom_label"].isin(symptom_set), "serial_number"].unique()
+        matching_sn = [sn for sn in matching_sn if sn != target_sn]
+        match_df = repair_df[repair_df["serial_number"].isin(matching_sn)]
+        valid_sn = match_df.loc[match_df["result"] != 0, "serial_number"].unique()
+        return symptom_set, match_df[match_df["serial_number"].isin(valid_sn)]
+
     # Step 2: Get symptom labels for the given serial number (excluding NaN values)
     filtered_labels = filtered_df.loc[
         filtered_df['serial_number'] == repair_sn.replace("'", ""), 'symptom_labels'
@@ -271,8 +708,19 @@ def find_matching_repairs(repair_df, repair_sn):
 
     return symptom_set, match_df
 
-def symptom_result(repair_sn):
-    query = f'''
+def find_matching_repairs_batch(repair_df, repair_sns, index=None):
+    """
+    Runs find_matching_repairs for many serial numbers (e.g. every failing board on a line)
+    against one repair table, building the SymptomIndex only once.
+
+    Returns:
+        dict: {serial_number: (symptom_set, match_df)}
+    """
+    index = index if index is not None else SymptomIndex.from_repair_table(repair_df)
+    return {sn: find_matching_repairs(repair_df, sn, index=index) for sn in repair_sns}
+
+# Failed tests of one or more serial numbers with their repair details
+symptom_result_template = QueryTemplate("dq_symptom_result", '''
             SELECT 
                 mtr.serial_number,
                 mtr.station,
@@ -284,11 +732,17 @@ def symptom_result(repair_sn):
             FROM manufacturing_testingresult mtr
             LEFT JOIN public.manufacturing_repairmain rm ON mtr.rowid = rm.testing_result_id
             LEFT JOIN public.manufacturing_repairdetail rd ON rm.failure_sequence = rd.failure_sequence
-            WHERE mtr.serial_number = {repair_sn} 
+            WHERE mtr.serial_number = ANY(%(serial_numbers)s) 
             AND mtr.result = 0  -- Filtering failed tests only
-            ORDER BY mtr.test_end_time ASC;
-            '''
-    symptom_table = db_connect(query)
+            ORDER BY mtr.serial_number, mtr.test_end_time ASC;
+            ''', serial_numbers="text[]")
+
+def symptom_result(repair_sn):
+    """Failed tests (with repair details) of one serial number, or of a list of serial numbers."""
+    if engine == "local":
+        import local_engine
+        return local_engine.symptom_result(repair_sn)
+    symptom_table = db_query(symptom_result_template, {"serial_numbers": repair_sn})
     return symptom_table
 
 def count_symptom_occurrences_with_repairs(result_df):
@@ -302,95 +756,171 @@ def count_symptom_occurrences_with_repairs(result_df):
     Returns:
         DataFrame: Aggregated count of unique symptom_msg and symptom_label combinations, along with repair details.
     """
-    # Dictionary to count occurrences and collect repair details
-    symptom_data_dict = {}
-
-    for _, row in result_df.iterrows():
-        # Parse symptom_info JSON (handle cases where it's not a valid JSON string)
-        try:
-            symptom_data = json.loads(row["symptom_info"]) if isinstance(row["symptom_info"], str) else row["symptom_info"]
-        except json.JSONDecodeError:
-            symptom_data = {}
-
-        if isinstance(symptom_data, dict):
-            unique_symptoms = set()
-            for _, symptom in symptom_data.items():
-                symptom_msg = symptom.get("symptom_msg", "N/A").strip()
-                symptom_label = symptom.get("symptom_label", "N/A").strip()
-                unique_symptoms.add((symptom_msg, symptom_label))
-
-            # Store repair details
-            for symptom_pair in unique_symptoms:
-                if symptom_pair not in symptom_data_dict:
-                    symptom_data_dict[symptom_pair] = {
-                        "occurrence_count": 0,
-                        "repair_codes": set(),
-                        "repair_descriptions": set()
-                    }
-
-                symptom_data_dict[symptom_pair]["occurrence_count"] += 1
-                if pd.notna(row["repair_code"]):
-                    symptom_data_dict[symptom_pair]["repair_codes"].add(row["repair_code"])
-                if pd.notna(row["repaired_description"]):
-                    symptom_data_dict[symptom_pair]["repair_descriptions"].add(row["repaired_description"])
-
-    # Convert to DataFrame
-    symptom_count_df = pd.DataFrame(
-        [{
-            "symptom_msg": msg,
-            "symptom_label": label,
-            "occurrence_count": data["occurrence_count"],
-            "repair_codes": "|".join(sorted(data["repair_codes"])) if data["repair_codes"] else "N/A",
-            "repair_descriptions": "|".join(sorted(data["repair_descriptions"])) if data["repair_descriptions"] else "N/A"
-        } for (msg, label), data in symptom_data_dict.items()]
-    )
+    # Explode symptom_info into one row per (row, symptom) and keep unique pairs per row
+    _, long = sp.explode_symptom_info(result_df["symptom_info"])
+    pairs = pd.DataFrame({
+        "row_id": long["row_id"],
+        "symptom_msg": sp.normalize_text(long["msg"], "N/A"),
+        "symptom_label": sp.normalize_text(long["label"], "N/A"),
+    }).drop_duplicates()
+
+    # Attach the repair details of the row each symptom came from
+    pairs["repair_code"] = result_df["repair_code"].to_numpy()[pairs["row_id"].to_numpy()]
+    pairs["repaired_description"] = result_df["repaired_description"].to_numpy()[pairs["row_id"].to_numpy()]
+
+    def join_unique(values):
+        unique_values = sorted(set(values.dropna()))
+        return "|".join(unique_values) if unique_values else "N/A"
+
+    symptom_count_df = pairs.groupby(["symptom_msg", "symptom_label"], sort=False).agg(
+        occurrence_count=("row_id", "size"),
+        repair_codes=("repair_code", join_unique),
+        repair_descriptions=("repaired_description", join_unique)
+    ).reset_index()
 
     # Sort by occurrence count in descending order
     symptom_count_df = symptom_count_df.sort_values(by="occurrence_count", ascending=False).reset_index(drop=True)
 
     return symptom_count_df
 
-def create_intel_table(sn):
-    query = f'''
+# Model/build/sku of many serial numbers in one round trip
+serial_info_template = QueryTemplate("dq_serial_info", '''
+            SELECT DISTINCT ON (msn.serial_number)
+                msn.serial_number, wo.model_name, wo.build_type, wo.skuno
+            FROM public.manufacturing_l10serialnumberlog msn
+            JOIN public.manufacturing_workorder wo ON msn.workorder_id = wo.workorder_id
+            WHERE msn.serial_number = ANY(%(serial_numbers)s);
+        ''', serial_numbers="text[]")
+
+# create_repair_table for one (model_name, build_type, skuno, station) group
+repair_group_template = QueryTemplate("dq_repair_group", '''
+            WITH matching_serials AS (
+                SELECT DISTINCT msn.serial_number
+                FROM public.manufacturing_l10serialnumberlog msn
+                JOIN public.manufacturing_workorder wo ON msn.workorder_id = wo.workorder_id
+                WHERE wo.model_name = %(model_name)s AND wo.build_type = %(build_type)s AND wo.skuno = %(skuno)s
+            )
+            SELECT 
+                %(model_name)s AS model_name, %(build_type)s AS build_type, %(skuno)s AS skuno,
+                mtr.station, mtr.serial_number, 
+                date_trunc('second', rd.created_at) AS repair_detail_created_at,
+                rd.repair_code, 
+                mtr.result,
+                (SELECT STRING_AGG(value->>'symptom_label', ' | ') FROM jsonb_each(mtr.symptom_info::jsonb)) AS symptom_labels
+            FROM public.manufacturing_testingresult mtr
+            JOIN matching_serials ms ON mtr.serial_number = ms.serial_number
+            LEFT JOIN public.manufacturing_repairmain rm ON mtr.rowid = rm.testing_result_id
+            LEFT JOIN public.manufacturing_repairdetail rd ON rm.failure_sequence = rd.failure_sequence
+            WHERE mtr.station = %(station)s;
+        ''', model_name="text", build_type="text", skuno="text", station="text")
+
+def serial_info(serial_numbers):
+    """model_name, build_type and skuno of each serial number (one row per serial number with a work order)."""
+    if engine == "local":
+        import local_engine
+        return local_engine.serial_info(serial_numbers)
+    return db_query(serial_info_template, {"serial_numbers": serial_numbers})
+
+def repair_group_table(model_name, build_type, skuno, station):
+    """create_repair_table for every serial number of one (model_name, build_type, skuno) at `station`."""
+    if engine == "local":
+        import local_engine
+        return local_engine.repair_group_table(model_name, build_type, skuno, station)
+    return db_query(repair_group_template, {
+        "model_name": model_name, "build_type": build_type, "skuno": skuno, "station": station
+    })
+
+def recommend_repairs_batch(repair_sns, station):
+    """
+    Repair recommendations for many failing boards at once (e.g. a whole shift at the repair station).
+
+    Serial numbers are grouped by (model_name, build_type, skuno, station) and one repair table
+    query is issued per group instead of one create_repair_table call per serial number.
+    Symptom history for all serial numbers is fetched in a single query.
+
+    Parameters:
+        repair_sns (list): Serial numbers (quoted or unquoted).
+        station (str or dict): Station for all serial numbers, or {serial_number: station}.
+
+    Returns:
+        dict: {serial_number: {"symptoms": set, "matching_repairs": DataFrame, "symptom_counts": DataFrame}}
+            Serial numbers without a work order or without a station are left out and listed
+            in a printed message.
+    """
+    serial_numbers = [sn.replace("'", "") for sn in repair_sns]
+    if isinstance(station, dict):
+        stations = {sn.replace("'", ""): st.replace("'", "") for sn, st in station.items()}
+    else:
+        stations = {sn: station.replace("'", "") for sn in serial_numbers}
+
+    info = serial_info(serial_numbers)
+    info["station"] = info["serial_number"].map(stations)
+
+    no_work_order = sorted(set(serial_numbers) - set(info["serial_number"]))
+    no_station = sorted(info.loc[info["station"].isna(), "serial_number"])
+    if no_work_order:
+        print(f"No work order found for: {', '.join(no_work_order)}")
+    if no_station:
+        print(f"No station given for: {', '.join(no_station)}")
+
+    symptom_df = symptom_result(serial_numbers)
+    symptom_groups = dict(tuple(symptom_df.groupby("serial_number")))
+
+    results = {}
+    group_cols = ["model_name", "build_type", "skuno", "station"]
+    for (model_name, build_type, skuno, group_station), group in info.groupby(group_cols):
+        repair_df = repair_group_table(model_name, build_type, skuno, group_station)
+        matches = find_matching_repairs_batch(repair_df, group["serial_number"].tolist())
+        for sn, (symptom_set, match_df) in matches.items():
+            sn_symptoms = symptom_groups.get(sn, symptom_df.iloc[0:0])
+            results[sn] = {
+                "symptoms": symptom_set,
+                "matching_repairs": match_df,
+                "symptom_counts": count_symptom_occurrences_with_repairs(sn_symptoms.reset_index(drop=True)),
+            }
+    return results
+
+# Full test/repair history of one or more serial numbers
+intel_table_template = QueryTemplate("dq_intel_table", '''
         SELECT mtr.serial_number, wo.model_name, wo.build_type, wo.skuno, mtr.station, mtr.result,
-                SUBSTRING(CAST(mtr.test_start_time AS TEXT) FROM 1 FOR 19) test_start_time,
-                SUBSTRING(CAST(mtr.test_end_time AS TEXT) FROM 1 FOR 19) test_end_time,
-                SUBSTRING(CAST(rm.repaired_date AS TEXT) FROM 1 FOR 19) repaired_date,
+                date_trunc('second', mtr.test_start_time) test_start_time,
+                date_trunc('second', mtr.test_end_time) test_end_time,
+                date_trunc('second', rm.repaired_date) repaired_date,
                 mtr.symptom_info, rd.repair_code,rd.repaired_description 
         FROM manufacturing_testingresult mtr
         LEFT JOIN public.manufacturing_repairmain rm ON mtr.rowid = rm.testing_result_id
         LEFT JOIN public.manufacturing_repairdetail rd ON rm.failure_sequence = rd.failure_sequence
         LEFT JOIN public.manufacturing_serialnumber msn ON mtr.serial_number = msn.serial_number
         LEFT JOIN public.manufacturing_workorder wo ON msn.workorder_id = wo.workorder_id
-        WHERE mtr.serial_number = {sn} 
-        ORDER BY mtr.test_end_time, rm.repaired_date;
-        '''
-    idt_df = db_connect(query)
+        WHERE mtr.serial_number = ANY(%(serial_numbers)s) 
+        ORDER BY mtr.serial_number, mtr.test_end_time, rm.repaired_date;
+        ''', serial_numbers="text[]")
+
+def create_intel_table(sn):
+    """Test/repair history of one serial number, or of a list of serial numbers."""
+    if engine == "local":
+        import local_engine
+        return local_engine.create_intel_table(sn)
+    idt_df = db_query(intel_table_template, {"serial_numbers": sn})
     return idt_df
 
 def extract_symptom_info(result_df):
     result_df_copy = result_df.copy()
-    symptom_count_dicts = []
-
-    for _, row in result_df_copy.iterrows():
-        # Parse symptom_info JSON (handle cases where it's None, empty, or not a valid JSON)
-        try:
-            symptom_data = json.loads(row["symptom_info"]) if isinstance(row["symptom_info"], str) else row["symptom_info"]
-        except json.JSONDecodeError:
-            symptom_data = {}
-
-        symptom_counter = Counter()  # Dictionary to store counts of label: message pairs
 
-        if isinstance(symptom_data, dict) and symptom_data:
-            for _, symptom in symptom_data.items():
-                msg = symptom.get("symptom_msg", "N/A").strip().lower()
-                label = symptom.get("symptom_label", "N/A").strip().lower()
-                symptom_counter[(label, msg)] += 1  # Increment count for each (label, msg) pair
+    # Count (label, message) pairs per row from the exploded symptom table
+    _, long = sp.explode_symptom_info(result_df_copy["symptom_info"])
+    pair_counts = pd.DataFrame({
+        "row_id": long["row_id"],
+        "label": sp.normalize_text(long["label"], "N/A", lower=True),
+        "msg": sp.normalize_text(long["msg"], "N/A", lower=True),
+    }).groupby(["row_id", "label", "msg"], sort=False).size()
 
-        symptom_count_dicts.append(dict(symptom_counter) if symptom_counter else "N/A")
+    symptom_count_dicts = [{} for _ in range(len(result_df_copy))]
+    for (row_id, label, msg), count in pair_counts.items():
+        symptom_count_dicts[row_id][(label, msg)] = int(count)
 
     # Add extracted dictionary as a new column
-    result_df_copy["symptom_count_dict"] = symptom_count_dicts
+    result_df_copy["symptom_count_dict"] = [d if d else "N/A" for d in symptom_count_dicts]
 
     # Drop the original symptom_info column
     result_df_copy = result_df_copy.drop(columns=["symptom_info"])
@@ -416,145 +946,104 @@ def process_symptom_info(df):
        - `empty_message_flag`: True if `symptom_label` exists but has an empty `symptom_msg`.
     """
 
-    symptom_dicts = []  # Store extracted symptom dictionaries
-    no_match_flags = []  # Store flags for unmatched failure descriptions
-    empty_symptom_flags = []  # Flag for empty symptom_info but with failure_description
-    empty_message_flags = []  # Flag for cases where label exists but message is empty
-
-    for _, row in df.iterrows():
-        result = row["result"]
-        failure_desc = row["failure_description"]  # Get failure_description
-        symptom_info = row["symptom_info"]  # Get symptom_info JSON
-
-        # Parse symptom_info safely
-        if pd.isna(symptom_info):  # Handle NaN symptom_info
-            symptom_data = None
-        else:
-            try:
-                symptom_data = json.loads(symptom_info) if isinstance(symptom_info, str) else symptom_info
-            except json.JSONDecodeError:
-                symptom_data = {}
-
-        symptom_dict = {}  # Dictionary to store {label: [messages]}
-        matched = False  # Flag to check if failure_description matches any label
-        empty_symptom = symptom_data is None or (isinstance(symptom_data, dict) and len(symptom_data) == 0)
-        empty_message = False  # Flag for cases where label exists but message is empty
-
-        # If symptom_info is NaN or empty but failure_description exists
-        if empty_symptom and not pd.isna(failure_desc):
-            symptom_dict[failure_desc.strip().lower()] = ""
-            empty_symptom_flags.append(True)
-        else:
-            empty_symptom_flags.append(False)
-
-        # If result == 0 and no failure_description -> Extract ALL symptom labels/messages
-        if result == 0 and pd.isna(failure_desc) and isinstance(symptom_data, dict):
-            for _, symptom in symptom_data.items():
-                label = symptom.get("symptom_label", "").strip().lower()
-                msg = symptom.get("symptom_msg", "").strip().lower()
-                if label and msg:
-                    symptom_dict.setdefault(label, []).append(msg)
-                elif label and not msg:  # If label exists but message is empty
-                    symptom_dict[label] = [""]
-                    empty_message = True
-
-        # If result == 0 and failure_description exists -> Match failure_description to symptom_label
-        elif result == 0 and not pd.isna(failure_desc) and isinstance(symptom_data, dict):
-            for _, symptom in symptom_data.items():
-                label = symptom.get("symptom_label", "").strip().lower()
-                msg = symptom.get("symptom_msg", "").strip().lower()
-
-                if failure_desc.strip().lower() == label and msg:
-                    symptom_dict.setdefault(label, []).append(msg)
-                    matched = True
-                elif failure_desc.strip().lower() == label and not msg:  # Label matches but message is empty
-                    symptom_dict[label] = [""]
-                    matched = True
-                    empty_message = True
-
-            # If no match was found, convert symptom_info to {failure_description: {label: message}}
-            if not matched:
-                converted_dict = {}
-                for _, symptom in symptom_data.items():
-                    label = symptom.get("symptom_label", "").strip().lower()
-                    msg = symptom.get("symptom_msg", "").strip().lower()
-                    if label and msg:
-                        converted_dict[label] = msg
-                    elif label and not msg:
-                        converted_dict[label] = ""  # If message is empty, store empty string
-                        empty_message = True
-                symptom_dict[failure_desc.strip().lower()] = converted_dict
-
-        # Convert list of messages to unique sorted messages
-        symptom_dict = {label: sorted(set(messages)) if isinstance(messages, list) else messages 
-                        for label, messages in symptom_dict.items()}
-        
-        symptom_dicts.append(symptom_dict if symptom_dict else "N/A")
-        no_match_flags.append(not matched)  # True if no match found, False otherwise
-        empty_message_flags.append(empty_message)  # True if label exists but message is empty
+    n_rows = len(df)
+    meta, long = sp.explode_symptom_info(df["symptom_info"])
+    long["label"] = sp.normalize_text(long["label"], "", lower=True)
+    long["msg"] = sp.normalize_text(long["msg"], "", lower=True)
+
+    result_zero = (df["result"] == 0).to_numpy()
+    has_failure = df["failure_description"].notna().to_numpy()
+    failure_label = df["failure_description"].map(lambda x: x.strip().lower() if isinstance(x, str) else None).to_numpy()
+    is_dict = (meta["kind"] == "dict").to_numpy()
+
+    # symptom_info is NaN or an empty dictionary
+    empty_symptom = (meta["kind"] == "null").to_numpy() | (is_dict & (meta["n_keys"] == 0).to_numpy())
+    # result == 0 and no failure_description -> all symptom labels/messages
+    collect_all = result_zero & ~has_failure & is_dict
+    # result == 0 and failure_description exists -> match failure_description to symptom_label
+    match_failure = result_zero & has_failure & is_dict
+
+    row_ids = long["row_id"].to_numpy()
+    long["failure_label"] = failure_label[row_ids]
+    all_items = long[collect_all[row_ids] & (long["label"] != "").to_numpy()]
+    matched_items = long[match_failure[row_ids] & (long["label"] == long["failure_label"]).to_numpy()]
+
+    matched = np.zeros(n_rows, dtype=bool)
+    matched[matched_items["row_id"].unique()] = True
+    # No match -> keep every labelled symptom as {failure_description: {label: message}}
+    converted_items = long[match_failure[row_ids] & ~matched[row_ids] & (long["label"] != "").to_numpy()]
+
+    empty_message = np.zeros(n_rows, dtype=bool)
+    for items in (all_items, matched_items, converted_items):
+        empty_message[items.loc[items["msg"] == "", "row_id"].unique()] = True
+
+    def label_messages(items):
+        """Unique sorted messages per (row, label); an empty message resets the label to [""]."""
+        keys = [items["row_id"], items["label"]]
+        last_empty = items["seq"].where(items["msg"] == "").groupby(keys).transform("max")
+        kept = items[last_empty.isna() | (items["seq"] >= last_empty)]
+        messages = kept.groupby(["row_id", "label"], sort=False)["msg"].agg(lambda s: sorted(set(s)))
+        # Labels keep the position of their first occurrence
+        order = items.drop_duplicates(["row_id", "label"])[["row_id", "label"]].itertuples(index=False)
+        return [(row_id, label, messages[(row_id, label)]) for row_id, label in order]
+
+    symptom_dicts = [{} for _ in range(n_rows)]
+
+    # If symptom_info is NaN or empty but failure_description exists
+    for row_id in np.flatnonzero(empty_symptom & has_failure):
+        symptom_dicts[row_id][failure_label[row_id]] = ""
+
+    for row_id, label, messages in label_messages(all_items) + label_messages(matched_items):
+        symptom_dicts[row_id][label] = messages
+
+    converted = converted_items.groupby(["row_id", "label"], sort=False)["msg"].last()
+    converted_dicts = {row_id: {} for row_id in np.flatnonzero(match_failure & ~matched)}
+    for (row_id, label), msg in converted.items():
+        converted_dicts[row_id][label] = msg
+    for row_id, converted_dict in converted_dicts.items():
+        symptom_dicts[row_id][failure_label[row_id]] = converted_dict
 
     # Add new columns to DataFrame
-    df["symptom_dict"] = symptom_dicts
-    df["no_match_flag"] = no_match_flags  # Add the no match flag
-    df["empty_symptom_flag"] = empty_symptom_flags  # Add the empty symptom flag
-    df["empty_message_flag"] = empty_message_flags  # Add the empty message flag
+    df["symptom_dict"] = [d if d else "N/A" for d in symptom_dicts]
+    df["no_match_flag"] = ~matched  # True if no match found, False otherwise
+    df["empty_symptom_flag"] = empty_symptom & has_failure  # Add the empty symptom flag
+    df["empty_message_flag"] = empty_message  # True if label exists but message is empty
     df['isRepair'] = (df["result"] == 0) & df["failure_description"].notna()
 
     return df.drop(columns=['result'])
 
-def compute_label_cycles(df):
+def compute_label_cycles(df, tracker=None):
     """
     Computes cycle counts for each label in `symptom_dict` for each serial_number.
 
     Adds:
     - `label_cycle`: Count of occurrences of each label per serial_number.
     - `label_message_cycle`: Count of occurrences of each (label, message) pair per serial_number.
-    """
-
-    # Sort the DataFrame by serial_number to ensure correct order
-    df = df.sort_values(by=["serial_number"]).reset_index(drop=True)
-
-    # Store label and label-message cycle counts per serial_number
-    label_count_history = defaultdict(lambda: defaultdict(int))
-    label_message_count_history = defaultdict(lambda: defaultdict(int))
-
-    label_cycles = []
-    label_message_cycles = []
-
-    for _, row in df.iterrows():
-        serial_number = row["serial_number"]
-        symptom_dict = row["symptom_dict"]  # Expected to be {label: [messages]}
-
-        label_cycle_dict = {}
-        label_message_cycle_dict = {}
 
-        if isinstance(symptom_dict, dict):
-            for label, messages in symptom_dict.items():
-                # Ensure messages are treated as a list
-                if isinstance(messages, str):
-                    messages = [messages]
-
-                # Update label cycle count
-                label_count_history[serial_number][label] += 1
-                label_cycle_dict[label] = label_count_history[serial_number][label]
-
-                for msg in messages:
-                    label_msg_key = (label, msg)  # Use tuple instead of string concatenation
-                    label_message_count_history[serial_number][label_msg_key] += 1
-                    label_message_cycle_dict[label_msg_key] = label_message_count_history[serial_number][label_msg_key]
-
-        # Store results
-        label_cycles.append(label_cycle_dict)
-        label_message_cycles.append(label_message_cycle_dict)
-
-    # Add new columns to DataFrame
-    df["label_cycle"] = label_cycles
-    df["label_message_cycle"] = label_message_cycles
+    Parameters:
+        df (DataFrame): Output of process_symptom_info.
+        tracker (LabelCycleTracker, optional): Persisted counters to continue from (e.g. loaded
+            with LabelCycleTracker.load() and saved again after the run), so only new failures
+            have to be processed. Defaults to a fresh tracker, i.e. counting from scratch.
+    """
+    tracker = tracker if tracker is not None else LabelCycleTracker()
+    df = tracker.ingest(df)
     df = df.drop(columns=['symptom_info', 'symptom_dict', 'failure_description', 'isRepair', 'no_match_flag', 'empty_symptom_flag', 'empty_message_flag'])
     return df
 
-def search_label(df, keyword):
-    filtered_df = df[df["label_cycle"].apply(lambda x: any(keyword in label for label in x.keys()))]
+def search_label(df, keyword, how="or", match="substring", index=None):
+    """
+    Returns the rows of a compute_label_cycles result with a label containing `keyword`.
+
+    Parameters:
+        df (DataFrame): compute_label_cycles output.
+        keyword (str or list): Keyword(s); several keywords are combined with `how` ("or"/"and").
+        match (str): "substring", "regex" or "token" matching against the labels.
+        index (LabelSearchIndex, optional): Index built once with LabelSearchIndex.from_frame(df)
+            and reused across searches of the same df.
+    """
+    index = index if index is not None else LabelSearchIndex.from_frame(df)
+    filtered_df = df.iloc[index.search(keyword, how=how, match=match)]
     return filtered_df
 
 
@@ -564,83 +1053,122 @@ def search_label(df, keyword):
 
 
 
+# Lower bound of every extract; the *_extract_query builders take a later `since` for refreshes
+extract_start = '2024-07-01'
+
 wo_cols = ['workorder_id', 'target_qty', 'finished_qty', 'skuno','build_type', 'production_version', 'model_name']
 wo_prefixed_cols = [f"mw.{col}" for col in wo_cols]
-wo_query = f'''
+def wo_extract_query(since=extract_start):
+    return f'''
             SELECT 
                 {', '.join(wo_prefixed_cols)},
-                SUBSTRING(CAST(ml.date AS TEXT) FROM 1 FOR 19) AS action_date,
+                date_trunc('second', ml.date) AS action_date,
                 ml.action
             FROM manufacturing_workorder mw
             JOIN (
                 SELECT workorder_id, action, date 
                 FROM manufacturing_l10workorderlog
-                WHERE date::DATE >= TIMESTAMP '2024-07-01'
+                WHERE date::DATE >= TIMESTAMP '{since}'
             ) ml ON mw.workorder_id = ml.workorder_id
         '''
+wo_query = wo_extract_query()
 wo_data = "wo_timeline.csv"
 
 ms_cols = ['workorder_id', 'serial_number', 'generated_date', 'complete_date', 'pack_date', 'ship_date', 'update_date', 'station_id','failed', 'completed', 'shipped', 'printed']
 ms_prefixed_cols = [
-    f"SUBSTRING(CAST(ms.{col} AS TEXT) FROM 1 FOR 19) AS {col}" if col.endswith('date') else f"ms.{col}"
+    f"date_trunc('second', ms.{col}) AS {col}" if col.endswith('date') else f"ms.{col}"
     for col in ms_cols
 ]
-ms_query = f'''
+def ms_extract_query(since=extract_start):
+    return f'''
             SELECT {', '.join(ms_prefixed_cols)}
             FROM manufacturing_serialnumber ms
-            WHERE generated_date::DATE >= TIMESTAMP '2024-07-01'
+            WHERE generated_date::DATE >= TIMESTAMP '{since}'
             ORDER BY generated_date ASC
         '''
+ms_query = ms_extract_query()
 ms_data = "serial_number.csv"
 
-mtr_cols = ['rowid', 'result', 'serial_number', 'station', 'test_start_time', 'test_end_time']
+mtr_cols = ['rowid', 'result', 'serial_number', 'station', 'test_start_time', 'test_end_time', 'testing_date']
 mtr_prefixed_cols = [
-    f"SUBSTRING(CAST(mtr.{col} AS TEXT) FROM 1 FOR 19) AS {col}" if col.endswith('date') or col.endswith('time') else f"mtr.{col}"
+    f"date_trunc('second', mtr.{col}) AS {col}" if col.endswith('date') or col.endswith('time') else f"mtr.{col}"
     for col in mtr_cols
 ]
-mtr_query = f'''
+def mtr_extract_query(since=extract_start, failed_only=True):
+    result_filter = "\n                AND result = 0" if failed_only else ""
+    return f'''
                 SELECT 
                     mtr.rowid,
                     mtr.result,
                     mtr.serial_number,
                     mtr.station,
-                    SUBSTRING(CAST(mtr.test_start_time AS TEXT) FROM 1 FOR 19) AS test_start_time,
-                    SUBSTRING(CAST(mtr.test_end_time AS TEXT) FROM 1 FOR 19) AS test_end_time,
+                    date_trunc('second', mtr.test_start_time) AS test_start_time,
+                    date_trunc('second', mtr.test_end_time) AS test_end_time,
+                    date_trunc('second', mtr.testing_date) AS testing_date,
                     -- Extract and store only symptom_label values
                     (
                         SELECT STRING_AGG(value->>'symptom_label', ' | ') 
                         FROM jsonb_each(mtr.symptom_info::jsonb)
                     ) AS symptom_labels
                 FROM manufacturing_testingresult mtr
-                WHERE testing_date::DATE >= TIMESTAMP '2024-07-01'
-                AND result = 0;
+                WHERE testing_date::DATE >= TIMESTAMP '{since}'{result_filter};
         '''
+mtr_query = mtr_extract_query()
 mtr_data = "testing_result.csv"
 
+# Every test result, passing ones included (the extract_cache / local_engine copy of mtr_query)
+def mtr_all_extract_query(since=extract_start):
+    return mtr_extract_query(since, failed_only=False)
+
 rm_cols = ['failure_sequence', 'station', 'failure_description', 'result', 
-           'repaired_date', 'serial_number', 'failure_code', 'testing_result_id', 'debug_start_time']
+           'repaired_date', 'serial_number', 'failure_code', 'testing_result_id', 'debug_start_time', 'create_date']
 rm_prefixed_cols = [
-    f"SUBSTRING(CAST(rm.{col} AS TEXT) FROM 1 FOR 19) AS {col}" if col.endswith('date') or col.endswith('time') else f"rm.{col}"
+    f"date_trunc('second', rm.{col}) AS {col}" if col.endswith('date') or col.endswith('time') else f"rm.{col}"
     for col in rm_cols
 ]
-rm_query = f'''
+def rm_extract_query(since=extract_start):
+    return f'''
             SELECT {', '.join(rm_prefixed_cols)}
             FROM manufacturing_repairmain rm
-            WHERE create_date::DATE >= TIMESTAMP '2024-07-01'
+            WHERE create_date::DATE >= TIMESTAMP '{since}'
         '''
+rm_query = rm_extract_query()
 rm_data = "repair_main.csv"
 
-rd_cols = ['repaired_description', 'failure_sequence', 'repair_code']
+rd_cols = ['repaired_description', 'failure_sequence', 'repair_code', 'created_at']
 rd_prefixed_cols = [
-    f"SUBSTRING(CAST(rd.{col} AS TEXT) FROM 1 FOR 19) AS {col}" if col.endswith('at') else f"rd.{col}" for col in rd_cols
+    f"date_trunc('second', rd.{col}) AS {col}" if col.endswith('at') else f"rd.{col}" for col in rd_cols
 ]
-rd_query = f'''
+def rd_extract_query(since=extract_start):
+    return f'''
             SELECT {', '.join(rd_prefixed_cols)}
             FROM manufacturing_repairdetail rd
-            WHERE created_at::DATE >= TIMESTAMP '2024-07-01'
+            WHERE created_at::DATE >= TIMESTAMP '{since}'
         '''
+rd_query = rd_extract_query()
 rd_data = "repair_detail.csv"
 
+def sym_extract_query(since=extract_start, failed_only=True):
+    result_filter = "\n            AND result = 0" if failed_only else ""
+    return f'''
+            SELECT 
+                mtr.rowid,
+                mtr.serial_number,
+                mtr.station,
+                date_trunc('second', mtr.testing_date) AS testing_date,
+                sym.symptom_key,
+                sym.symptom_label,
+                sym.symptom_msg
+            FROM manufacturing_testingresult mtr{symptom_lateral("mtr", keep_empty=False)}
+            WHERE testing_date::DATE >= TIMESTAMP '{since}'{result_filter}
+        '''
+sym_query = sym_extract_query()
+sym_data = "testing_symptom.csv"
+
+# Symptoms of every test result, passing ones included (the extract_cache / local_engine copy of sym_query)
+def sym_all_extract_query(since=extract_start):
+    return sym_extract_query(since, failed_only=False)
+
 repair_data = "repair_data.csv"
 
 test_repair_data = "test_repair.csv"
@@ -668,7 +1196,7 @@ final_query = f'''
                 -- Step 4: Select required fields from manufacturing_testingresult
                 SELECT 
                     si.model_name, si.build_type, si.skuno, mtr.station, mtr.serial_number, 
-                    SUBSTRING(CAST(rd.created_at AS TEXT) FROM 1 FOR 19) AS repair_detail_created_at,
+                    date_trunc('second', rd.created_at) AS repair_detail_created_at,
                     rd.repair_code, 
                     mtr.result,
                     (SELECT STRING_AGG(value->>'symptom_label', ' | ') FROM jsonb_each(mtr.symptom_info::jsonb)) AS symptom_labels
@@ -0,0 +1,233 @@
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+import data_query as dq
+import schema as sc
+
+# Default location of the on-disk cache (one sub-directory per extract)
+cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Extract name -> query builder, date column used for partitioning, partition granularity
+# and the legacy CSV target it replaces. mtr_data and sym_data hold every test result (the local
+# engine needs the passing ones), not only the failed tests of testing_result.csv/testing_symptom.csv.
+EXTRACTS = {
+    "wo_data": {"query": dq.wo_extract_query, "date_col": "action_date", "freq": "M", "csv": dq.wo_data},
+    "ms_data": {"query": dq.ms_extract_query, "date_col": "generated_date", "freq": "M", "csv": dq.ms_data},
+    "mtr_data": {"query": dq.mtr_all_extract_query, "date_col": "testing_date", "freq": "D", "csv": dq.mtr_data},
+    "rm_data": {"query": dq.rm_extract_query, "date_col": "create_date", "freq": "D", "csv": dq.rm_data},
+    "rd_data": {"query": dq.rd_extract_query, "date_col": "created_at", "freq": "M", "csv": dq.rd_data},
+    "sym_data": {"query": dq.sym_all_extract_query, "date_col": "testing_date", "freq": "D", "csv": dq.sym_data},
+}
+
+_PARTITION_FORMAT = {"D": "%Y-%m-%d", "M": "%Y-%m"}
+
+# Partition of the rows whose date column is NULL. They cannot be windowed by date, so every pull
+# that returns such rows replaces it; it is not listed by list_partitions.
+NULL_PARTITION = "null"
+
+def _extract_dir(name, root=None):
+    return os.path.join(root or cache_dir, name)
+
+def _partition_keys(df, spec):
+    """Partition key of each row of `df`, NULL_PARTITION where the date column is NULL."""
+    return df[spec["date_col"]].dt.strftime(_PARTITION_FORMAT[spec["freq"]]).fillna(NULL_PARTITION)
+
+def list_partitions(name, root=None):
+    """Returns the sorted partition keys (e.g. '2025-04' or '2025-04-17') cached for an extract."""
+    path = _extract_dir(name, root)
+    if not os.path.isdir(path):
+        return []
+    return sorted(p for p in os.listdir(path) if os.path.isdir(os.path.join(path, p)) and p != NULL_PARTITION)
+
+def get_watermark(name, root=None):
+    """
+    Returns the start of the newest cached partition, or None if nothing is cached.
+    The newest partition may have been written before the period ended, so refreshes re-pull it.
+    """
+    partitions = list_partitions(name, root)
+    if not partitions:
+        return None
+    return pd.Timestamp(partitions[-1])
+
+def print_progress(name, rows, elapsed, done=False):
+    """Default progress callback of refresh_concurrent: one line per chunk and per finished extract."""
+    status = "done" if done else "streaming"
+    print(f"[{name}] {status}: {rows:,} rows in {elapsed:.1f}s")
+
+def refresh_extract(name, root=None, full=False, itersize=50000, progress=None):
+    """
+    Brings the Parquet cache of one extract up to date.
+
+    Only partitions at or after the watermark are re-pulled from Postgres; older partitions are
+    left untouched. Rows are streamed in chunks and each chunk is written as one file per
+    partition, so memory stays bounded by `itersize` rows.
+
+    Chunks are written to a staging directory next to the cache and the re-pulled partitions
+    are swapped in only once the stream has finished, so a failed pull leaves the cache as it was.
+
+    Parameters:
+        name (str): Key of EXTRACTS (e.g. "mtr_data").
+        root (str, optional): Cache root directory, defaults to `cache_dir`.
+        full (bool): Drop the cache and re-pull everything since `dq.extract_start`.
+        itersize (int): Rows per streamed chunk.
+        progress (callable, optional): Called as progress(name, rows, elapsed) after each chunk.
+
+    Returns:
+        int: Number of rows written.
+    """
+    started = time.perf_counter()
+    spec = EXTRACTS[name]
+    path = _extract_dir(name, root)
+
+    watermark = None if full else get_watermark(name, root)
+    since = watermark.strftime("%Y-%m-%d") if watermark is not None else dq.extract_start
+
+    staging = os.path.join(root or cache_dir, f".{name}.staging")
+    if os.path.isdir(staging):
+        shutil.rmtree(staging)
+
+    total_rows = 0
+    try:
+        for chunk_id, chunk in enumerate(dq.db_stream(spec["query"](since), itersize=itersize)):
+            # Compact dtypes (categoricals, small ints, datetime64) before the chunk is written
+            chunk = sc.apply_schema(chunk)
+            for partition, part_df in chunk.groupby(_partition_keys(chunk, spec)):
+                partition_dir = os.path.join(staging, partition)
+                os.makedirs(partition_dir, exist_ok=True)
+                part_df.to_parquet(os.path.join(partition_dir, f"part-{chunk_id:05d}.parquet"), index=False)
+                total_rows += len(part_df)
+            if progress is not None:
+                progress(name, total_rows, time.perf_counter() - started)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # Swap in the re-pulled partitions and drop the replaced ones that have no rows anymore
+    os.makedirs(path, exist_ok=True)
+    staged = set(os.listdir(staging)) if os.path.isdir(staging) else set()
+    for partition in list_partitions(name, root):
+        if partition not in staged and (full or pd.Timestamp(partition) >= pd.Timestamp(since)):
+            shutil.rmtree(os.path.join(path, partition))
+    if full and NULL_PARTITION not in staged and os.path.isdir(os.path.join(path, NULL_PARTITION)):
+        shutil.rmtree(os.path.join(path, NULL_PARTITION))
+    for partition in sorted(staged):
+        partition_dir = os.path.join(path, partition)
+        if os.path.isdir(partition_dir):
+            # A directory cannot be replaced while it has files; move the old one aside first
+            replaced = os.path.join(staging, f".{partition}.replaced")
+            os.replace(partition_dir, replaced)
+            os.replace(os.path.join(staging, partition), partition_dir)
+            shutil.rmtree(replaced)
+        else:
+            os.replace(os.path.join(staging, partition), partition_dir)
+    shutil.rmtree(staging, ignore_errors=True)
+    return total_rows
+
+def refresh_all(root=None, full=False, itersize=50000):
+    """Refreshes every extract in EXTRACTS and returns {name: rows written}."""
+    return {name: refresh_extract(name, root, full, itersize) for name in EXTRACTS}
+
+def refresh_concurrent(names=None, root=None, full=False, itersize=50000, max_workers=None, progress=print_progress):
+    """
+    Refreshes several extracts at the same time, one worker thread (and one pooled connection)
+    per extract, so the total wall time is close to that of the slowest extract.
+
+    The extracts are independent and each one streams into its own cache directory. At most
+    `max_workers` run at once, never more than the connection pool holds (`pool_size`); other
+    callers sharing the pool meanwhile wait for a free connection (see dq.db_cursor).
+    An extract that fails is reported and skipped; the others still complete.
+
+    Parameters:
+        names (list, optional): Keys of EXTRACTS to refresh; all extracts if None.
+        root (str, optional): Cache root directory, defaults to `cache_dir`.
+        full (bool): Drop the caches and re-pull everything since `dq.extract_start`.
+        itersize (int): Rows per streamed chunk.
+        max_workers (int, optional): Concurrency limit, defaults to the pool size.
+        progress (callable, optional): Called as progress(name, rows, elapsed) after each chunk
+            and progress(name, rows, elapsed, done=True) when an extract finishes; None to disable.
+
+    Returns:
+        DataFrame: One row per extract with rows written, seconds taken and error (None if it succeeded).
+    """
+    names = list(names or EXTRACTS)
+    pool_size = dq.get_pool().maxconn
+    max_workers = min(max_workers or pool_size, pool_size, len(names))
+
+    def run(name):
+        started = time.perf_counter()
+        rows = refresh_extract(name, root, full, itersize, progress)
+        elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress(name, rows, elapsed, done=True)
+        return rows, elapsed
+
+    results = {}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, name): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                rows, elapsed = future.result()
+                results[name] = (rows, elapsed, None)
+            except Exception as e:
+                print(f"Error refreshing {name}: {e}")
+                results[name] = (None, None, str(e))
+    print(f"Refreshed {len(names)} extracts in {time.perf_counter() - started:.1f}s ({max_workers} concurrent)")
+    return pd.DataFrame(
+        [(name, *results[name]) for name in names],
+        columns=["extract", "rows", "seconds", "error"]
+    )
+
+def load_extract(name, columns=None, start=None, end=None, root=None):
+    """
+    Loads a cached extract, reading only the requested columns and the partitions that
+    overlap [start, end]. Rows without a date are only returned when no bound is given.
+
+    Parameters:
+        name (str): Key of EXTRACTS.
+        columns (list, optional): Columns to read; all columns if None.
+        start, end (str or datetime, optional): Inclusive bounds on the extract's date column.
+
+    Returns:
+        DataFrame: The matching rows (empty if nothing is cached).
+    """
+    spec = EXTRACTS[name]
+    path = _extract_dir(name, root)
+    date_col = spec["date_col"]
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    # The date column is needed to trim rows at the edges of the range
+    read_cols = None
+    if columns is not None:
+        read_cols = list(columns) + ([date_col] if date_col not in columns and (start is not None or end is not None) else [])
+
+    partitions = list_partitions(name, root)
+    if start is None and end is None and os.path.isdir(os.path.join(path, NULL_PARTITION)):
+        partitions.append(NULL_PARTITION)
+
+    frames = []
+    for partition in partitions:
+        if partition != NULL_PARTITION:
+            period = pd.Period(partition, freq=spec["freq"])
+            if (start is not None and period.end_time < start) or (end is not None and period.start_time > end):
+                continue
+        partition_dir = os.path.join(path, partition)
+        for file_name in sorted(os.listdir(partition_dir)):
+            frames.append(pd.read_parquet(os.path.join(partition_dir, file_name), columns=read_cols))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    # Each file carries its own categories; re-apply the schema to share them again
+    df = sc.apply_schema(pd.concat(frames, ignore_index=True))
+
+    if start is not None:
+        df = df[df[date_col] >= start]
+    if end is not None:
+        df = df[df[date_col] <= end]
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True)
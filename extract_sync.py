@@ -0,0 +1,198 @@
+import json
+import os
+import pandas as pd
+import data_query as dq
+import extract_cache as ec
+import schema as sc
+
+# Extract -> change tracking, in sync order (tests before the repairs that reference them).
+#   mark: high-water mark column(s); several columns are coalesced in order
+#   key: columns identifying a row; synced rows replace cached rows with the same key
+#   overlap: re-read rows equal to the mark (timestamps are truncated to seconds, so a later
+#       row can share the last second seen); without it only rows strictly after the mark are read
+#   open: column that is NULL while a row can still change; such rows are re-read on every sync
+#   lookback: for sequence marks, also re-read this many ids below the mark. Ids are drawn when a
+#       row is inserted but become visible when its transaction commits, so a row with a lower id
+#       can appear after the mark has passed it; re-read rows simply replace their cached copy
+# The partition column of ec.EXTRACTS must not change for a given key.
+SYNC = {
+    "wo_data": {"mark": ["action_date"], "key": ["workorder_id", "action", "action_date"], "overlap": True},
+    "ms_data": {"mark": ["update_date", "generated_date"], "key": ["serial_number"], "overlap": True},
+    "mtr_data": {"mark": ["rowid"], "key": ["rowid"], "overlap": False, "lookback": 1000},
+    "sym_data": {"mark": ["rowid"], "key": ["rowid", "symptom_key"], "overlap": False, "lookback": 1000},
+    "rm_data": {"mark": ["failure_sequence"], "key": ["failure_sequence"], "overlap": False, "open": "repaired_date", "lookback": 1000},
+    "rd_data": {"mark": ["created_at"], "key": ["failure_sequence", "repair_code", "created_at", "repaired_description"], "overlap": True},
+}
+
+def _state_file(name, root=None):
+    return os.path.join(ec._extract_dir(name, root), "_sync.json")
+
+def _mark_of(df, cols):
+    """Largest value of the coalesced mark columns of `df`, or None if there is none."""
+    if df.empty:
+        return None
+    values = df[cols[0]]
+    for col in cols[1:]:
+        values = values.fillna(df[col])
+    mark = values.max()
+    return None if pd.isna(mark) else mark
+
+def _to_param(value):
+    """
+    Python value psycopg2 can bind (numpy scalars and Timestamps are not adapted). Timestamps
+    are wall-clock time in sc.TIMEZONE and are bound with their UTC offset (see sc.timestamp_param).
+    """
+    if isinstance(value, pd.Timestamp):
+        return sc.timestamp_param(value)
+    return value.item() if hasattr(value, "item") else value
+
+def get_mark(name, root=None):
+    """
+    Returns the high-water mark of an extract: the saved one, or else the largest mark value in
+    the cache. None if nothing is cached. Timestamps are naive wall-clock time in sc.TIMEZONE,
+    like the cached rows.
+    """
+    state_file = _state_file(name, root)
+    if os.path.exists(state_file):
+        with open(state_file) as f:
+            state = json.load(f)
+        mark = state["mark"]
+        return sc.naive_timestamp(mark) if state["type"] == "timestamp" else mark
+    cols = SYNC[name]["mark"]
+    return _mark_of(ec.load_extract(name, columns=cols, root=root), cols)
+
+def save_mark(name, mark, root=None):
+    """
+    Persists the high-water mark of an extract next to its partitions. Timestamps are saved in
+    UTC, so the mark stays valid if sc.TIMEZONE (or the machine's time zone) changes.
+    """
+    os.makedirs(ec._extract_dir(name, root), exist_ok=True)
+    is_timestamp = isinstance(mark, pd.Timestamp)
+    with open(_state_file(name, root), "w") as f:
+        json.dump({
+            "type": "timestamp" if is_timestamp else "value",
+            "mark": sc.aware_timestamp(mark).tz_convert("UTC").isoformat() if is_timestamp else _to_param(mark),
+        }, f)
+
+def changes_query(name, with_open=False):
+    """
+    Query returning the rows of an extract past the high-water mark (bound as %(mark)s) and,
+    with with_open=True, the rows whose first key column is in %(open_keys)s.
+    The extract query is wrapped as a subquery, so Postgres pushes the conditions into it.
+    """
+    spec = SYNC[name]
+    base = ec.EXTRACTS[name]["query"](dq.extract_start).strip().rstrip(";")
+    cols = [f"q.{col}" for col in spec["mark"]]
+    mark = cols[0] if len(cols) == 1 else f"COALESCE({', '.join(cols)})"
+    where = f"{mark} {'>=' if spec['overlap'] else '>'} %(mark)s"
+    if spec.get("lookback"):
+        where += f" - {int(spec['lookback'])}"
+    if with_open:
+        where += f" OR q.{spec['key'][0]} = ANY(%(open_keys)s)"
+    return f'''
+            SELECT * FROM ({base}
+            ) q
+            WHERE {where}
+        '''
+
+def _part_id(file_name):
+    """Number of a partition file (part-00003.parquet -> 3)."""
+    return int(os.path.splitext(file_name)[0].split("-")[-1])
+
+def upsert(name, df, root=None):
+    """
+    Writes rows into the Parquet cache of an extract, replacing cached rows with the same key.
+    Each touched partition is rewritten as a single file, numbered after the files it replaces.
+
+    Returns:
+        int: Number of rows written.
+    """
+    spec = SYNC[name]
+    extract = ec.EXTRACTS[name]
+    path = ec._extract_dir(name, root)
+
+    df = sc.apply_schema(df)
+    rows = 0
+    for partition, part_df in df.groupby(ec._partition_keys(df, extract)):
+        partition_dir = os.path.join(path, partition)
+        files = sorted(os.listdir(partition_dir)) if os.path.isdir(partition_dir) else []
+        frames = [pd.read_parquet(os.path.join(partition_dir, file_name)) for file_name in files]
+        # Synced rows come last, so they win over the cached version of the same key
+        merged = pd.concat(frames + [part_df], ignore_index=True)
+        merged = sc.apply_schema(merged.drop_duplicates(subset=spec["key"], keep="last"))
+
+        # Write next to the partitions, move the file in, and only then remove the replaced files.
+        # An interruption in between leaves rows twice, never none; the merged file sorts after the
+        # replaced ones, so the next upsert keeps its version of those rows
+        os.makedirs(partition_dir, exist_ok=True)
+        tmp_file = os.path.join(path, f".{partition}.parquet.tmp")
+        merged.to_parquet(tmp_file, index=False)
+        part_id = max((_part_id(file_name) for file_name in files), default=-1) + 1
+        os.replace(tmp_file, os.path.join(partition_dir, f"part-{part_id:05d}.parquet"))
+        for file_name in files:
+            os.remove(os.path.join(partition_dir, file_name))
+        rows += len(part_df)
+    return rows
+
+def sync_extract(name, root=None, itersize=50000):
+    """
+    Brings one extract up to date by pulling only the rows past its high-water mark (less the
+    SYNC lookback) and upserting them into the cache. An extract that is not cached yet is
+    pulled in full, and its mark is then taken from the pulled rows.
+
+    For rm_data, repairs that are still open (no repaired_date) are re-read as well, and the
+    result lists the cached test rows (mtr_data rowid) that received new or changed repairs,
+    including late repairs of tests synced in earlier runs.
+
+    Parameters:
+        name (str): Key of SYNC (e.g. "mtr_data").
+        root (str, optional): Cache root directory, defaults to ec.cache_dir.
+        itersize (int): Rows per streamed chunk.
+
+    Returns:
+        dict: rows (rows written), mark (new high-water mark) and, for rm_data,
+            affected_tests (list of testing_result_id already in the mtr_data cache).
+    """
+    spec = SYNC[name]
+    mark = get_mark(name, root) if ec.list_partitions(name, root) else None
+    if mark is None:
+        # A mark saved for an earlier cache would skip rows of the new one
+        if os.path.exists(_state_file(name, root)):
+            os.remove(_state_file(name, root))
+        rows = ec.refresh_extract(name, root, full=True, itersize=itersize)
+        mark = _mark_of(ec.load_extract(name, columns=spec["mark"], root=root), spec["mark"]) if rows else None
+        if mark is not None:
+            save_mark(name, mark, root)
+        return {"rows": rows, "mark": mark}
+
+    open_keys = []
+    if spec.get("open"):
+        cached = ec.load_extract(name, columns=spec["key"][:1] + [spec["open"]], root=root)
+        open_keys = [_to_param(key) for key in cached.loc[cached[spec["open"]].isna(), spec["key"][0]].unique()]
+    params = {"mark": _to_param(mark)}
+    if open_keys:
+        params["open_keys"] = open_keys
+
+    rows, new_mark = 0, mark
+    synced = []
+    for chunk in dq.db_stream(changes_query(name, with_open=bool(open_keys)), params=params, itersize=itersize):
+        rows += upsert(name, chunk, root)
+        chunk_mark = _mark_of(chunk, spec["mark"])
+        if chunk_mark is not None and (new_mark is None or chunk_mark > new_mark):
+            new_mark = chunk_mark
+        if name == "rm_data":
+            synced.append(chunk["testing_result_id"].dropna())
+    # Saved only once every chunk is in the cache; an interrupted sync is simply repeated
+    if new_mark is not None:
+        save_mark(name, new_mark, root)
+
+    result = {"rows": rows, "mark": new_mark}
+    if name == "rm_data":
+        test_ids = pd.concat(synced).unique() if synced else []
+        cached_tests = ec.load_extract("mtr_data", columns=["rowid"], root=root)["rowid"]
+        result["affected_tests"] = [_to_param(test_id) for test_id in sorted(set(test_ids) & set(cached_tests))]
+    return result
+
+def sync_all(root=None, itersize=50000):
+    """Syncs every extract in SYNC, in order, and returns {name: sync_extract result}."""
+    return {name: sync_extract(name, root, itersize) for name in SYNC}
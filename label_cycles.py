@@ -0,0 +1,171 @@
+import json
+import os
+from collections import Counter
+import pandas as pd
+
+# Default location of the persisted tracker state (kept next to the extract cache)
+state_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "label_cycles")
+
+def _explode_symptom_dicts(serial_numbers, symptom_dicts):
+    """
+    Explodes `symptom_dict` values ({label: messages}) into a label table (row_id, serial_number,
+    label) and a message table (row_id, serial_number, label, msg), in row/insertion order.
+    Messages follow compute_label_cycles: a string counts as one message, any other value is
+    iterated (lists by element, converted {label: message} dictionaries by key).
+    """
+    labels, messages = [], []
+    for row_id, (serial_number, symptom_dict) in enumerate(zip(serial_numbers, symptom_dicts)):
+        if not isinstance(symptom_dict, dict):
+            continue
+        for label, msgs in symptom_dict.items():
+            labels.append((row_id, serial_number, label))
+            if isinstance(msgs, str):
+                msgs = [msgs]
+            messages.extend((row_id, serial_number, label, msg) for msg in msgs)
+    label_df = pd.DataFrame(labels, columns=["row_id", "serial_number", "label"])
+    message_df = pd.DataFrame(messages, columns=["row_id", "serial_number", "label", "msg"])
+    return label_df, message_df
+
+def _cycles(items, keys, counts):
+    """
+    Running occurrence number of each key within `items` (cumcount + 1), continued from the
+    persisted `counts`, which are then advanced to the last value seen per key.
+    """
+    if items.empty:
+        return pd.Series(dtype="int64")
+    item_keys = list(zip(*(items[col] for col in keys)))
+    offsets = [counts.get(key, 0) for key in item_keys]
+    # dropna=False: a None label or message is a key like any other
+    cycles = items.groupby(keys, sort=False, dropna=False).cumcount() + 1 + pd.Series(offsets, index=items.index)
+    # Cycles grow in row order, so the last one of each key is its count
+    for key, cycle in zip(item_keys, cycles):
+        counts[key] = int(cycle)
+    return cycles
+
+def _fingerprints(df):
+    """Stable 64-bit hash of every row (all columns as text), used to recognise rows already ingested."""
+    return [int(h) for h in pd.util.hash_pandas_object(df.astype(str), index=False)]
+
+def _unseen(fingerprints, seen):
+    """Mask of the rows not in `seen` ({fingerprint: occurrences}), counting repeated rows per occurrence."""
+    remaining = Counter(seen)
+    mask = []
+    for fingerprint in fingerprints:
+        if remaining[fingerprint] > 0:
+            remaining[fingerprint] -= 1
+            mask.append(False)
+        else:
+            mask.append(True)
+    return mask
+
+class LabelCycleTracker:
+    """
+    Per serial number label and (label, message) counters that survive between runs, so that
+    `label_cycle` / `label_message_cycle` of new failures continue from the earlier history
+    instead of recomputing it from scratch.
+
+    Rows must be ingested in time order; rows before the watermark (latest ingested `time_col`
+    value) are skipped, so an overlapping window can be re-ingested safely. Rows at the watermark
+    itself or without a time are skipped only if they were already ingested, so rows committed
+    late within the watermark's second are still counted.
+    """
+
+    def __init__(self, time_col="testing_date"):
+        self.time_col = time_col
+        self.label_counts = {}  # (serial_number, label) -> cycles so far
+        self.message_counts = {}  # (serial_number, label, msg) -> cycles so far
+        self.watermark = None
+        self.boundary_rows = Counter()  # fingerprint -> occurrences ingested at the watermark
+        self.undated_rows = Counter()  # fingerprint -> occurrences ingested without a time
+
+    def ingest(self, df):
+        """
+        Adds the cycle columns to new rows of a process_symptom_info result and advances the counters.
+
+        Parameters:
+            df (DataFrame): Rows with `serial_number` and `symptom_dict` (and `time_col` if available).
+
+        Returns:
+            DataFrame: The ingested rows sorted by serial_number (then `time_col`), with
+                `label_cycle` ({label: cycle}) and `label_message_cycle` ({(label, msg): cycle}).
+        """
+        has_time = self.time_col in df.columns
+        if has_time:
+            df = df.reset_index(drop=True)
+            times = pd.to_datetime(df[self.time_col])
+            fingerprints = pd.Series(_fingerprints(df), index=df.index, dtype=object)
+            if self.watermark is None:
+                keep, at_watermark = times.notna(), pd.Series(False, index=df.index)
+            else:
+                keep, at_watermark = times > self.watermark, times == self.watermark
+            keep[at_watermark] = _unseen(fingerprints[at_watermark], self.boundary_rows)
+            keep[times.isna()] = _unseen(fingerprints[times.isna()], self.undated_rows)
+            df, times, fingerprints = df[keep], times[keep], fingerprints[keep]
+            self.undated_rows.update(fingerprints[times.isna()])
+        sort_cols = ["serial_number", self.time_col] if has_time else ["serial_number"]
+        df = df.sort_values(by=sort_cols, kind="mergesort").reset_index(drop=True)
+
+        label_df, message_df = _explode_symptom_dicts(df["serial_number"], df["symptom_dict"])
+        label_df["cycle"] = _cycles(label_df, ["serial_number", "label"], self.label_counts)
+        message_df["cycle"] = _cycles(message_df, ["serial_number", "label", "msg"], self.message_counts)
+
+        label_cycles = [{} for _ in range(len(df))]
+        for row_id, label, cycle in zip(label_df["row_id"], label_df["label"], label_df["cycle"]):
+            label_cycles[row_id][label] = int(cycle)
+        label_message_cycles = [{} for _ in range(len(df))]
+        for row_id, label, msg, cycle in zip(message_df["row_id"], message_df["label"], message_df["msg"], message_df["cycle"]):
+            label_message_cycles[row_id][(label, msg)] = int(cycle)
+
+        df["label_cycle"] = label_cycles
+        df["label_message_cycle"] = label_message_cycles
+        if has_time and len(df):
+            latest = times.max()
+            if pd.notna(latest) and (self.watermark is None or latest > self.watermark):
+                self.watermark = latest
+                self.boundary_rows = Counter()
+            self.boundary_rows.update(fingerprints[times == self.watermark])
+        return df
+
+    def save(self, path=None):
+        """Writes the counters (Parquet) and the watermark (JSON) to `path` (default `state_dir`)."""
+        path = path or state_dir
+        os.makedirs(path, exist_ok=True)
+        pd.DataFrame(
+            [(sn, label, count) for (sn, label), count in self.label_counts.items()],
+            columns=["serial_number", "label", "count"]
+        ).to_parquet(os.path.join(path, "label_counts.parquet"), index=False)
+        pd.DataFrame(
+            [(sn, label, msg, count) for (sn, label, msg), count in self.message_counts.items()],
+            columns=["serial_number", "label", "msg", "count"]
+        ).to_parquet(os.path.join(path, "message_counts.parquet"), index=False)
+        with open(os.path.join(path, "state.json"), "w") as f:
+            json.dump({
+                "time_col": self.time_col,
+                "watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                "boundary_rows": list(self.boundary_rows.items()),
+                "undated_rows": list(self.undated_rows.items()),
+            }, f)
+
+    @classmethod
+    def load(cls, path=None):
+        """Restores a tracker written by save(); returns an empty tracker if nothing was saved yet."""
+        path = path or state_dir
+        state_file = os.path.join(path, "state.json")
+        if not os.path.exists(state_file):
+            return cls()
+        with open(state_file) as f:
+            state = json.load(f)
+        tracker = cls(time_col=state["time_col"])
+        if state["watermark"] is not None:
+            tracker.watermark = pd.Timestamp(state["watermark"])
+        tracker.boundary_rows = Counter(dict(state.get("boundary_rows", [])))
+        tracker.undated_rows = Counter(dict(state.get("undated_rows", [])))
+        labels = pd.read_parquet(os.path.join(path, "label_counts.parquet"))
+        tracker.label_counts = {
+            (sn, label): int(count) for sn, label, count in labels.itertuples(index=False)
+        }
+        messages = pd.read_parquet(os.path.join(path, "message_counts.parquet"))
+        tracker.message_counts = {
+            (sn, label, msg): int(count) for sn, label, msg, count in messages.itertuples(index=False)
+        }
+        return tracker
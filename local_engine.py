@@ -0,0 +1,222 @@
+import re
+import threading
+import time
+import extract_cache as ec
+from query_templates import QueryTemplate
+from query_profiler import profiler
+
+# Local table name -> cached extract it is loaded from
+TABLES = {
+    "wo": "wo_data",
+    "ms": "ms_data",
+    "mtr": "mtr_data",
+    "rm": "rm_data",
+    "rd": "rd_data",
+    "sym": "sym_data",
+}
+
+# Derived tables built once per load
+DERIVED = {
+    # manufacturing_workorder, from the work order log extract
+    "workorder": '''
+            SELECT DISTINCT ON (workorder_id) workorder_id, model_name, build_type, skuno
+            FROM wo
+            ORDER BY workorder_id, action_date DESC
+        ''',
+}
+
+# symptom_info rebuilt as JSON ({key: {symptom_label, symptom_msg}}) from the exploded symptoms of
+# the requested serial numbers only; keys in jsonb order (shorter keys first), as Postgres returns them
+symptom_info_cte = '''
+            WITH symptom_info AS (
+                SELECT rowid,
+                       to_json(map(
+                           list(symptom_key ORDER BY length(symptom_key), symptom_key),
+                           list(json_object('symptom_label', symptom_label, 'symptom_msg', symptom_msg)
+                                ORDER BY length(symptom_key), symptom_key)
+                       ))::VARCHAR AS symptom_info
+                FROM sym
+                WHERE list_contains(%(serial_numbers)s, serial_number)
+                GROUP BY rowid
+            )'''
+
+_connections = {}  # cache root -> DuckDB connection
+_lock = threading.Lock()
+
+def connect(root=None, refresh=False):
+    """
+    Returns an in-memory DuckDB database holding the cached extracts of `root`, loading it on
+    first use. Requires duckdb and a populated cache (extract_cache.refresh_all or
+    extract_sync.sync_all).
+
+    Parameters:
+        root (str, optional): Cache root directory, defaults to extract_cache.cache_dir.
+        refresh (bool): Reload the extracts (e.g. after a sync).
+    """
+    import duckdb
+
+    root = root or ec.cache_dir
+    with _lock:
+        if refresh or root not in _connections:
+            missing = [name for name in TABLES.values() if not ec.list_partitions(name, root)]
+            if missing:
+                raise FileNotFoundError(f"Extracts not cached under {root}: {', '.join(missing)}")
+            con = duckdb.connect()
+            for table, name in TABLES.items():
+                files = f"{ec._extract_dir(name, root)}/*/*.parquet".replace("\\", "/")
+                con.execute(f"CREATE TABLE {table} AS SELECT * FROM read_parquet('{files}', union_by_name = true)")
+            for table, query in DERIVED.items():
+                con.execute(f"CREATE TABLE {table} AS {query}")
+            old = _connections.pop(root, None)
+            if old is not None:
+                old.close()
+            _connections[root] = con
+        return _connections[root]
+
+def close():
+    """Closes every local database."""
+    with _lock:
+        for con in _connections.values():
+            con.close()
+        _connections.clear()
+
+def run(template, params, root=None):
+    """
+    Runs a QueryTemplate on the local database, binding its %(name)s parameters as DuckDB
+    $name parameters, and records the call in query_profiler.profiler.
+
+    Returns:
+        DataFrame: The query result.
+    """
+    sql = re.sub(r"%\((\w+)\)s", r"$\1", template.sql).replace("%%", "%")
+    # A cursor is a separate connection to the same database, so threads can query concurrently
+    cursor = connect(root).cursor()
+    try:
+        started = time.perf_counter()
+        df = cursor.execute(sql, template.bind(params)).df()
+        profiler.record("duckdb", template.sql, df, time.perf_counter() - started)
+    finally:
+        cursor.close()
+    return df
+
+# Local counterparts of the data_query templates of the same name. The extracts hold every test
+# (passing ones are needed to tell repaired boards apart), symptoms are trimmed and lowercased, and
+# serial numbers are mapped to work orders through manufacturing_serialnumber. A test without
+# symptoms has a NULL symptom_info instead of '{}'.
+def _repair_rows_sql(symptom_col, symptom_join, group_cols="si.model_name, si.build_type, si.skuno"):
+    """Test/repair rows at %(station)s of the serial numbers in `matching_serials`."""
+    return f'''
+                    SELECT
+                        {group_cols}, mtr.station, mtr.serial_number,
+                        rd.created_at AS repair_detail_created_at,
+                        rd.repair_code,
+                        mtr.result,
+                        {symptom_col}
+                    FROM mtr
+                    JOIN matching_serials ms ON mtr.serial_number = ms.serial_number
+                    LEFT JOIN rm ON mtr.rowid = rm.testing_result_id
+                    LEFT JOIN rd ON rm.failure_sequence = rd.failure_sequence{symptom_join}
+                    WHERE mtr.station = %(station)s
+                '''
+
+def _repair_table_sql(normalized_symptoms):
+    if normalized_symptoms:
+        symptom_col = "mtr.rowid, sym.symptom_label"
+        symptom_join = "\n                    LEFT JOIN sym ON mtr.rowid = sym.rowid"
+    else:
+        symptom_col = "mtr.symptom_labels"
+        symptom_join = ""
+    return f'''
+                    WITH serial_info AS (
+                        SELECT wo.model_name, wo.build_type, wo.skuno
+                        FROM ms
+                        JOIN workorder wo ON ms.workorder_id = wo.workorder_id
+                        WHERE ms.serial_number = %(sn)s
+                        LIMIT 1
+                    ),
+
+                    matching_serials AS (
+                        SELECT DISTINCT ms.serial_number
+                        FROM ms
+                        JOIN workorder wo ON ms.workorder_id = wo.workorder_id
+                        JOIN serial_info si ON wo.model_name = si.model_name AND wo.build_type = si.build_type AND wo.skuno = si.skuno
+                    )''' + _repair_rows_sql(symptom_col, "\n                    CROSS JOIN serial_info si" + symptom_join)
+
+repair_table_templates = {
+    False: QueryTemplate("local_repair_table", _repair_table_sql(False), sn="text", station="text"),
+    True: QueryTemplate("local_repair_table_normalized", _repair_table_sql(True), sn="text", station="text"),
+}
+
+serial_info_template = QueryTemplate("local_serial_info", '''
+            SELECT DISTINCT ON (ms.serial_number)
+                ms.serial_number, wo.model_name, wo.build_type, wo.skuno
+            FROM ms
+            JOIN workorder wo ON ms.workorder_id = wo.workorder_id
+            WHERE list_contains(%(serial_numbers)s, ms.serial_number)
+        ''', serial_numbers="text[]")
+
+repair_group_template = QueryTemplate("local_repair_group", '''
+            WITH matching_serials AS (
+                SELECT DISTINCT ms.serial_number
+                FROM ms
+                JOIN workorder wo ON ms.workorder_id = wo.workorder_id
+                WHERE wo.model_name = %(model_name)s AND wo.build_type = %(build_type)s AND wo.skuno = %(skuno)s
+            )''' + _repair_rows_sql(
+                "mtr.symptom_labels", "",
+                group_cols="%(model_name)s AS model_name, %(build_type)s AS build_type, %(skuno)s AS skuno"
+            ), model_name="text", build_type="text", skuno="text", station="text")
+
+symptom_result_template = QueryTemplate("local_symptom_result", symptom_info_cte + '''
+            SELECT
+                mtr.serial_number,
+                mtr.station,
+                mtr.test_start_time,
+                mtr.test_end_time,
+                si.symptom_info,
+                rd.repair_code,
+                rd.repaired_description
+            FROM mtr
+            LEFT JOIN symptom_info si ON mtr.rowid = si.rowid
+            LEFT JOIN rm ON mtr.rowid = rm.testing_result_id
+            LEFT JOIN rd ON rm.failure_sequence = rd.failure_sequence
+            WHERE list_contains(%(serial_numbers)s, mtr.serial_number)
+            AND mtr.result = 0
+            ORDER BY mtr.serial_number, mtr.test_end_time ASC
+            ''', serial_numbers="text[]")
+
+intel_table_template = QueryTemplate("local_intel_table", symptom_info_cte + '''
+        SELECT mtr.serial_number, wo.model_name, wo.build_type, wo.skuno, mtr.station, mtr.result,
+                mtr.test_start_time,
+                mtr.test_end_time,
+                rm.repaired_date,
+                si.symptom_info, rd.repair_code, rd.repaired_description
+        FROM mtr
+        LEFT JOIN symptom_info si ON mtr.rowid = si.rowid
+        LEFT JOIN rm ON mtr.rowid = rm.testing_result_id
+        LEFT JOIN rd ON rm.failure_sequence = rd.failure_sequence
+        LEFT JOIN ms ON mtr.serial_number = ms.serial_number
+        LEFT JOIN workorder wo ON ms.workorder_id = wo.workorder_id
+        WHERE list_contains(%(serial_numbers)s, mtr.serial_number)
+        ORDER BY mtr.serial_number, mtr.test_end_time, rm.repaired_date
+        ''', serial_numbers="text[]")
+
+def create_repair_table(sn, station, normalized_symptoms=False, root=None):
+    """data_query.create_repair_table on the cached extracts."""
+    return run(repair_table_templates[normalized_symptoms], {"sn": sn, "station": station}, root)
+
+def serial_info(serial_numbers, root=None):
+    """data_query.serial_info on the cached extracts."""
+    return run(serial_info_template, {"serial_numbers": serial_numbers}, root)
+
+def repair_group_table(model_name, build_type, skuno, station, root=None):
+    """data_query.repair_group_table on the cached extracts."""
+    params = {"model_name": model_name, "build_type": build_type, "skuno": skuno, "station": station}
+    return run(repair_group_template, params, root)
+
+def symptom_result(repair_sn, root=None):
+    """data_query.symptom_result on the cached extracts."""
+    return run(symptom_result_template, {"serial_numbers": repair_sn}, root)
+
+def create_intel_table(sn, root=None):
+    """data_query.create_intel_table on the cached extracts."""
+    return run(intel_table_template, {"serial_numbers": sn}, root)
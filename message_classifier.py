@@ -0,0 +1,211 @@
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# Failure label -> regex patterns used to pick between suggestions of the same label.
+# A callable entry returns the patterns for a given symptom message.
+PATTERN_DICT = {
+    "Checking BMC boot readiness and get BMC IP Failed": [
+        r"Switch to agora console failed.*", r"Failed to get IP address"
+    ],
+    "HB16 firmware check Failed": [
+        r"Send command", r"Check HB16 version failed"
+    ],
+    "The sensor count of Config_check_HW is not matched.":[
+        fr"OUTLET T {i}" for i in range(1, 4)
+    ] + [r"P48V"],
+    "Validate Diorite PN, SN and installed slot Failed": lambda msg: [
+        fr"usb_loc {port}.*Timeout opening channel"
+        for port in ["1-1.1", "1-1.2", "1-1.7.1", "1-1.7.2"] if port in msg] + [
+        fr"usb_loc {port}"
+        for port in ["1-1.1", "1-1.2", "1-1.7.1", "1-1.7.2"] if port in msg
+    ],
+    "pcierrors-high-lane_error-rate": lambda msg: (
+        [
+            rf"0000:({'|'.join(group)})\b"
+            for group in [
+                {"00", "01"}, {"20", "21"}, {"40", "41"}, {"60", "61"},
+                {"80", "81"}, {"a0", "a1"}, {"c0", "c1"}, {"e0", "e1"}
+            ]
+            if (match := re.search(r"0000:([a-fA-F0-9]{2})", msg)) and match.group(1).lower() in group
+        ]
+        if re.search(r"0000:([a-fA-F0-9]{2})", msg)
+        else []
+    ),
+    "Lower critical limit violated": lambda msg: (
+        [rf"^got \d+ violations, exceeding threshold of \d+ for sensor fan{fan} tach\."
+        for fan in range(0, 6)
+        if f"sensor fan{fan}" in msg.lower()] +
+        [r"^got \d+ violations, exceeding threshold of \d+ for sensor RTC 3V\."]
+    ),
+    "Diorite location validation failure": [
+        r"Component diorite sn: .*? not found on unit", r"Component diorite sn \S+ location: \S+, expected location: \S+"
+    ],
+    "Create Host SSH Connection failed": [
+        r"No address associated with hostname", r"Unable to connect to"
+    ],
+    "excessive-correctable-unclassified-cpu-errors": lambda msg: (
+        [fr"CPU{i} UNCLASSIFIED" for i in range(0,2) if f"CPU{i}" in msg]
+    ),
+
+    "Update Foxconn BIOS Failed" : [
+        r"^Update BIOS failed\..*", r"^Update BIOS failed\.(\r\n)?Exception message:.*"
+    ],
+    "Total Sensors fail": [
+        fr"OUTLET T {i}" for i in range(1, 4)
+    ] + [r"P48V"],
+    "unknown-pcie-location": lambda msg: (
+        [
+            rf"0000:({'|'.join(group)})\b"
+            for group in [
+                {"00", "01"}, {"20", "21"}, {"40", "41"}, {"60", "61"},
+                {"80", "81"}, {"a0", "a1"}, {"c0", "c1"}, {"e0", "e1"}
+            ]
+            if (match := re.search(r"0000:([a-fA-F0-9]{2})", msg)) and match.group(1).lower() in group
+        ]
+        if re.search(r"0000:([a-fA-F0-9]{2})", msg)
+        else []
+    ),
+    "pcierrors-high-receiver_error-rate": lambda msg: (
+        [
+            rf"0000:({'|'.join(group)})\b"
+            for group in [
+                {"00", "01"}, {"20", "21"}, {"40", "41"}, {"60", "61"},
+                {"80", "81"}, {"a0", "a1"}, {"c0", "c1"}, {"e0", "e1"}
+            ]
+            if (match := re.search(r"0000:([a-fA-F0-9]{2})", msg)) and match.group(1).lower() in group
+        ]
+        if re.search(r"0000:([a-fA-F0-9]{2})", msg)
+        else []
+    ),
+    "DMA stress test Failed": [
+        "DMA channel not found in stress result",
+        "Send command 'ls /root/run_dmatest_host_per.sh' failed.",
+        "Send command 'ls /sys/module/dmatest/parameters/' failed.",
+        r"Send command 'sh /root/run_dmatest_host_per\.sh .*' failed\."  # <- regex with variable arguments
+    ],
+    "Update Google BIOS Failed": [
+        r"Send command '/export/hda3/meltan/biosintegrity/biosintegrity --expected_bios_version=.*?' failed\.\s*Failure Info:",
+        r"Update BIOS failed\.\s*.*bios\.bin\s*.*bios\.sig"
+    ],
+    "HB16 location validation failure": [
+        r"Component HB16 SN: .*? not found on unit", r"Component HB16 SN \S+ location: \S+, expected location: \S+"
+    ],
+    "FRU infos validation failure": [
+        r"(SN: [\w-]+ [\w-]+ not (found on unit|match unit)|PN:\s?[\w-]+ not (found on unit|match unit))",
+        r"SN: PDF\w+ not found on unit",
+        r"SN: IPB\w+ not found on unit",
+        r"SN: AST\w+ not found on unit",
+        r"SN: AAH\w+ not found on unit",
+        r"SN: KW\w+-\w+ \w+ not found on unit",
+        r"SN: HAB\w+ not found on unit"
+    ]
+}
+
+# Regex flags used for every pattern (as in select_best_message)
+PATTERN_FLAGS = re.IGNORECASE | re.DOTALL
+
+@lru_cache(maxsize=4096)
+def compile_matcher(patterns):
+    """
+    Compiles a tuple of patterns into one regex that reports, in a single search, every
+    pattern found anywhere in a message: each pattern sits in its own optional lookahead
+    with a named group, so `group("_p<i>")` is set exactly when re.search(pattern) would match.
+    """
+    lookaheads = "".join(f"(?:(?=.*?(?P<_p{i}>{pattern})))?" for i, pattern in enumerate(patterns))
+    return re.compile("^" + lookaheads, PATTERN_FLAGS)
+
+@lru_cache(maxsize=65536)
+def matched_patterns(patterns, message):
+    """Positions (in `patterns` order) of the patterns that match `message`."""
+    match = compile_matcher(patterns).search(message)
+    return tuple(i for i in range(len(patterns)) if match.group(f"_p{i}") is not None)
+
+def label_patterns(failure_label, symptom_msg, pattern_dict=PATTERN_DICT):
+    """Patterns of a label as a tuple; callable entries are evaluated on the symptom message."""
+    if not pattern_dict or failure_label not in pattern_dict:
+        return ()
+    entry = pattern_dict[failure_label]
+    return tuple(entry(symptom_msg) if callable(entry) else entry)
+
+def select_best_position(messages, failure_label, symptom_msg, pattern_dict=PATTERN_DICT):
+    """
+    Picks one of the candidate suggestion `messages` for a symptom message:
+    1. the first candidate equal to the symptom message (ignoring surrounding whitespace),
+    2. else, for the first pattern of the label matching the symptom message that also matches
+       a candidate, the first such candidate,
+    3. else the first candidate.
+
+    Returns:
+        int: Position in `messages`, or None if there are no candidates.
+    """
+    if not messages:
+        return None
+    stripped = symptom_msg.strip()
+    for position, message in enumerate(messages):
+        if message.strip() == stripped:
+            return position
+
+    patterns = label_patterns(failure_label, symptom_msg, pattern_dict)
+    if patterns:
+        candidate_matches = None
+        for i in matched_patterns(patterns, symptom_msg):
+            if candidate_matches is None:
+                candidate_matches = [matched_patterns(patterns, message) for message in messages]
+            for position, found in enumerate(candidate_matches):
+                if i in found:
+                    return position
+    return 0
+
+def select_best_message(msg_ref_qs, failure_label, symptom_msg, pattern_dict=PATTERN_DICT):
+    """
+    Returns the row of the suggestion DataFrame `msg_ref_qs` (with a `message` column) that
+    best matches `symptom_msg`; see select_best_position. Returns None if there are no rows.
+    """
+    position = select_best_position(tuple(msg_ref_qs["message"]), failure_label, symptom_msg, pattern_dict)
+    return msg_ref_qs.iloc[position] if position is not None else None
+
+def classify_messages(df, suggestions, left_on=("symptom_label",), right_on=("symptom_label",),
+                      label_col="symptom_label", msg_col="message", pattern_dict=PATTERN_DICT):
+    """
+    Selects a suggestion for every row of `df` in bulk.
+
+    Suggestions are grouped once by `right_on`; each row of `df` is matched against the
+    candidates of its `left_on` key, and every distinct (key, label, message) combination is
+    classified only once.
+
+    Parameters:
+        df (DataFrame): Rows to classify, with the `left_on` columns, `label_col` and `msg_col`.
+        suggestions (DataFrame): Suggestion table (e.g. manufacturing_symptomlabelsuggestion
+            joined with its category) with the `right_on` columns and a `message` column.
+        left_on / right_on (sequence): Key columns of `df` and of `suggestions`, e.g.
+            ("symptom_label", "production_version", "cycle") and
+            ("symptom_label", "prod_ver", "cycle_count").
+        label_col (str): Column of `df` holding the failure label used to look up patterns.
+        msg_col (str): Column of `df` holding the symptom message.
+        pattern_dict (dict): Label -> list of patterns, or callable(msg) returning one.
+
+    Returns:
+        Series: Index label of the selected suggestion row for each row of `df`
+            (NaN when there is no candidate or no message).
+    """
+    left_on, right_on = list(left_on), list(right_on)
+    candidates = {
+        key if isinstance(key, tuple) else (key,): (tuple(group.index), tuple(group["message"]))
+        for key, group in suggestions.groupby(right_on, sort=False)
+    }
+
+    keys = list(zip(*(df[col] for col in left_on)))
+    selected = {}
+    result = []
+    for key, failure_label, symptom_msg in zip(keys, df[label_col], df[msg_col]):
+        if key not in candidates or not isinstance(symptom_msg, str):
+            result.append(np.nan)
+            continue
+        cache_key = (key, failure_label, symptom_msg)
+        if cache_key not in selected:
+            index, messages = candidates[key]
+            selected[cache_key] = index[select_best_position(messages, failure_label, symptom_msg, pattern_dict)]
+        result.append(selected[cache_key])
+    return pd.Series(result, index=df.index, dtype=object)
@@ -0,0 +1,108 @@
+import hashlib
+import re
+import threading
+from collections import deque
+import pandas as pd
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+")
+_SPACE = re.compile(r"\s+")
+
+def normalize_query(query):
+    """
+    Query text with comments removed, literals and placeholders replaced by `?`,
+    whitespace collapsed and lower-cased, so that calls differing only in values group together.
+    """
+    query = _COMMENT.sub(" ", query)
+    query = _STRING.sub("?", query)
+    query = _PLACEHOLDER.sub("?", query)
+    query = _NUMBER.sub("?", query)
+    return _SPACE.sub(" ", query).strip().rstrip(";").strip().lower()
+
+def fingerprint(query):
+    """Short stable hash of the normalized query."""
+    return hashlib.md5(normalize_query(query).encode("utf-8")).hexdigest()[:12]
+
+class QueryProfiler:
+    """
+    In-process registry of database calls (Postgres through data_query, Access through
+    access_reader). One record per call with the query fingerprint, rows returned, result
+    size, wall time (execute + fetch), DataFrame build time and optionally the
+    EXPLAIN (ANALYZE, BUFFERS) plan.
+
+    `bytes` is the in-memory size of the returned DataFrame; the drivers do not expose the
+    bytes received on the wire, and this is a close proxy for comparing queries. By default
+    object (string) columns count only their pointers; deep_memory=True measures the strings
+    too, which walks every value and costs about as much as building the frame.
+    Only the latest `max_records` calls are kept.
+    """
+
+    def __init__(self, enabled=True, explain=False, max_records=10000, deep_memory=False):
+        self.enabled = enabled
+        self.explain = explain  # Postgres only; EXPLAIN ANALYZE runs the query a second time
+        self.deep_memory = deep_memory
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, source, query, df, wall_time, build_time=None, plan=None):
+        """Adds one call to the registry (no-op when disabled)."""
+        if not self.enabled:
+            return
+        record = {
+            "timestamp": pd.Timestamp.now(),
+            "source": source,
+            "fingerprint": fingerprint(query),
+            "query": normalize_query(query),
+            "rows": len(df) if df is not None else 0,
+            "bytes": int(df.memory_usage(index=False, deep=self.deep_memory).sum()) if df is not None else 0,
+            "wall_time": wall_time,
+            "build_time": build_time,
+            "plan": plan,
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def to_frame(self):
+        """Every recorded call as a DataFrame (one row per call)."""
+        with self._lock:
+            records = list(self.records)
+        columns = ["timestamp", "source", "fingerprint", "query", "rows", "bytes", "wall_time", "build_time", "plan"]
+        return pd.DataFrame(records, columns=columns)
+
+    def summary(self):
+        """
+        Calls aggregated per (source, fingerprint), slowest total wall time first.
+
+        Returns:
+            DataFrame: source, fingerprint, query, calls, total/mean/max wall_time,
+                total build_time, total rows and bytes.
+        """
+        calls = self.to_frame()
+        summary = calls.groupby(["source", "fingerprint"], sort=False).agg(
+            query=("query", "first"),
+            calls=("query", "size"),
+            total_wall_time=("wall_time", "sum"),
+            mean_wall_time=("wall_time", "mean"),
+            max_wall_time=("wall_time", "max"),
+            total_build_time=("build_time", "sum"),
+            rows=("rows", "sum"),
+            bytes=("bytes", "sum"),
+        ).reset_index()
+        return summary.sort_values(by="total_wall_time", ascending=False).reset_index(drop=True)
+
+    def to_csv(self, file_path, summary=False):
+        """Writes the calls (or the per-fingerprint summary) to CSV."""
+        (self.summary() if summary else self.to_frame()).to_csv(file_path, index=False)
+
+    def to_json(self, file_path, summary=False):
+        """Writes the calls (or the per-fingerprint summary) to JSON (a list of records)."""
+        (self.summary() if summary else self.to_frame()).to_json(file_path, orient="records", date_format="iso", indent=2)
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+
+# Process-wide registry used by data_query and access_reader
+profiler = QueryProfiler()
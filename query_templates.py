@@ -0,0 +1,76 @@
+import re
+import schema as sc
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s")
+
+def unquote(value):
+    """Strips one pair of surrounding single quotes ("'FWI2341-09108'" -> "FWI2341-09108")."""
+    value = str(value).strip()
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1]
+    return value
+
+def _array(coerce):
+    def coerce_array(values):
+        if isinstance(values, str):
+            values = [values]
+        return [coerce(value) for value in values]
+    return coerce_array
+
+# Supported Postgres parameter types -> coercion of the Python value before binding.
+# Timestamps are wall-clock time in schema.TIMEZONE and are bound with their offset from UTC.
+COERCE = {
+    "text": unquote,
+    "int": int,
+    "timestamp": sc.timestamp_param,
+    "timestamptz": sc.timestamp_param,
+    "text[]": _array(unquote),
+    "int[]": _array(int),
+}
+
+class QueryTemplate:
+    """
+    SQL with named %(name)s placeholders and a declared Postgres type per parameter.
+
+    Values are bound by the driver instead of being formatted into the SQL, so one statement
+    text serves every call and can be prepared once per connection (see data_query.db_query).
+    Array types bind a Python list and are used with `= ANY(%(name)s)`, so a single query
+    can serve any number of serial numbers.
+
+    Example:
+        QueryTemplate("dq_symptom_result", "... WHERE mtr.serial_number = ANY(%(serial_numbers)s)",
+                      serial_numbers="text[]")
+    """
+
+    def __init__(self, name, sql, **types):
+        placeholders = set(_PLACEHOLDER.findall(sql))
+        if placeholders != set(types):
+            raise ValueError(f"{name}: placeholders {sorted(placeholders)} do not match declared parameters {sorted(types)}")
+        unknown = [param_type for param_type in types.values() if param_type not in COERCE]
+        if unknown:
+            raise ValueError(f"{name}: unsupported parameter types {unknown}")
+        self.name = name.lower()  # Postgres folds unquoted statement names to lower case
+        self.sql = sql
+        self.types = types
+
+    def bind(self, params):
+        """Checks that every declared parameter is given (and nothing else) and coerces the values."""
+        missing = set(self.types) - set(params)
+        extra = set(params) - set(self.types)
+        if missing or extra:
+            raise TypeError(f"{self.name}: missing parameters {sorted(missing)}, unexpected parameters {sorted(extra)}")
+        return {param: COERCE[param_type](params[param]) for param, param_type in self.types.items()}
+
+    @property
+    def prepare_sql(self):
+        """PREPARE statement with positional, typed parameters ($1, $2, ... in declaration order)."""
+        positions = {param: i + 1 for i, param in enumerate(self.types)}
+        body = _PLACEHOLDER.sub(lambda m: f"${positions[m.group(1)]}", self.sql)
+        # The PREPARE text is sent without parameters, so psycopg2 does not unescape %%
+        body = body.replace("%%", "%").strip().rstrip(";")
+        return f"PREPARE {self.name} ({', '.join(self.types.values())}) AS {body}"
+
+    @property
+    def execute_sql(self):
+        """EXECUTE statement taking the bound parameters by name."""
+        return f"EXECUTE {self.name} ({', '.join(f'%({param})s' for param in self.types)})"
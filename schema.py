@@ -0,0 +1,183 @@
+import datetime
+import os
+import pandas as pd
+from dateutil import tz
+
+# Time zone policy for timestamps coming from Postgres: sessions run in UTC (SESSION_TIMEZONE), so
+# timestamptz columns arrive with a single offset and load as datetime64[ns, UTC], and every
+# timestamp column is returned as naive datetime64 wall-clock time in TIMEZONE.
+# Unset (None) uses the time zone of this machine.
+SESSION_TIMEZONE = "UTC"
+TIMEZONE = os.environ.get("DQ_TIMEZONE") or None
+
+# LockScrewData (station Access files)
+LOCK_SCREW_SCHEMA = {
+    "LockScrewTime": "datetime64[ns]",
+    "SN": "category",
+    "PointNumber": "int8",
+    "LockScrewTable": "category",
+    "LockScrewResult": "category",
+}
+
+# Columns of the manufacturing_* tables, as named in the data_query extracts and queries
+MANUFACTURING_SCHEMA = {
+    # Identifiers repeated over many rows
+    "serial_number": "category",
+    "station": "category",
+    "station_id": "category",
+    "model_name": "category",
+    "build_type": "category",
+    "skuno": "category",
+    "production_version": "category",
+    "action": "category",
+    "failure_code": "category",
+    "failure_description": "category",
+    "repair_code": "category",
+    "symptom_label": "category",
+    "symptom_msg": "category",
+    # Results and flags
+    "result": "int8",
+    "test_result": "int8",
+    "repair_result": "int8",
+    "failed": "int8",
+    "completed": "int8",
+    "shipped": "int8",
+    "printed": "int8",
+    "target_qty": "int32",
+    "finished_qty": "int32",
+    # Timestamps
+    "action_date": "datetime64[ns]",
+    "generated_date": "datetime64[ns]",
+    "complete_date": "datetime64[ns]",
+    "pack_date": "datetime64[ns]",
+    "ship_date": "datetime64[ns]",
+    "update_date": "datetime64[ns]",
+    "test_start_time": "datetime64[ns]",
+    "test_end_time": "datetime64[ns]",
+    "testing_date": "datetime64[ns]",
+    "repaired_date": "datetime64[ns]",
+    "debug_start_time": "datetime64[ns]",
+    "create_date": "datetime64[ns]",
+    "created_at": "datetime64[ns]",
+    "repair_detail_created_at": "datetime64[ns]",
+}
+
+def _cast(series, dtype):
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(series, errors="coerce").astype(dtype)
+    if dtype == "category":
+        return series.astype("category")
+    if dtype.startswith("int"):
+        numeric = pd.to_numeric(series)
+        # Columns with NULLs stay float64 (NaN), as pandas loads them without a schema: float32
+        # would round integers above 2**24, and nullable Int* would make NULL == 1 <NA> not False
+        return numeric.astype("float64") if numeric.isna().any() else numeric.astype(dtype)
+    return series.astype(dtype)
+
+def _naive_timestamps(series):
+    """
+    datetime64 wall-clock time in TIMEZONE of a column of tz-aware/naive datetimes or dates.
+    Naive values (timestamp without time zone, dates) are kept as they are.
+    """
+    if not isinstance(series.dtype, pd.DatetimeTZDtype):
+        # utc=True also covers aware values with several offsets (sessions not in UTC)
+        first = series.first_valid_index()
+        aware = first is not None and getattr(series[first], "tzinfo", None) is not None
+        series = pd.to_datetime(series, utc=aware)
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_convert(TIMEZONE or tz.tzlocal()).dt.tz_localize(None)
+    return series
+
+def aware_timestamp(value):
+    """
+    tz-aware Timestamp of `value`. Naive values are wall-clock time in TIMEZONE, as query results
+    are returned; a wall-clock time repeated or skipped by a DST change takes the earlier instant.
+    """
+    value = pd.Timestamp(value)
+    if value.tzinfo is None:
+        value = value.tz_localize(TIMEZONE or tz.tzlocal(), ambiguous=True, nonexistent="shift_backward")
+    return value
+
+def naive_timestamp(value):
+    """Wall-clock time in TIMEZONE of a naive (kept as it is) or tz-aware timestamp."""
+    value = pd.Timestamp(value)
+    if value.tzinfo is not None:
+        value = value.tz_convert(TIMEZONE or tz.tzlocal()).tz_localize(None)
+    return value
+
+def timestamp_param(value):
+    """
+    Query parameter for a timestamp (see aware_timestamp): ISO text with its offset from UTC.
+    Postgres reads it as that instant when compared with a timestamptz, and as the wall-clock
+    time in TIMEZONE (the offset is ignored) when compared with a timestamp without time zone,
+    whatever the session time zone. A naive datetime would be read in the session time zone.
+    """
+    return aware_timestamp(value).floor("us").isoformat()
+
+def normalize_timestamps(df):
+    """
+    Converts the timestamp columns of a query result (native datetime values from psycopg2)
+    to naive datetime64 following the TIMEZONE policy. Modifies and returns `df`.
+    """
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            df[col] = _naive_timestamps(series)
+        elif series.dtype == object:
+            first = series.first_valid_index()
+            if first is not None and isinstance(series[first], (datetime.datetime, datetime.date)):
+                df[col] = _naive_timestamps(series)
+    return df
+
+def memory_report(before, after):
+    """
+    Per-column memory footprint of a frame before and after compaction.
+
+    Returns:
+        DataFrame: column, dtype_before, dtype_after, bytes_before, bytes_after, saved_pct,
+            with a final "total" row.
+    """
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.reindex(before.columns).astype(str),
+        "bytes_before": before.memory_usage(index=False, deep=True),
+        "bytes_after": after.memory_usage(index=False, deep=True).reindex(before.columns),
+    })
+    report.loc["total"] = ["", "", report["bytes_before"].sum(), report["bytes_after"].sum()]
+    report["saved_pct"] = (100 * (1 - report["bytes_after"] / report["bytes_before"])).round(1)
+    return report.rename_axis("column").reset_index()
+
+def apply_schema(df, schema=MANUFACTURING_SCHEMA, report=False):
+    """
+    Casts the columns of `df` listed in `schema` to their compact dtype (columns not in the
+    schema are left unchanged). A column whose values cannot be converted keeps its dtype.
+
+    Parameters:
+        df (DataFrame): Frame to compact (not modified).
+        schema (dict): Column -> dtype, e.g. LOCK_SCREW_SCHEMA or MANUFACTURING_SCHEMA.
+        report (bool): Also return memory_report(df, compacted).
+
+    Returns:
+        DataFrame, or (DataFrame, DataFrame) with report=True.
+    """
+    compact = df.copy()
+    for col, dtype in schema.items():
+        if col not in compact.columns or str(compact[col].dtype) == dtype:
+            continue
+        try:
+            compact[col] = _cast(compact[col], dtype)
+        except (ValueError, TypeError):
+            pass
+    if report:
+        return compact, memory_report(df, compact)
+    return compact
+
+def read_csv(file_path, schema=MANUFACTURING_SCHEMA, **kwargs):
+    """
+    Reads a cached CSV extract (e.g. data_query.mtr_data) with the schema applied: category
+    columns are parsed straight into categoricals and the remaining columns cast afterwards.
+    """
+    header = pd.read_csv(file_path, nrows=0, **kwargs).columns
+    dtype = {col: "category" for col in header if schema.get(col) == "category"}
+    df = pd.read_csv(file_path, dtype=dtype, **kwargs)
+    return apply_schema(df, schema)
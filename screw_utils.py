@@ -1,45 +1,229 @@
 import pandas as pd
-import pyodbc
+import access_reader as ar
+import schema as sc
 import plotly.graph_objects as go
 import os
+import json
 import numpy as np
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.simplefilter(action='ignore', category=Warning)
 
-def query_access_db(file_path, query):
+def query_access_db(file_path, query, params=None):
     """
-    Connects to an Access database, executes a query, and returns the results as a DataFrame.
+    Connects to an Access database through ODBC, executes a query, and returns the results as a DataFrame.
 
     Parameters:
         file_path (str): Full path to the Access database file (*.mdb or *.accdb).
         query (str): SQL query to execute.
+        params (list, optional): Values bound to the `?` placeholders in the query.
 
     Returns:
         pandas.DataFrame: Query results as a DataFrame.
     """
-    try:
-        # Ensure the file exists
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"The file {file_path} does not exist.")
-        
-        # Define the connection string
-        conn_str = (
-            rf'DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};'
-            rf'DBQ={file_path};'
-        )
-        
-        # Establish the connection
-        conn = pyodbc.connect(conn_str)
-        
-        # Execute the query and fetch results into a DataFrame
-        df = pd.read_sql_query(query, conn)
-        # Close the connection
-        conn.close()
-        
-        return df
-    except Exception as e:
-        print(f"Error: {e}")
+    return ar.OdbcReader().query(file_path, query, params=params)
+
+# Access reader backend (ODBC on Windows, mdbtools on Linux); see access_reader.get_reader
+reader = ar.get_reader()
+
+def load_station_incremental(file_path, previous=None, table="LockScrewData", time_col="LockScrewTime"):
+    """
+    Loads lock screw records for a station file, fetching only the rows newer than
+    the last `time_col` of `previous` and appending them to it.
+
+    Without `previous` (or when the month has rolled over since) the full table is read.
+    Rows sharing the boundary timestamp are re-fetched and de-duplicated, so records
+    written within the same second as the previous refresh are not lost.
+
+    Parameters:
+        file_path (str): Full path to the Access database file.
+        previous (DataFrame, optional): Records returned by the previous call; not modified.
+        table (str): Table to read.
+        time_col (str): Monotonic timestamp column used as the watermark.
+
+    Returns:
+        pandas.DataFrame: All records seen so far for the station, or None on error.
+    """
+    cached = previous
+    last_time = None
+    if cached is not None and not cached.empty:
+        last_time = cached[time_col].max()
+        # The current-month file starts over at the beginning of each month
+        if last_time.strftime("%Y-%m") != pd.Timestamp.now().strftime("%Y-%m"):
+            cached, last_time = None, None
+
+    if last_time is None:
+        df = reader.read_table(file_path, table)
+        if df is None:
+            return None
+    else:
+        new_rows = reader.read_table(file_path, table, time_col=time_col, since=last_time)
+        if new_rows is None:
+            return cached
+
+        # Drop boundary rows that are already in the cached frame (duplicates counted per occurrence)
+        cols = list(new_rows.columns)
+        boundary = cached.loc[cached[time_col] == last_time, cols].copy()
+        boundary["_occurrence"] = boundary.groupby(cols, dropna=False).cumcount()
+        new_rows["_occurrence"] = new_rows.groupby(cols, dropna=False).cumcount()
+        new_rows = new_rows.merge(boundary, on=cols + ["_occurrence"], how="left", indicator=True)
+        new_rows = new_rows[new_rows["_merge"] == "left_only"].drop(columns=["_occurrence", "_merge"])
+        if not new_rows.empty:
+            # Categories of the two frames differ, so concat falls back to object columns
+            df = sc.apply_schema(pd.concat([cached, new_rows], ignore_index=True), sc.LOCK_SCREW_SCHEMA)
+        else:
+            df = cached
+    return df
+
+def reset_station_cache(file_path=None):
+    """Forget the loaded records of one station file, or of all stations if None."""
+    if file_path is None:
+        station_cache.clear()
+    else:
+        station_cache.discard(file_path)
+
+class FrameCache:
+    """
+    Process-wide LRU cache of DataFrames keyed by (file path, file mtime), shared by all
+    Dash callbacks and browser sessions.
+
+    Entries expire after `ttl` seconds (Access does not always bump the file mtime while it
+    is open) and the least recently used entries are evicted once the cache holds more than
+    `max_entries` frames or `max_bytes` of data. Concurrent misses on the same file wait
+    for a single load instead of each reading the database.
+
+    With incremental=True the loader also receives the frame it returned last time (even
+    if that entry has expired), so the cache is the only copy of the incremental state.
+    """
+
+    def __init__(self, ttl=60, max_entries=16, max_bytes=512 * 1024 ** 2):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # file_path -> (mtime, loaded_at, nbytes, df)
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get_or_load(self, file_path, loader, incremental=False):
+        """
+        Return a copy of the cached frame for `file_path`, calling `loader(file_path)` on a miss,
+        or `loader(file_path, previous)` with incremental=True (previous is None if nothing is cached).
+        """
+        with self._lock:
+            load_lock = self._load_locks.setdefault(file_path, threading.Lock())
+
+        with load_lock:
+            mtime = os.path.getmtime(file_path) if os.path.exists(file_path) else None
+            with self._lock:
+                entry = self._entries.get(file_path)
+                if entry is not None and entry[0] == mtime and time.time() - entry[1] < self.ttl:
+                    self._entries.move_to_end(file_path)
+                    self.hits += 1
+                    return entry[3].copy()
+                self.misses += 1
+
+            if incremental:
+                df = loader(file_path, entry[3] if entry is not None else None)
+            else:
+                df = loader(file_path)
+            if df is None:
+                return None
+
+            with self._lock:
+                self._entries[file_path] = (mtime, time.time(), int(df.memory_usage(deep=True).sum()), df)
+                self._entries.move_to_end(file_path)
+                self._evict()
+            return df.copy()
+
+    def _evict(self):
+        total_bytes = sum(entry[2] for entry in self._entries.values())
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            total_bytes -= entry[2]
+
+    def stats(self):
+        """Return hit/miss counters and the current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": sum(entry[2] for entry in self._entries.values()),
+            }
+
+    def discard(self, file_path):
+        with self._lock:
+            self._entries.pop(file_path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+station_cache = FrameCache()
+
+def load_station_cached(file_path, current_month=True):
+    """
+    Load a station file through the shared `station_cache`.
+    The current-month file is refreshed incrementally; backup files are read in full.
+    """
+    if current_month:
+        return station_cache.get_or_load(file_path, load_station_incremental, incremental=True)
+    return station_cache.get_or_load(file_path, load_backup_snapshot)
+
+def compact_screw_frame(df):
+    """Keep the LockScrewData columns used by the dashboard, stored with compact dtypes."""
+    return sc.apply_schema(df[list(sc.LOCK_SCREW_SCHEMA)], sc.LOCK_SCREW_SCHEMA)
+
+def load_backup_snapshot(backup_file):
+    """
+    Load a backup month from its Parquet snapshot next to the .accdb file, creating the
+    snapshot from the Access file on first use. Backup files never change, so once the
+    snapshot exists the ODBC driver is not needed to browse that month.
+
+    The snapshot is written to a temporary file and moved into place, so an interrupted write
+    never leaves a truncated snapshot. If it cannot be written (e.g. a read-only backup share),
+    the records are returned without a snapshot.
+    """
+    snapshot_file = os.path.splitext(backup_file)[0] + ".parquet"
+    if os.path.exists(snapshot_file):
+        return pd.read_parquet(snapshot_file)
+
+    df = reader.read_table(backup_file, "LockScrewData")
+    if df is None:
         return None
+    df = compact_screw_frame(df)
+    tmp_file = snapshot_file + ".tmp"
+    try:
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, snapshot_file)
+    except OSError as e:
+        print(f"Could not save the snapshot of {backup_file}: {e}")
+        if os.path.exists(tmp_file):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+    return df
+
+# Memoized summaries of backup months: {backup_file: (left_pass, left_defects, right_pass, right_defects)}
+_backup_summaries = {}
+
+def backup_month_summaries(backup_file):
+    """
+    Return (left_pass, left_defects, right_pass, right_defects) for a backup month.
+    The month is processed once per process; later calls return copies of the memoized result.
+    """
+    if backup_file not in _backup_summaries:
+        df = load_backup_snapshot(backup_file)
+        if df is None:
+            return None
+        _backup_summaries[backup_file] = summarize_hours(df, "Left") + summarize_hours(df, "Right")
+    return tuple(summary.copy() for summary in _backup_summaries[backup_file])
 
 def filter_by_date_n_table(df, date, table):
     # Filter DataFrame for the given date and table
@@ -57,70 +241,59 @@ def process_data(df, table_side):
 
 def identify_sequences(df):
     """Identify sequence groups within each SN."""
-    df["Prev_PointNumber"] = df.groupby("SN")["PointNumber"].shift(1)
+    df["Prev_PointNumber"] = df.groupby("SN", observed=True)["PointNumber"].shift(1)
     df["New_Sequence_Flag"] = (df["PointNumber"] == 2) | (df["PointNumber"] != df["Prev_PointNumber"] + 1)
-    df["Sequence_Group"] = df.groupby("SN")["New_Sequence_Flag"].cumsum()
+    df["Sequence_Group"] = df.groupby("SN", observed=True)["New_Sequence_Flag"].cumsum()
     df.drop(columns=["Prev_PointNumber", "New_Sequence_Flag"], inplace=True)
     return df
 
 def adjust_hour_per_sequence(df):
-    """Assign the correct Hour_Adjusted for each sequence group."""
+    """
+    Assign the correct Hour_Adjusted for each sequence group.
+
+    Rules (per SN / Sequence_Group, applied in order):
+    - A sequence fully within one hour stays in that hour.
+    - A sequence spanning several hours keeps each record's own hour, unless it is
+      incomplete (starts at point 2 but never reaches 26), in which case it moves to Start_Hour + 1h.
+    - Completed sequences (2 -> 26) stay in their Start_Hour.
+    - Incomplete sequences starting at 23:00 move to the next hour (i.e. the next day).
+    """
+    df = df.reset_index(drop=True)
+    seq_keys = [df["SN"], df["Sequence_Group"]]
+
     # --- Step 2: Identify First & Last PointNumber Per Sequence ---
-    seq_group = df.groupby(["SN", "Sequence_Group"])["PointNumber"].agg(["min", "max"]).reset_index()
-    df = df.merge(seq_group, on=["SN", "Sequence_Group"], how="left")
+    point_min = df.groupby(seq_keys, observed=True)["PointNumber"].transform("min")
+    point_max = df.groupby(seq_keys, observed=True)["PointNumber"].transform("max")
 
-    # --- Step 3: Determine the Correct Hour for Each Sequence_Group ---
+    # --- Step 3: Determine the Start and End Hour for Each Sequence_Group ---
     df["Hour"] = df["LockScrewTime"].dt.floor("H")
+    start_hour = df.groupby(seq_keys, observed=True)["Hour"].transform("min")
+    end_hour = df.groupby(seq_keys, observed=True)["Hour"].transform("max")
+    next_hour = start_hour + pd.Timedelta(hours=1)
 
-    # Find the minimum and maximum hour for each sequence group
-    seq_time_group = df.groupby(["SN", "Sequence_Group"])["Hour"].agg(["min", "max"]).reset_index()
-    seq_time_group.rename(columns={"min": "Start_Hour", "max": "End_Hour"}, inplace=True)
-    df = df.merge(seq_time_group, on=["SN", "Sequence_Group"], how="left")
+    incomplete = (point_min == 2) & (point_max < 26)
+    complete = (point_min == 2) & (point_max == 26)
 
-    # Step 4: Assign Hour_Adjusted Properly Per Sequence Group
-    # Case 1: If the sequence group is fully within the same hour, it stays there
-    mask_same_hour = df["Start_Hour"] == df["End_Hour"]
-    df.loc[mask_same_hour, "Hour_Adjusted"] = df["Start_Hour"]
-
-    # Case 2: If the sequence spans multiple hours, adjust accordingly
-    mask_split_hour = df["Start_Hour"] < df["End_Hour"]
-    df.loc[mask_split_hour, "Hour_Adjusted"] = df["LockScrewTime"].dt.floor("H")
+    # Step 4: Same-hour sequences stay at Start_Hour, split sequences keep their own hour
+    hour_adjusted = df["Hour"].where(start_hour < end_hour, start_hour)
 
     # --- Step 5: Adjust for Incomplete Sequences ---
-    # Adjust hour per sequence group, considering only its own records
-    for (sn, seq_group), group in df.groupby(["SN", "Sequence_Group"]):
-        start_hour = group["Hour"].min()
-        end_hour = group["Hour"].max()
-
-        # If the sequence is fully within the same hour, keep it unchanged
-        if start_hour == end_hour:
-            df.loc[group.index, "Hour_Adjusted"] = start_hour
-        else:
-            # If the sequence is incomplete (not reaching 26), shift it forward by 1 hour
-            if group["min"].iloc[0] == 2 and group["max"].iloc[0] < 26:
-                df.loc[group.index, "Hour_Adjusted"] = start_hour + pd.Timedelta(hours=1)
-            else:
-                df.loc[group.index, "Hour_Adjusted"] = group["Hour"]
-
+    # Split incomplete sequences are shifted forward by 1 hour
+    hour_adjusted = hour_adjusted.mask((start_hour < end_hour) & incomplete, next_hour)
 
     # Ensure completed sequences remain in their original hour
-    mask_complete = (df["min"] == 2) & (df["max"] == 26)
-    df.loc[mask_complete, "Hour_Adjusted"] = df["Start_Hour"]
+    hour_adjusted = hour_adjusted.mask(complete, start_hour)
 
     # Handle cases where an incomplete sequence starts at 23:00 and should move to the next day
-    mask_next_day = (df["Start_Hour"].dt.hour == 23) & (df["min"] == 2) & (df["max"] < 26)
-    df.loc[mask_next_day, "Hour_Adjusted"] = df["Start_Hour"] + pd.Timedelta(hours=1)
+    hour_adjusted = hour_adjusted.mask((start_hour.dt.hour == 23) & incomplete, next_hour)
 
     # Ensure alignment to full-hour values
-    df["Hour_Adjusted"] = df["Hour_Adjusted"].dt.floor("H")
-
-    # Drop unnecessary columns
-    df.drop(columns=["min", "max", "Start_Hour", "End_Hour"], inplace=True)
+    df["Hour_Adjusted"] = hour_adjusted.dt.floor("H")
     return df
 
 def compute_pass_rate(df):
     """Compute the board pass rate per hour."""
-    df["Board_ID"] = df.groupby(["SN", "Sequence_Group"]).ngroup()
+    df["Board_ID"] = df.groupby(["SN", "Sequence_Group"], observed=True).ngroup()
     
     board_status = df.groupby("Board_ID").agg(
         min_point=("PointNumber", "min"),
@@ -142,6 +315,253 @@ def compute_pass_rate(df):
     
     return pass_summary
 
+def summarize_hours(df, table_side):
+    """
+    Process raw records of one table into hourly pre-aggregates.
+
+    Returns:
+        tuple: (pass_summary, defect_summary)
+            pass_summary: Hour_Adjusted, Total_Boards, Passed_Boards, Pass_Rate (as compute_pass_rate).
+            defect_summary: Hour, PointNumber, LockScrewResult, Count.
+    """
+    processed = adjust_hour_per_sequence(identify_sequences(process_data(df, table_side)))
+    pass_summary = compute_pass_rate(processed)
+    defect_summary = processed.groupby(["Hour", "PointNumber", "LockScrewResult"], observed=True).size().reset_index(name="Count")
+    return pass_summary, defect_summary
+
+# Hourly summaries of the current month: {(station_file, table_side): {"closed_through", "pass", "defects"}}
+_hourly_summaries = {}
+
+# Where the closed hours are persisted, so a restart does not reprocess the whole month
+hourly_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "hourly")
+
+# Raw records re-read before the first open hour, so sequences crossing it are rebuilt whole
+_SEQUENCE_MARGIN = pd.Timedelta(hours=2)
+
+def _hourly_files(station_file, table_side):
+    """(state, pass, defects) files of the persisted hourly summary of one station table."""
+    prefix = os.path.join(hourly_dir, f"{os.path.splitext(os.path.basename(station_file))[0]}-{table_side}")
+    return f"{prefix}.json", f"{prefix}-pass.parquet", f"{prefix}-defects.parquet"
+
+def load_hourly_state(station_file, table_side):
+    """Closed hours persisted by save_hourly_state, or None if there are none (or they cannot be read)."""
+    state_file, pass_file, defects_file = _hourly_files(station_file, table_side)
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file) as f:
+            closed_through = pd.Timestamp(json.load(f)["closed_through"])
+        pass_summary = pd.read_parquet(pass_file)
+        defect_summary = pd.read_parquet(defects_file)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring the saved hourly summary of {station_file} ({table_side}): {e}")
+        return None
+    # The frames are written before the state file, so they may already hold later hours
+    return {
+        "closed_through": closed_through,
+        "pass": pass_summary[pass_summary["Hour_Adjusted"] < closed_through],
+        "defects": defect_summary[defect_summary["Hour"] < closed_through],
+    }
+
+def save_hourly_state(station_file, table_side, state):
+    """Persists the closed hours of one station table; the state file is replaced last."""
+    state_file, pass_file, defects_file = _hourly_files(station_file, table_side)
+    try:
+        os.makedirs(hourly_dir, exist_ok=True)
+        for frame, path in ((state["pass"], pass_file), (state["defects"], defects_file)):
+            frame.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+        with open(state_file + ".tmp", "w") as f:
+            json.dump({"closed_through": state["closed_through"].isoformat()}, f)
+        os.replace(state_file + ".tmp", state_file)
+    except OSError as e:
+        print(f"Could not save the hourly summary of {station_file} ({table_side}): {e}")
+
+def update_hourly_summary(station_file, df, table_side, now=None):
+    """
+    Maintain the hourly summary of one station table, recomputing only the open hours.
+
+    An hour is closed once the following hour has also ended, since a sequence crossing
+    an hour boundary can still move its boards until it completes. Closed hours are kept
+    as-is and only records from the open hours (plus a margin) are reprocessed on each call.
+    Closed hours are also saved under `hourly_dir` whenever more hours close, and picked up
+    again after a restart.
+
+    Parameters:
+        station_file (str): Station database file the records come from (summary key).
+        df (DataFrame): All raw LockScrewData records of the current month.
+        table_side (str): "Left" or "Right".
+        now (datetime, optional): Current time, defaults to now.
+
+    Returns:
+        tuple: (pass_summary, defect_summary) covering the whole month, as summarize_hours.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    closed_through = now.floor("H") - pd.Timedelta(hours=1)
+    key = (station_file, table_side)
+    state = _hourly_summaries.get(key)
+    if state is None:
+        state = load_hourly_state(station_file, table_side)
+
+    # The current-month file starts over at the beginning of each month
+    if state is not None and state["closed_through"].strftime("%Y-%m") != closed_through.strftime("%Y-%m"):
+        state = None
+
+    if state is None:
+        pass_summary, defect_summary = summarize_hours(df, table_side)
+    else:
+        open_from = state["closed_through"]
+        recent = df[pd.to_datetime(df["LockScrewTime"]) >= open_from - _SEQUENCE_MARGIN]
+        recent_pass, recent_defects = summarize_hours(recent, table_side)
+        pass_summary = pd.concat([
+            state["pass"],
+            recent_pass[recent_pass["Hour_Adjusted"] >= open_from]
+        ], ignore_index=True)
+        defect_summary = pd.concat([
+            state["defects"],
+            recent_defects[recent_defects["Hour"] >= open_from]
+        ], ignore_index=True)
+
+    new_state = {
+        "closed_through": closed_through,
+        "pass": pass_summary[pass_summary["Hour_Adjusted"] < closed_through],
+        "defects": defect_summary[defect_summary["Hour"] < closed_through],
+    }
+    if state is None or state["closed_through"] != closed_through:
+        save_hourly_state(station_file, table_side, new_state)
+    _hourly_summaries[key] = new_state
+    return pass_summary, defect_summary
+
+def _station_table_summary(station_file, table_side):
+    """Load one station file through the shared cache and summarize one of its tables."""
+    df = load_station_cached(station_file)
+    if df is None:
+        return None
+    return update_hourly_summary(station_file, df, table_side)
+
+def summarize_stations(station_files, current_month=True, max_workers=None):
+    """
+    Load and summarize several station files concurrently.
+
+    For the current month every (station, table) pair runs as its own task; the shared
+    station_cache makes sure each file is still read only once. Backup months run one task
+    per station, since their summaries are memoized by backup_month_summaries.
+
+    Parameters:
+        station_files (dict): {station name: database file path}.
+        current_month (bool): Whether the files are the live current-month databases.
+        max_workers (int, optional): Size of the worker pool.
+
+    Returns:
+        dict: {(station, table_side): (pass_summary, defect_summary)} for every station that loaded.
+            A station whose task fails is reported and left out; the others are still returned.
+    """
+    def result_of(future, station):
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Error summarizing {station}: {e}")
+            return None
+
+    summaries = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if current_month:
+            futures = {
+                (station, side): executor.submit(_station_table_summary, station_file, side)
+                for station, station_file in station_files.items()
+                for side in ("Left", "Right")
+            }
+            for (station, side), future in futures.items():
+                result = result_of(future, f"{station} ({side} table)")
+                if result is not None:
+                    summaries[(station, side)] = result
+        else:
+            futures = {
+                station: executor.submit(backup_month_summaries, station_file)
+                for station, station_file in station_files.items()
+            }
+            for station, future in futures.items():
+                result = result_of(future, station)
+                if result is not None:
+                    summaries[(station, "Left")] = result[:2]
+                    summaries[(station, "Right")] = result[2:]
+    return summaries
+
+def station_yield_overview(summaries, date):
+    """
+    Merge per-station summaries into one row per station and table for the given date.
+
+    Returns:
+        DataFrame: Station, Table, Total_Boards, Passed_Boards, Pass_Rate (float, %).
+    """
+    date = pd.to_datetime(date).date()
+    rows = []
+    for (station, table_side), (pass_summary, _) in summaries.items():
+        day = pass_summary[pd.to_datetime(pass_summary["Hour_Adjusted"]).dt.date == date]
+        total_boards = int(day["Total_Boards"].sum())
+        passed_boards = int(day["Passed_Boards"].sum())
+        rows.append({
+            "Station": station,
+            "Table": table_side,
+            "Total_Boards": total_boards,
+            "Passed_Boards": passed_boards,
+            "Pass_Rate": passed_boards / total_boards * 100 if total_boards > 0 else 0.0
+        })
+    return pd.DataFrame(rows, columns=["Station", "Table", "Total_Boards", "Passed_Boards", "Pass_Rate"])
+
+def plot_station_overview(overview_df, selected_date):
+    """Grouped bar chart comparing the daily pass rate of every station's left and right table."""
+    fig = go.Figure()
+    for table_side, color in [("Left", "#4169E1"), ("Right", "lightgreen")]:
+        table_df = overview_df[overview_df["Table"] == table_side]
+        fig.add_trace(go.Bar(
+            x=table_df["Station"],
+            y=table_df["Pass_Rate"],
+            name=f"{table_side} Table",
+            marker_color=color,
+            text=[f"{rate:.1f}%" for rate in table_df["Pass_Rate"]],
+            textposition="outside",
+            customdata=np.stack((table_df["Total_Boards"], table_df["Passed_Boards"]), axis=-1),
+            hovertemplate=(
+                "Station: %{x}<br>"
+                "Total Boards: %{customdata[0]}<br>"
+                "Passed Boards: %{customdata[1]}<br>"
+                "Pass Rate: %{y:.2f}%<extra></extra>"
+            )
+        ))
+
+    fig.update_layout(
+        title={
+            "text": f"Station Daily Pass Rate ({pd.to_datetime(selected_date).strftime('%Y-%m-%d')})",
+            "x": 0.5,
+            "xanchor": "center"
+        },
+        legend=dict(
+            orientation="h",
+            y=1,
+            x=0.5,
+            xanchor="center",
+            yanchor="bottom"
+        ),
+        xaxis=dict(title="Station"),
+        yaxis=dict(title="Pass Rate (%)", range=[0, 110], showgrid=True),
+        barmode="group",
+        margin=dict(l=40, r=40, t=70, b=50)
+    )
+
+    return fig
+
+def empty_figure(message):
+    """Blank figure showing `message`, used when a station has no data to plot."""
+    fig = go.Figure()
+    fig.add_annotation(text=message, x=0.5, y=0.5, xref="paper", yref="paper", showarrow=False, font=dict(size=16))
+    fig.update_layout(xaxis=dict(visible=False), yaxis=dict(visible=False))
+    return fig
+
+def filter_defects_by_date(defect_summary, date):
+    """Select one day of a defect summary produced by summarize_hours."""
+    return defect_summary[defect_summary["Hour"].dt.date == pd.to_datetime(date).date()]
+
 def daily_yield(df, date):
     """Calculate the total number of unique boards processed in a day."""
     total_boards = df.loc[
@@ -279,8 +699,11 @@ def plot_pass_summary(pass_summary_df, table, selected_date):
     return fig
 
 def create_stacked_bar_chart(df, table):
-    # Group by PointNumber and LockScrewResult to get counts
-    grouped_data = df.groupby(["PointNumber", "LockScrewResult"]).size().reset_index(name="Count")
+    # Group by PointNumber and LockScrewResult to get counts (summing pre-aggregated counts if present)
+    if "Count" in df.columns:
+        grouped_data = df.groupby(["PointNumber", "LockScrewResult"], observed=True)["Count"].sum().reset_index()
+    else:
+        grouped_data = df.groupby(["PointNumber", "LockScrewResult"], observed=True).size().reset_index(name="Count")
 
     # Pivot data to create columns for each LockScrewResult value
     pivot_data = grouped_data.pivot(index="PointNumber", columns="LockScrewResult", values="Count").fillna(0)
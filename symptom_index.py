@@ -0,0 +1,140 @@
+import re
+from collections import defaultdict
+import numpy as np
+
+def _row_labels(repair_df):
+    """
+    Returns a Series of normalized (stripped, lowercased) symptom labels indexed by the row
+    labels of `repair_df`, one entry per label. Accepts the ' | '-joined `symptom_labels`
+    column of create_repair_table or its normalized `symptom_label` form.
+    """
+    if "symptom_label" in repair_df.columns:
+        labels = repair_df["symptom_label"]
+    else:
+        labels = repair_df["symptom_labels"].astype(object)
+        labels = labels.where(labels.map(lambda x: isinstance(x, str))).str.split("|").explode()
+    return labels.dropna().astype(str).str.strip().str.lower()
+
+class SymptomIndex:
+    """
+    Inverted index from normalized symptom label to the serial numbers (and repair table
+    rows) that failed with it, built from a create_repair_table result.
+
+    Only failing rows (result != 1) are indexed by label, mirroring find_matching_repairs,
+    while every row is indexed by serial number so the repair history of a match can be
+    fetched without scanning the table. Row ids are positions in the repair table (for .iloc),
+    so any index, including duplicate labels, is supported.
+    """
+
+    def __init__(self):
+        self.n_rows = 0  # rows indexed so far
+        self.label_serials = defaultdict(set)  # label -> serial numbers
+        self.label_rows = defaultdict(set)  # label -> row ids
+        self.serial_labels = defaultdict(set)  # serial number -> labels
+        self.serial_rows = defaultdict(list)  # serial number -> row ids (all results)
+
+    @classmethod
+    def from_repair_table(cls, repair_df):
+        index = cls()
+        index.add(repair_df)
+        return index
+
+    def add(self, repair_df):
+        """Index rows appended to the repair table; their positions follow the rows already indexed."""
+        repair_df = repair_df.reset_index(drop=True)
+        repair_df.index += self.n_rows
+        self.n_rows += len(repair_df)
+        for row_id, serial_number in zip(repair_df.index, repair_df["serial_number"]):
+            self.serial_rows[serial_number].append(row_id)
+
+        failed = repair_df[repair_df["result"] != 1]
+        labels = _row_labels(failed)
+        serials = failed["serial_number"].loc[labels.index]
+        for row_id, serial_number, label in zip(labels.index, serials, labels):
+            self.label_serials[label].add(serial_number)
+            self.label_rows[label].add(row_id)
+            self.serial_labels[serial_number].add(label)
+        return self
+
+    def labels_for(self, serial_number):
+        """Normalized symptom labels of the failing rows of one serial number."""
+        return set(self.serial_labels.get(serial_number, ()))
+
+    def matching_serials(self, serial_number):
+        """Other serial numbers sharing at least one symptom label with `serial_number`."""
+        matches = set()
+        for label in self.serial_labels.get(serial_number, ()):
+            matches |= self.label_serials[label]
+        matches.discard(serial_number)
+        return matches
+
+    def rows_for(self, serial_numbers):
+        """Positions of every row (any result) of the given serial numbers, in table order."""
+        return sorted(row_id for sn in serial_numbers for row_id in self.serial_rows.get(sn, ()))
+
+class LabelSearchIndex:
+    """
+    Keyword index over the labels of a `label_cycle` column (compute_label_cycles output).
+
+    Each unique label is stored once with the positions of the rows it appears in, so a query
+    is matched against the unique labels only and the matching rows are merged with numpy.
+    Results per (keyword, match) are cached, which makes repeated interactive searches cheap.
+    """
+
+    def __init__(self, label_dicts):
+        rows = defaultdict(list)
+        for row, label_dict in enumerate(label_dicts):
+            if isinstance(label_dict, dict):
+                for label in label_dict:
+                    rows[label].append(row)
+        self.label_rows = {label: np.array(row_ids) for label, row_ids in rows.items()}  # label -> row positions
+        self._cache = {}
+
+    @classmethod
+    def from_frame(cls, df, col="label_cycle"):
+        return cls(df[col])
+
+    def matching_labels(self, keyword, match="substring"):
+        """
+        Labels matching one keyword.
+
+        match: "substring" (keyword in label, like search_label), "regex" (re.search) or
+            "token" (keyword equals one of the words of the label).
+        """
+        if match == "substring":
+            return [label for label in self.label_rows if keyword in label]
+        if match == "regex":
+            pattern = re.compile(keyword)
+            return [label for label in self.label_rows if pattern.search(label)]
+        if match == "token":
+            return [label for label in self.label_rows if keyword in re.split(r"\W+", label)]
+        raise ValueError(f"Unknown match type: {match}")
+
+    def rows(self, keyword, match="substring"):
+        """Sorted positions of the rows having at least one label matching `keyword`."""
+        key = (keyword, match)
+        if key not in self._cache:
+            row_ids = [self.label_rows[label] for label in self.matching_labels(keyword, match)]
+            self._cache[key] = np.unique(np.concatenate(row_ids)) if row_ids else np.array([], dtype=np.int64)
+        return self._cache[key]
+
+    def search(self, keywords, how="or", match="substring"):
+        """
+        Row positions matching one keyword or a list of keywords.
+
+        Parameters:
+            keywords (str or list): Keyword(s) to look for.
+            how (str): "or" for rows matching any keyword, "and" for rows matching all of them.
+            match (str): See matching_labels.
+
+        Returns:
+            numpy.ndarray: Sorted row positions.
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        combine = {"or": np.union1d, "and": np.intersect1d}[how]
+        result = None
+        for keyword in keywords:
+            row_ids = self.rows(keyword, match)
+            result = row_ids if result is None else combine(result, row_ids)
+        return result if result is not None else np.array([], dtype=np.int64)
@@ -0,0 +1,89 @@
+import json
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _loads(raw):
+    """Parse a JSON string with orjson when available, falling back to the json module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass  # json.loads also accepts NaN/Infinity, which orjson rejects
+    return json.loads(raw)
+
+def _symptom_items(data):
+    """Returns (kind, n_keys, ((label, msg), ...)) for an already parsed symptom_info value."""
+    if not isinstance(data, dict):
+        return "other", 0, ()
+    items = tuple(
+        (symptom.get("symptom_label"), symptom.get("symptom_msg"))
+        for symptom in data.values() if isinstance(symptom, dict)
+    )
+    return "dict", len(data), items
+
+@lru_cache(maxsize=65536)
+def parse_symptom_json(raw):
+    """
+    Parses one raw symptom_info string. Results are cached by the raw string, since the same
+    payload repeats across retests of a board and across boards with the same failure.
+    Invalid JSON is treated as an empty dictionary and JSON null as a missing value.
+    """
+    try:
+        data = _loads(raw)
+    except ValueError:
+        data = {}
+    if data is None:
+        return "null", 0, ()
+    return _symptom_items(data)
+
+def parse_symptom_value(value):
+    """Parses one symptom_info value (JSON string, dict from a jsonb column, or NaN/None)."""
+    if isinstance(value, str):
+        return parse_symptom_json(value)
+    if isinstance(value, dict):
+        return _symptom_items(value)
+    if value is None or (np.isscalar(value) and pd.isna(value)):
+        return "null", 0, ()
+    return "other", 0, ()
+
+def explode_symptom_info(symptom_info):
+    """
+    Explodes a symptom_info column into a normalized long table in one pass.
+
+    Parameters:
+        symptom_info (Series): Raw symptom_info values.
+
+    Returns:
+        tuple: (meta, long)
+            meta: one row per input row (positional) with `kind` ("null", "dict" or "other")
+                  and `n_keys` (number of keys in the parsed dictionary).
+            long: one row per symptom with row_id (input position), seq (position within the
+                  row), label and msg (raw values, None when the key is missing).
+    """
+    parsed = [parse_symptom_value(value) for value in symptom_info]
+    counts = np.fromiter((len(items) for _, _, items in parsed), dtype=np.int64, count=len(parsed))
+
+    meta = pd.DataFrame({
+        "kind": [kind for kind, _, _ in parsed],
+        "n_keys": np.fromiter((n_keys for _, n_keys, _ in parsed), dtype=np.int64, count=len(parsed)),
+    })
+    row_id = np.repeat(np.arange(len(parsed)), counts)
+    seq = np.arange(len(row_id)) - np.repeat(np.cumsum(counts) - counts, counts)
+    long = pd.DataFrame({
+        "row_id": row_id,
+        "seq": seq,
+        "label": pd.Series([label for _, _, items in parsed for label, _ in items], dtype=object),
+        "msg": pd.Series([msg for _, _, items in parsed for _, msg in items], dtype=object),
+    })
+    return meta, long
+
+def normalize_text(values, default, lower=False):
+    """Fills missing labels/messages with `default`, strips them and optionally lowercases them."""
+    values = values.map(lambda x: default if x is None else str(x)).str.strip()
+    return values.str.lower() if lower else values
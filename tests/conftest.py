@@ -0,0 +1,97 @@
+import os
+import sys
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def pg_dsn(tmp_path_factory):
+    """
+    Connection string of a scratch Postgres: DQ_TEST_DSN if set, else a throwaway server started
+    with pgserver. Tests needing Postgres are skipped when neither is available.
+    """
+    dsn = os.environ.get("DQ_TEST_DSN")
+    if dsn:
+        yield dsn
+        return
+    pgserver = pytest.importorskip("pgserver")
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pgdata")), cleanup_mode="stop")
+    yield server.get_uri()
+    server.cleanup()
+
+@pytest.fixture
+def dq_pool(pg_dsn, monkeypatch):
+    """data_query with its connection pool pointed at the scratch Postgres."""
+    from psycopg2 import pool
+    import data_query as dq
+    monkeypatch.setattr(dq, "_pool", pool.ThreadedConnectionPool(1, 4, pg_dsn, options=dq.session_options))
+    yield dq
+    dq.close_pool()
+
+# Minimal manufacturing_* schema with two work orders of different models. A, B and C share
+# model M1 and the "fan fail" symptom; B and C were repaired and passed afterwards, A has an
+# open repair; D belongs to model M2; E has no work order.
+MANUFACTURING_FIXTURE = """
+DROP TABLE IF EXISTS manufacturing_workorder, manufacturing_l10workorderlog, manufacturing_serialnumber,
+    manufacturing_l10serialnumberlog, manufacturing_testingresult, manufacturing_repairmain,
+    manufacturing_repairdetail CASCADE;
+CREATE TABLE manufacturing_workorder (
+    workorder_id text, target_qty int, finished_qty int, skuno text, build_type text,
+    production_version text, model_name text, sap_release_date timestamp);
+CREATE TABLE manufacturing_l10workorderlog (workorder_id text, action text, date timestamp);
+CREATE TABLE manufacturing_serialnumber (
+    workorder_id text, serial_number text, generated_date timestamp, complete_date timestamp,
+    pack_date timestamp, ship_date timestamp, update_date timestamp, station_id text,
+    failed int, completed int, shipped int, printed int);
+CREATE TABLE manufacturing_l10serialnumberlog (serial_number text, workorder_id text);
+CREATE TABLE manufacturing_testingresult (
+    rowid int, result int, serial_number text, station text, test_start_time timestamp,
+    test_end_time timestamp, testing_date timestamp, symptom_info text);
+CREATE TABLE manufacturing_repairmain (
+    failure_sequence int, station text, failure_description text, result int, repaired_date timestamp,
+    serial_number text, failure_code text, testing_result_id int, debug_start_time timestamp,
+    create_date timestamp);
+CREATE TABLE manufacturing_repairdetail (
+    repaired_description text, failure_sequence int, repair_code text, created_at timestamp);
+
+INSERT INTO manufacturing_workorder VALUES
+    ('WO1', 10, 3, 'S1', 'MP', 'v1', 'M1', '2024-06-01 00:00:00'),
+    ('WO2', 10, 1, 'S2', 'MP', 'v1', 'M2', '2024-06-15 00:00:00');
+INSERT INTO manufacturing_l10workorderlog VALUES
+    ('WO1', 'open', '2024-07-02 08:00:00'),
+    ('WO2', 'open', '2024-07-03 08:00:00');
+INSERT INTO manufacturing_serialnumber VALUES
+    ('WO1', 'A', '2024-07-05 09:00:00', NULL, NULL, NULL, NULL, 'L1', 1, 0, 0, 1),
+    ('WO1', 'B', '2024-07-05 09:10:00', '2024-08-02 14:00:00', NULL, NULL, '2024-08-02 14:00:00', 'L1', 1, 1, 0, 1),
+    ('WO1', 'C', '2024-07-05 09:20:00', '2024-08-03 15:00:00', NULL, NULL, '2024-08-03 15:00:00', 'L1', 1, 1, 0, 1),
+    ('WO2', 'D', '2024-07-06 09:00:00', NULL, NULL, NULL, NULL, 'L2', 1, 0, 0, 1);
+INSERT INTO manufacturing_l10serialnumberlog VALUES ('A', 'WO1'), ('B', 'WO1'), ('C', 'WO1'), ('D', 'WO2');
+INSERT INTO manufacturing_testingresult VALUES
+    (1, 0, 'A', 'FT', '2024-08-01 10:00:00', '2024-08-01 10:05:00.4', '2024-08-01 10:05:00',
+        '{"1": {"symptom_label": "Fan Fail ", "symptom_msg": "fan0 low"}}'),
+    (2, 0, 'B', 'FT', '2024-08-02 10:00:00', '2024-08-02 10:05:00', '2024-08-02 10:05:00',
+        '{"1": {"symptom_label": "fan fail", "symptom_msg": "fan1 low"}}'),
+    (3, 1, 'B', 'FT', '2024-08-02 13:30:00', '2024-08-02 13:35:00', '2024-08-02 13:35:00', '{}'),
+    (4, 0, 'C', 'FT', '2024-08-03 10:00:00', '2024-08-03 10:05:00', '2024-08-03 10:05:00',
+        '{"1": {"symptom_label": "Fan Fail", "symptom_msg": "fan0 low"}, "10": {"symptom_label": "PSU", "symptom_msg": "psu off"}}'),
+    (5, 1, 'C', 'FT', '2024-08-03 14:30:00', '2024-08-03 14:35:00', '2024-08-03 14:35:00', '{}'),
+    (6, 0, 'D', 'FT', '2024-08-04 10:00:00', '2024-08-04 10:05:00', '2024-08-04 10:05:00',
+        '{"1": {"symptom_label": "fan fail", "symptom_msg": "fan2 low"}}'),
+    (7, 1, 'A', 'ICT', '2024-07-30 10:00:00', '2024-07-30 10:05:00', '2024-07-30 10:05:00', '{}');
+INSERT INTO manufacturing_repairmain VALUES
+    (100, 'Repair', 'fan fail', 1, '2024-08-02 13:00:00', 'B', 'F1', 2, '2024-08-02 11:00:00', '2024-08-02 10:30:00'),
+    (101, 'Repair', 'psu', 1, '2024-08-03 14:00:00', 'C', 'F2', 4, '2024-08-03 11:00:00', '2024-08-03 10:30:00'),
+    (102, 'Repair', 'fan fail', 0, NULL, 'A', 'F1', 1, '2024-08-01 11:00:00', '2024-08-01 10:30:00');
+INSERT INTO manufacturing_repairdetail VALUES
+    ('swap fan', 100, 'R1', '2024-08-02 13:00:00'),
+    ('swap psu', 101, 'R2', '2024-08-03 14:00:00'),
+    ('reseat fan', 101, 'R3', '2024-08-03 14:10:00');
+"""
+
+@pytest.fixture
+def manufacturing_db(dq_pool):
+    """data_query on a scratch Postgres loaded with MANUFACTURING_FIXTURE."""
+    with dq_pool.db_cursor() as cursor:
+        cursor.execute(MANUFACTURING_FIXTURE)
+    return dq_pool
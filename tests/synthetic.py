@@ -0,0 +1,124 @@
+"""Synthetic data shared by the tests and the benchmarks."""
+import json
+import random
+import numpy as np
+import pandas as pd
+
+def lock_screw_records(n_boards, seed=0, start=pd.Timestamp("2025-04-01"), days=30):
+    """
+    LockScrewData-like records: boards screwed from point 2 (sometimes later) up to 26, some
+    sequences stopping early or repeated on the same SN, spread over `days` days (including
+    sequences crossing the hour and 23:00).
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n_boards):
+        sn = f"SN{rng.integers(0, max(1, n_boards // 2))}"
+        board_start = start + pd.Timedelta(seconds=int(rng.integers(0, days * 86400)))
+        first = int(rng.choice([2, 2, 2, 5]))
+        last = int(rng.choice([26, 26, 20, first]))
+        side = rng.choice(["Left", "Right"])
+        for k, point in enumerate(range(first, last + 1)):
+            rows.append((
+                board_start + pd.Timedelta(seconds=int(k * rng.integers(5, 40))),
+                sn, point, side, rng.choice(["OK", "OK", "Sliding", "Floating", "NG"]),
+            ))
+    df = pd.DataFrame(rows, columns=["LockScrewTime", "SN", "PointNumber", "LockScrewTable", "LockScrewResult"])
+    return df.sort_values("LockScrewTime", kind="mergesort").reset_index(drop=True)
+
+# Symptom message fragments hitting (and missing) the PATTERN_DICT patterns
+MESSAGE_FRAGMENTS = [
+    "Switch to agora console failed x", "Failed to get IP address", "Send command ls",
+    "Check HB16 version failed", "OUTLET T 1", "OUTLET T 3", "P48V VIN",
+    "usb_loc 1-1.2 Timeout opening channel", "usb_loc 1-1.7.1", "location: 0000:20:01.0",
+    "0000:81 dev", "0000:e0", "got 3 violations, exceeding threshold of 2 for sensor fan3 tach.",
+    "got 1 violations, exceeding threshold of 2 for sensor RTC 3V.", "CPU1 UNCLASSIFIED",
+    "CPU0 UNCLASSIFIED", "Update BIOS failed.\r\nException message: boom", "SN: PDF123 not found on unit",
+    "PN: AB-1 not match unit", "Component HB16 SN: X not found on unit",
+    "DMA channel not found in stress result", "random noise",
+]
+
+def random_message(rng, join_probability=0.5):
+    """One or two fragments, sometimes with trailing whitespace."""
+    message = rng.choice(MESSAGE_FRAGMENTS)
+    if rng.random() < join_probability:
+        message += " " + rng.choice(MESSAGE_FRAGMENTS)
+    return message + ("  " if rng.random() < 0.2 else "")
+
+def failure_messages(n_rows, labels, seed=0):
+    """
+    (failures, suggestions): `n_rows` (symptom_label, message) failures and 1-4 suggestion
+    messages per label, the suggestion index starting at 100.
+    """
+    rng = random.Random(seed)
+    labels = list(labels)
+    suggestions = pd.DataFrame([
+        {"symptom_label": label, "message": random_message(rng, 0.3)}
+        for label in labels for _ in range(rng.randint(1, 4))
+    ])
+    suggestions.index = suggestions.index + 100
+    failures = pd.DataFrame({
+        "symptom_label": [rng.choice(labels) for _ in range(n_rows)],
+        "message": [random_message(rng) for _ in range(n_rows)],
+    })
+    return failures, suggestions
+
+SYMPTOM_LABELS = ["Fan Fail", "PSU", "BMC", "Memory"]
+SYMPTOM_MESSAGES = ["fan0 low", "psu off", "no response", "DIMM A1 error", ""]
+
+def _variant(rng, text):
+    """Same text with different case and surrounding whitespace."""
+    text = text.upper() if rng.random() < 0.2 else text.lower() if rng.random() < 0.2 else text
+    return rng.choice(["", " ", "\t"]) + text + rng.choice(["", "  ", "\n"])
+
+def symptom_info_value(rng, as_dict=False):
+    """A symptom_info value as stored: JSON text (sometimes invalid or not an object), empty, or NULL."""
+    kind = rng.random()
+    if kind < 0.08:
+        return None
+    if kind < 0.12:
+        return rng.choice(["{}", "not json", "null", "[]", "{\"1\": "])
+    symptoms = {}
+    for key in range(int(rng.integers(0, 5))):
+        symptom = {}
+        if rng.random() < 0.95:
+            symptom["symptom_label"] = _variant(rng, rng.choice(SYMPTOM_LABELS))
+        if rng.random() < 0.95:
+            symptom["symptom_msg"] = _variant(rng, rng.choice(SYMPTOM_MESSAGES))
+        symptoms[str(key + 1)] = symptom
+    return symptoms if as_dict else json.dumps(symptoms)
+
+def symptom_results(n_rows, seed=0):
+    """Test rows with symptom_info, failure_description, result and repair details."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_rows):
+        failure = rng.random()
+        rows.append({
+            "serial_number": f"SN{rng.integers(0, max(1, n_rows // 3))}",
+            "result": int(rng.random() < 0.25),
+            "failure_description": None if failure < 0.4 else _variant(rng, rng.choice(SYMPTOM_LABELS + ["Other"])),
+            "symptom_info": symptom_info_value(rng, as_dict=rng.random() < 0.1),
+            "repair_code": None if rng.random() < 0.3 else f"R{rng.integers(1, 6)}",
+            "repaired_description": None if rng.random() < 0.3 else rng.choice(["swap fan", "reseat", "swap psu"]),
+        })
+    return pd.DataFrame(rows)
+
+def repair_table(n_rows, seed=0, normalized=False):
+    """
+    create_repair_table-like rows: serial numbers failing (result 0) and passing (result 1) with
+    ' | '-joined symptom_labels, or one row per trimmed, lowercased symptom_label when normalized.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n_rows):
+        sn = f"SN{rng.integers(0, max(1, n_rows // 4))}"
+        result = int(rng.random() < 0.3)
+        labels = [_variant(rng, label) for label in rng.choice(SYMPTOM_LABELS, size=int(rng.integers(0, 3)))]
+        row = {"serial_number": sn, "repair_code": f"R{rng.integers(1, 6)}", "result": result}
+        if normalized:
+            for label in labels or [None]:
+                rows.append({**row, "symptom_label": label.strip().lower() if label else None})
+        else:
+            rows.append({**row, "symptom_labels": " | ".join(labels) if labels else None})
+    return pd.DataFrame(rows)
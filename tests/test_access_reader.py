@@ -0,0 +1,74 @@
+"""
+Both Access backends must return identical typed frames. Neither the Access ODBC driver nor
+mdbtools is needed: each driver is replaced by a double returning the records the way the
+real one does (pyodbc rows of Python values, mdb-export CSV text).
+"""
+import datetime
+import subprocess
+import types
+import pandas as pd
+import pytest
+import access_reader as ar
+
+COLUMNS = ["ID", "LockScrewTime", "SN", "PointNumber", "LockScrewTable", "LockScrewResult"]
+RECORDS = [
+    (1, datetime.datetime(2025, 4, 1, 10, 0, 1), "0123", 2, "Left", "OK"),
+    (2, datetime.datetime(2025, 4, 1, 10, 0, 5), "0123", 3, "Left", "Sliding"),
+    (3, datetime.datetime(2025, 4, 1, 10, 59, 59), "A-77", 26, "Right", "NG"),
+    (4, datetime.datetime(2025, 4, 2, 0, 0, 0), None, 2, "Right", None),
+]
+
+class _Cursor:
+    description = [(col,) for col in COLUMNS]
+
+    def execute(self, query, params):
+        self.rows = [row for row in RECORDS if not params or row[1] >= params[0]]
+
+    def fetchall(self):
+        return self.rows
+
+class _Connection:
+    def cursor(self):
+        return _Cursor()
+
+    def close(self):
+        pass
+
+def _mdb_export(args, capture_output, check):
+    def cell(value):
+        if value is None:
+            return ""
+        if isinstance(value, datetime.datetime):
+            return f'"{value:%Y-%m-%d %H:%M:%S}"'
+        return f'"{value}"' if isinstance(value, str) else str(value)
+    lines = [",".join(COLUMNS)] + [",".join(cell(value) for value in row) for row in RECORDS]
+    return subprocess.CompletedProcess(args, 0, stdout=("\n".join(lines) + "\n").encode())
+
+@pytest.fixture
+def access_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(ar, "pyodbc", types.SimpleNamespace(
+        connect=lambda conn_str: _Connection(), drivers=lambda: [ar.ACCESS_DRIVER]
+    ))
+    monkeypatch.setattr(ar.subprocess, "run", _mdb_export)
+    path = tmp_path / "station.accdb"
+    path.write_bytes(b"")
+    return str(path)
+
+@pytest.mark.parametrize("since", [None, pd.Timestamp("2025-04-01 10:00:05")])
+def test_backends_return_identical_frames(access_file, since):
+    kwargs = {"time_col": "LockScrewTime", "since": since} if since is not None else {}
+    odbc = ar.OdbcReader().read_table(access_file, "LockScrewData", **kwargs)
+    mdbtools = ar.MdbToolsReader().read_table(access_file, "LockScrewData", **kwargs)
+    pd.testing.assert_frame_equal(odbc, mdbtools)
+    assert len(odbc) == (4 if since is None else 3)
+
+def test_backends_apply_the_lock_screw_schema(access_file):
+    df = ar.MdbToolsReader().read_table(access_file, "LockScrewData")
+    for col, dtype in ar.LOCK_SCREW_TYPES.items():
+        assert str(df[col].dtype) == dtype
+    # Serial numbers keep their leading zeros
+    assert df["SN"].tolist()[:3] == ["0123", "0123", "A-77"]
+
+def test_missing_file_returns_none(tmp_path):
+    for reader in ar.READERS.values():
+        assert reader().read_table(str(tmp_path / "missing.accdb"), "LockScrewData") is None
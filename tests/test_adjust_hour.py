@@ -0,0 +1,40 @@
+import warnings
+import pandas as pd
+import pytest
+import reference
+import screw_utils as su
+from synthetic import lock_screw_records
+
+def _sequences(n_boards, seed, days):
+    df = lock_screw_records(n_boards, seed=seed, days=days)
+    return su.identify_sequences(df[df["LockScrewTable"] == "Left"].reset_index(drop=True))
+
+# Random datasets: few days (many sequences sharing hours) up to a month, various sizes
+@pytest.mark.parametrize("seed", range(30))
+def test_adjust_hour_matches_reference(seed):
+    df = _sequences(n_boards=20 + 5 * seed, seed=seed, days=1 + seed % 7)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        expected = reference.adjust_hour_per_sequence(df.copy())
+        result = su.adjust_hour_per_sequence(df.copy())
+    pd.testing.assert_series_equal(result["Hour_Adjusted"], expected["Hour_Adjusted"], check_names=False)
+    pd.testing.assert_frame_equal(result, expected[result.columns])
+
+def test_adjust_hour_sequence_cases():
+    t = pd.Timestamp("2025-04-01")
+    rows = (
+        # Complete sequence crossing 10:00 -> stays at its start hour
+        [(t + pd.Timedelta(hours=9, minutes=50, seconds=30 * k), "A", p) for k, p in enumerate(range(2, 27))]
+        # Incomplete sequence crossing 14:00 -> moves to the next hour
+        + [(t + pd.Timedelta(hours=13, minutes=58, seconds=30 * k), "B", p) for k, p in enumerate(range(2, 10))]
+        # Incomplete sequence within 23:00 -> moves to 00:00 the next day
+        + [(t + pd.Timedelta(hours=23, minutes=10, seconds=30 * k), "C", p) for k, p in enumerate(range(2, 8))]
+    )
+    df = pd.DataFrame(rows, columns=["LockScrewTime", "SN", "PointNumber"])
+    result = su.adjust_hour_per_sequence(su.identify_sequences(df))
+    hours = result.groupby("SN")["Hour_Adjusted"].unique().map(list).to_dict()
+    assert hours == {
+        "A": [t + pd.Timedelta(hours=9)],
+        "B": [t + pd.Timedelta(hours=14)],
+        "C": [t + pd.Timedelta(hours=24)],
+    }
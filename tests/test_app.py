@@ -0,0 +1,23 @@
+import pytest
+
+dash = pytest.importorskip("dash")
+import app
+import screw_utils as su
+
+def test_update_plots_reports_a_station_that_failed_to_load(monkeypatch):
+    # summarize_stations leaves out stations whose Access file could not be loaded
+    monkeypatch.setattr(su, "summarize_stations", lambda station_files, current_month=True, max_workers=None: {})
+    left_yield, right_yield, *figures = app.update_plots("2025-04-01", "station1")
+    assert (left_yield, right_yield) == ("N/A", "N/A")
+    assert len(figures) == 4
+    assert all("No data for Station 1" in figure.layout.annotations[0].text for figure in figures)
+
+def test_update_plots_with_one_table_missing(monkeypatch):
+    from synthetic import lock_screw_records
+    records = lock_screw_records(200, seed=1, days=1)
+    summaries = {("station1", "Left"): su.summarize_hours(records.copy(), "Left")}
+    monkeypatch.setattr(su, "summarize_stations", lambda station_files, current_month=True, max_workers=None: summaries)
+    left_yield, right_yield, left_pass, right_pass, left_defect, right_defect = app.update_plots("2025-04-01", "station1")
+    assert left_yield > 0 and right_yield == "N/A"
+    assert len(left_pass.data) > 0 and len(left_defect.data) > 0
+    assert "No data for Station 1 (Right table)" == right_pass.layout.annotations[0].text
@@ -0,0 +1,44 @@
+import os
+import pandas as pd
+import pytest
+import schema as sc
+import screw_utils as su
+from synthetic import lock_screw_records
+
+class FakeReader:
+    def __init__(self):
+        self.reads = 0
+
+    def read_table(self, file_path, table, time_col=None, since=None):
+        self.reads += 1
+        return sc.apply_schema(lock_screw_records(20, seed=2), sc.LOCK_SCREW_SCHEMA)
+
+@pytest.fixture
+def reader(monkeypatch):
+    reader = FakeReader()
+    monkeypatch.setattr(su, "reader", reader)
+    return reader
+
+def test_snapshot_is_written_once_and_reused(tmp_path, reader):
+    backup_file = str(tmp_path / "station1-202504.accdb")
+    first = su.load_backup_snapshot(backup_file)
+    assert sorted(os.listdir(tmp_path)) == ["station1-202504.parquet"]
+    pd.testing.assert_frame_equal(su.load_backup_snapshot(backup_file), first)
+    assert reader.reads == 1
+
+def test_interrupted_write_leaves_no_snapshot(tmp_path, reader, monkeypatch):
+    backup_file = str(tmp_path / "station1-202504.accdb")
+    def interrupted(self, path, **kwargs):
+        with open(path, "wb") as f:
+            f.write(b"PAR1")
+        raise OSError("disk full")
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", interrupted)
+    df = su.load_backup_snapshot(backup_file)
+    assert len(df) > 0
+    assert os.listdir(tmp_path) == []
+
+def test_read_only_share_returns_the_records(tmp_path, reader, capsys):
+    backup_file = str(tmp_path / "missing-dir" / "station1-202504.accdb")
+    df = su.load_backup_snapshot(backup_file)
+    assert len(df) > 0
+    assert "Could not save the snapshot" in capsys.readouterr().out
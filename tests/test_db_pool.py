@@ -0,0 +1,47 @@
+import psycopg2
+import pytest
+
+def test_execute_prepared_returns_all_executions(dq_pool):
+    df = dq_pool.db_execute_prepared("t_square", "SELECT $1::int * $1::int AS square", [(2,), (3,)])
+    assert df["square"].tolist() == [4, 9]
+
+def test_execute_prepared_raises_the_original_error(dq_pool):
+    with pytest.raises(psycopg2.errors.DivisionByZero):
+        dq_pool.db_execute_prepared("t_divide", "SELECT 1 / $1::int AS ratio", [(1,), (0,)])
+    # The statement was deallocated, so the same name can be prepared again on the pooled connection
+    df = dq_pool.db_execute_prepared("t_divide", "SELECT 1 / $1::int AS ratio", [(1,)])
+    assert df["ratio"].tolist() == [1]
+
+def test_db_query_prepares_once_per_connection(dq_pool):
+    from query_templates import QueryTemplate
+    template = QueryTemplate("t_echo", "SELECT %(value)s::text AS value", value="text")
+    for value in ["a", "'b'"]:
+        assert dq_pool.db_query(template, {"value": value})["value"].tolist() == [value.strip("'")]
+    assert sum("t_echo" in names for names in dq_pool._prepared.values()) == 1
+
+def test_checkouts_wait_for_a_free_connection(dq_pool):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def query(i):
+        with dq_pool.db_cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(0.05), %s", (i,))
+            return cursor.fetchone()[1]
+
+    # Twice as many threads as the pool (maxconn=4) holds
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert sorted(executor.map(query, range(16))) == list(range(16))
+
+def test_checkout_gives_up_after_pool_timeout(dq_pool, monkeypatch):
+    from contextlib import ExitStack
+    from psycopg2 import pool
+    monkeypatch.setattr(dq_pool, "pool_timeout", 0.1)
+    with ExitStack() as stack:
+        for _ in range(dq_pool.get_pool().maxconn):
+            stack.enter_context(dq_pool.db_cursor())
+        with pytest.raises(pool.PoolError):
+            with dq_pool.db_cursor():
+                pass
+    # Every slot was given back
+    with dq_pool.db_cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
@@ -0,0 +1,104 @@
+import os
+import pandas as pd
+import pytest
+import data_query as dq
+import extract_cache as ec
+
+def _rows(dates, tag):
+    dates = pd.to_datetime(dates)
+    return pd.DataFrame({"rowid": range(len(dates)), "serial_number": tag, "testing_date": dates})
+
+def _stream(chunks, fail_after=None):
+    def stream(query, params=None, itersize=50000):
+        for i, chunk in enumerate(chunks):
+            if fail_after is not None and i == fail_after:
+                raise ConnectionError("connection lost")
+            yield chunk
+    return stream
+
+@pytest.fixture
+def cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(dq, "db_stream", _stream([_rows(["2024-07-01", "2024-07-02", "2024-07-03"], "old")]))
+    ec.refresh_extract("mtr_data", root=str(tmp_path), full=True)
+    return str(tmp_path)
+
+def test_refresh_replaces_partitions_from_watermark(cached, monkeypatch):
+    monkeypatch.setattr(dq, "db_stream", _stream([_rows(["2024-07-03", "2024-07-04"], "new")]))
+    assert ec.refresh_extract("mtr_data", root=cached) == 2
+    df = ec.load_extract("mtr_data", root=cached)
+    assert ec.list_partitions("mtr_data", cached) == ["2024-07-01", "2024-07-02", "2024-07-03", "2024-07-04"]
+    assert df.groupby("testing_date")["serial_number"].first().astype(str).tolist() == ["old", "old", "new", "new"]
+
+@pytest.mark.parametrize("full", [False, True])
+def test_failed_refresh_leaves_cache_unchanged(cached, monkeypatch, full):
+    before = ec.load_extract("mtr_data", root=cached)
+    chunks = [_rows(["2024-07-03"], "new"), _rows(["2024-07-05"], "new")]
+    monkeypatch.setattr(dq, "db_stream", _stream(chunks, fail_after=1))
+    with pytest.raises(ConnectionError):
+        ec.refresh_extract("mtr_data", root=cached, full=full)
+    pd.testing.assert_frame_equal(ec.load_extract("mtr_data", root=cached), before)
+    assert ec.list_partitions("mtr_data", cached) == ["2024-07-01", "2024-07-02", "2024-07-03"]
+
+def test_rows_without_a_date_are_kept(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    chunk = _rows(["2024-07-01", None], "old")
+    monkeypatch.setattr(dq, "db_stream", _stream([chunk]))
+    assert ec.refresh_extract("mtr_data", root=root, full=True) == 2
+    assert len(ec.load_extract("mtr_data", root=root)) == 2
+    assert ec.list_partitions("mtr_data", root) == ["2024-07-01"]
+    # A date range cannot match them
+    assert len(ec.load_extract("mtr_data", start="2024-07-01", root=root)) == 1
+
+    # An incremental pull without undated rows leaves them in place, a full one drops them
+    monkeypatch.setattr(dq, "db_stream", _stream([_rows(["2024-07-02"], "new")]))
+    ec.refresh_extract("mtr_data", root=root)
+    assert ec.load_extract("mtr_data", root=root)["testing_date"].isna().sum() == 1
+    ec.refresh_extract("mtr_data", root=root, full=True)
+    assert ec.load_extract("mtr_data", root=root)["testing_date"].notna().all()
+
+def test_upsert_keeps_rows_without_a_date(tmp_path):
+    import extract_sync as es
+    root = str(tmp_path)
+    assert es.upsert("mtr_data", _rows(["2024-07-01", None], "old"), root) == 2
+    df = _rows([None], "new")
+    df["rowid"] = 1
+    assert es.upsert("mtr_data", df, root) == 1
+    cached = ec.load_extract("mtr_data", root=root)
+    assert cached.sort_values("rowid")["serial_number"].astype(str).tolist() == ["old", "new"]
+
+def test_refresh_concurrent_isolates_failures(tmp_path, monkeypatch):
+    import threading
+    import time
+    from types import SimpleNamespace
+    root = str(tmp_path)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def stream(query, params=None, itersize=50000):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            time.sleep(0.05)
+            if query == "broken":
+                raise ConnectionError("connection lost")
+            yield _rows(["2024-07-01", "2024-07-02"] * int(query), query)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    for name, query in [("one", "1"), ("broken", "broken"), ("two", "2"), ("three", "3")]:
+        monkeypatch.setitem(ec.EXTRACTS, name, {"query": lambda since, query=query: query, "date_col": "testing_date", "freq": "D"})
+    monkeypatch.setattr(dq, "db_stream", stream)
+    monkeypatch.setattr(dq, "_pool", SimpleNamespace(maxconn=2))
+
+    results = ec.refresh_concurrent(["one", "broken", "two", "three"], root=root, max_workers=8, progress=None)
+    assert results["extract"].tolist() == ["one", "broken", "two", "three"]
+    assert results["rows"].tolist()[:1] + results["rows"].tolist()[2:] == [2, 4, 6]
+    assert pd.isna(results.loc[1, "rows"]) and pd.isna(results.loc[1, "seconds"])
+    assert results.loc[1, "error"] == "connection lost"
+    assert results["error"].drop(1).isna().all()
+    assert (results["seconds"].drop(1) > 0).all()
+    # Never more workers than pooled connections
+    assert peak[0] == 2
+    assert len(ec.load_extract("three", root=root)) == 6
+    assert not os.path.exists(os.path.join(root, "broken"))
@@ -0,0 +1,121 @@
+import pandas as pd
+import pytest
+import extract_cache as ec
+import extract_sync as es
+
+def _cached_rowids(root):
+    return sorted(ec.load_extract("mtr_data", columns=["rowid"], root=root)["rowid"])
+
+def test_full_pull_ignores_a_stale_mark(manufacturing_db, tmp_path):
+    root = str(tmp_path)
+    # Left behind by an earlier cache whose partitions were since removed
+    es.save_mark("mtr_data", 999, root)
+    assert es.sync_extract("mtr_data", root) == {"rows": 7, "mark": 7}
+    assert es.get_mark("mtr_data", root) == 7
+
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO manufacturing_testingresult
+            VALUES (8, 1, 'D', 'FT', '2024-08-05 10:00:00', '2024-08-05 10:05:00', '2024-08-05 10:05:00', '{}')
+        ''')
+    es.sync_extract("mtr_data", root)
+    assert _cached_rowids(root) == list(range(1, 9))
+
+def test_rows_committed_below_the_mark_are_picked_up(manufacturing_db, tmp_path):
+    root = str(tmp_path)
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO manufacturing_testingresult
+            VALUES (10, 0, 'D', 'FT', '2024-08-05 10:00:00', '2024-08-05 10:05:00', '2024-08-05 10:05:00',
+                    '{"1": {"symptom_label": "PSU", "symptom_msg": "psu off"}}')
+        ''')
+    es.sync_extract("mtr_data", root)
+    es.sync_extract("sym_data", root)
+    assert es.get_mark("mtr_data", root) == 10
+
+    # rowid 9 was drawn before 10 but its transaction committed after the last sync
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute('''
+            INSERT INTO manufacturing_testingresult
+            VALUES (9, 0, 'D', 'FT', '2024-08-05 09:00:00', '2024-08-05 09:05:00', '2024-08-05 09:05:00',
+                    '{"1": {"symptom_label": "fan fail", "symptom_msg": "fan2 low"}}')
+        ''')
+    es.sync_extract("mtr_data", root)
+    es.sync_extract("sym_data", root)
+    assert _cached_rowids(root) == [1, 2, 3, 4, 5, 6, 7, 9, 10]
+    sym = ec.load_extract("sym_data", root=root)
+    assert sorted(sym.loc[sym["rowid"] >= 9, "symptom_label"]) == ["fan fail", "psu"]
+    # Re-read rows replace their cached copy instead of being duplicated
+    assert not sym.duplicated(subset=es.SYNC["sym_data"]["key"]).any()
+    assert es.get_mark("mtr_data", root) == 10
+
+def _state(name, root):
+    import json
+    with open(es._state_file(name, root)) as f:
+        return json.load(f)
+
+def _cached_actions(root):
+    wo = ec.load_extract("wo_data", root=root)
+    return sorted(zip(wo["workorder_id"].astype(str), wo["action"].astype(str)))
+
+def test_timestamp_marks_on_timestamptz_columns(manufacturing_db, tmp_path, monkeypatch):
+    import schema as sc
+    root = str(tmp_path)
+    monkeypatch.setattr(sc, "TIMEZONE", "Asia/Taipei")
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute("ALTER TABLE manufacturing_l10workorderlog ALTER date TYPE timestamptz USING date AT TIME ZONE 'Asia/Taipei'")
+    es.sync_extract("wo_data", root)
+    assert es.get_mark("wo_data", root) == pd.Timestamp("2024-07-03 08:00:00")
+    assert _state("wo_data", root)["mark"] == "2024-07-03T00:00:00+00:00"
+
+    # Two hours after the mark in Taipei, six hours before it if the mark were read as UTC
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute("INSERT INTO manufacturing_l10workorderlog VALUES ('WO1', 'close', '2024-07-03 10:00:00+08')")
+    assert es.sync_extract("wo_data", root)["mark"] == pd.Timestamp("2024-07-03 10:00:00")
+    assert ("WO1", "close") in _cached_actions(root)
+    assert _state("wo_data", root)["mark"] == "2024-07-03T02:00:00+00:00"
+
+def test_timestamp_marks_on_naive_columns(manufacturing_db, tmp_path, monkeypatch):
+    import schema as sc
+    root = str(tmp_path)
+    monkeypatch.setattr(sc, "TIMEZONE", "America/New_York")
+    es.sync_extract("wo_data", root)
+    # Saved in UTC, read back as wall-clock time in TIMEZONE
+    assert _state("wo_data", root)["mark"] == "2024-07-03T12:00:00+00:00"
+    assert es.get_mark("wo_data", root) == pd.Timestamp("2024-07-03 08:00:00")
+
+    with manufacturing_db.db_cursor() as cursor:
+        cursor.execute("INSERT INTO manufacturing_l10workorderlog VALUES ('WO2', 'close', '2024-07-03 09:00:00')")
+    es.sync_extract("wo_data", root)
+    assert ("WO2", "close") in _cached_actions(root)
+
+    # A mark saved before marks were stored in UTC is wall-clock time in TIMEZONE
+    with open(es._state_file("wo_data", root), "w") as f:
+        f.write('{"type": "timestamp", "mark": "2024-07-03T09:00:00"}')
+    assert es.get_mark("wo_data", root) == pd.Timestamp("2024-07-03 09:00:00")
+
+def _tests(rowids, tag):
+    return pd.DataFrame({"rowid": rowids, "serial_number": tag, "testing_date": pd.Timestamp("2024-07-01")})
+
+def test_interrupted_upsert_loses_no_rows(tmp_path, monkeypatch):
+    import os
+    root = str(tmp_path)
+    es.upsert("mtr_data", _tests([1, 2], "old"), root)
+
+    def interrupted(path):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(os, "remove", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        es.upsert("mtr_data", _tests([2, 3], "new"), root)
+    monkeypatch.undo()
+
+    # The replaced file is still there next to the merged one: duplicates, but every row
+    cached = ec.load_extract("mtr_data", root=root)
+    assert sorted(cached["rowid"].unique()) == [1, 2, 3]
+
+    # The next upsert keeps the merged version of the duplicated rows
+    es.upsert("mtr_data", _tests([4], "newer"), root)
+    cached = ec.load_extract("mtr_data", root=root).sort_values("rowid")
+    assert cached["rowid"].tolist() == [1, 2, 3, 4]
+    assert cached["serial_number"].astype(str).tolist() == ["old", "new", "new", "newer"]
+    assert os.listdir(os.path.join(root, "mtr_data", "2024-07-01")) == ["part-00002.parquet"]
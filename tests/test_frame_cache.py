@@ -0,0 +1,121 @@
+import os
+import pandas as pd
+import pytest
+import schema as sc
+import screw_utils as su
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(su.time, "time", clock.time)
+    return clock
+
+def _file(tmp_path, name):
+    path = tmp_path / name
+    path.write_text("")
+    return str(path)
+
+def _frame(n_rows):
+    return pd.DataFrame({"value": range(n_rows)})
+
+def test_hits_until_the_ttl_expires(tmp_path, clock):
+    cache = su.FrameCache(ttl=60)
+    path = _file(tmp_path, "a.accdb")
+    loads = []
+    loader = lambda file_path: loads.append(file_path) or _frame(3)
+    cache.get_or_load(path, loader)
+    clock.now += 59
+    result = cache.get_or_load(path, loader)
+    assert len(loads) == 1 and len(result) == 3
+    clock.now += 1
+    cache.get_or_load(path, loader)
+    assert len(loads) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 1, "bytes": cache.stats()["bytes"]}
+
+def test_mtime_change_invalidates(tmp_path, clock):
+    cache = su.FrameCache(ttl=60)
+    path = _file(tmp_path, "a.accdb")
+    loads = []
+    loader = lambda file_path: loads.append(file_path) or _frame(3)
+    cache.get_or_load(path, loader)
+    os.utime(path, (1, 1))
+    cache.get_or_load(path, loader)
+    assert len(loads) == 2
+    assert cache.stats()["misses"] == 2
+
+def test_returns_copies(tmp_path, clock):
+    cache = su.FrameCache()
+    path = _file(tmp_path, "a.accdb")
+    cache.get_or_load(path, lambda file_path: _frame(3))["value"] = -1
+    assert cache.get_or_load(path, lambda file_path: _frame(3))["value"].tolist() == [0, 1, 2]
+
+def test_lru_eviction_by_entries(tmp_path, clock):
+    cache = su.FrameCache(max_entries=2)
+    a, b, c = (_file(tmp_path, name) for name in ("a", "b", "c"))
+    for path in (a, b, a, c):
+        cache.get_or_load(path, lambda file_path: _frame(3))
+    assert list(cache._entries) == [a, c]
+
+def test_eviction_by_bytes_keeps_the_newest_entry(tmp_path, clock):
+    nbytes = int(_frame(1000).memory_usage(deep=True).sum())
+    cache = su.FrameCache(max_bytes=int(nbytes * 1.5))
+    a, b = _file(tmp_path, "a"), _file(tmp_path, "b")
+    cache.get_or_load(a, lambda file_path: _frame(1000))
+    cache.get_or_load(b, lambda file_path: _frame(1000))
+    assert list(cache._entries) == [b]
+    assert cache.stats()["bytes"] == nbytes
+    # A single entry larger than max_bytes is still cached
+    cache.max_bytes = 1
+    cache.get_or_load(b, lambda file_path: _frame(1000))
+    assert cache.stats()["hits"] == 1
+
+def test_failed_load_is_not_cached(tmp_path, clock):
+    cache = su.FrameCache()
+    path = _file(tmp_path, "a")
+    assert cache.get_or_load(path, lambda file_path: None) is None
+    assert cache.stats()["entries"] == 0
+
+class FakeReader:
+    """Current-month station file whose records grow between reads."""
+
+    def __init__(self, records):
+        self.records = records
+        self.reads = []
+
+    def read_table(self, file_path, table, time_col=None, since=None):
+        self.reads.append(since)
+        df = self.records if since is None else self.records[self.records[time_col] >= since]
+        return sc.apply_schema(df.copy(), sc.LOCK_SCREW_SCHEMA)
+
+def test_station_records_are_kept_once(tmp_path, clock, monkeypatch):
+    from synthetic import lock_screw_records
+    now = pd.Timestamp.now().floor("D")
+    records = lock_screw_records(40, seed=3, start=now, days=1)
+    records["LockScrewTime"] = records["LockScrewTime"].clip(upper=now + pd.Timedelta(hours=23))
+    records = records.sort_values("LockScrewTime", kind="mergesort").reset_index(drop=True)
+    records["LockScrewID"] = range(len(records))
+    cut = records["LockScrewTime"].iloc[len(records) // 2]
+    reader = FakeReader(records[records["LockScrewTime"] <= cut])
+    monkeypatch.setattr(su, "reader", reader)
+    monkeypatch.setattr(su, "station_cache", su.FrameCache(ttl=60))
+    path = _file(tmp_path, "station1.accdb")
+
+    first = su.load_station_cached(path)
+    reader.records = records
+    clock.now += 60
+    second = su.load_station_cached(path)
+    # The expired entry is the base of the incremental read: only rows from the last timestamp are read
+    assert reader.reads == [None, cut]
+    assert second["LockScrewID"].tolist() == records["LockScrewID"].tolist()
+    assert len(first) < len(second)
+
+    su.reset_station_cache(path)
+    su.load_station_cached(path)
+    assert reader.reads[-1] is None
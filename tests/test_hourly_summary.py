@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+import screw_utils as su
+from synthetic import lock_screw_records
+
+START = pd.Timestamp("2025-04-01")
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+@pytest.fixture(autouse=True)
+def hourly_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(su, "hourly_dir", str(tmp_path))
+    monkeypatch.setattr(su, "_hourly_summaries", {})
+    return tmp_path
+
+def _full(df, side):
+    return su.summarize_hours(df.copy(), side)
+
+def _assert_same(result, expected):
+    for got, want in zip(result, expected):
+        got = got.sort_values(list(got.columns[:3])).reset_index(drop=True)
+        want = want.sort_values(list(want.columns[:3])).reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, want, check_dtype=False, check_categorical=False)
+
+@pytest.mark.parametrize("seed", range(2))
+@pytest.mark.parametrize("restart", [False, True])
+def test_incremental_matches_full_summary(seed, restart):
+    records = lock_screw_records(150, seed=seed, start=START, days=3)
+    for hours in range(1, 3 * 24 + 2, 7):
+        now = START + pd.Timedelta(hours=hours, minutes=17)
+        df = records[records["LockScrewTime"] < now]
+        if restart:
+            # A new process only has the persisted closed hours
+            su._hourly_summaries.clear()
+        for side in ("Left", "Right"):
+            _assert_same(su.update_hourly_summary("station1.accdb", df.copy(), side, now=now), _full(df, side))
+
+def test_closed_hours_are_reused_after_a_restart():
+    records = lock_screw_records(100, seed=7, start=START, days=2)
+    now = START + pd.Timedelta(days=1, hours=5)
+    su.update_hourly_summary("station1.accdb", records[records["LockScrewTime"] < now].copy(), "Left", now=now)
+    su._hourly_summaries.clear()
+
+    state = su.load_hourly_state("station1.accdb", "Left")
+    assert state["closed_through"] == now.floor("H") - pd.Timedelta(hours=1)
+    # Records of closed hours are not read again: dropping them leaves the closed hours as they were
+    later = now + pd.Timedelta(hours=1)
+    recent = records[(records["LockScrewTime"] >= now - pd.Timedelta(hours=4)) & (records["LockScrewTime"] < later)]
+    pass_summary, _ = su.update_hourly_summary("station1.accdb", recent.copy(), "Left", now=later)
+    closed = pass_summary[pass_summary["Hour_Adjusted"] < state["closed_through"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(closed, state["pass"].reset_index(drop=True))
+
+def test_unwritable_store_keeps_working(monkeypatch, capsys):
+    monkeypatch.setattr(su, "hourly_dir", "/proc/no-such-dir")
+    records = lock_screw_records(50, seed=1, start=START, days=1)
+    now = START + pd.Timedelta(hours=20)
+    df = records[records["LockScrewTime"] < now]
+    _assert_same(su.update_hourly_summary("station1.accdb", df.copy(), "Left", now=now), _full(df, "Left"))
+    assert "Could not save the hourly summary" in capsys.readouterr().out
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+import data_query as dq
+from reference import allpass_percentage_notebook, station_failure_percentage_notebook
+
+# On top of MANUFACTURING_FIXTURE (where only B and C are completed): F has a NULL result at
+# FT, G passes everything, H belongs to a work order without build_type, J fails at a NULL
+# station, K is not completed and I's work order was released before 2024.
+KPI_ROWS = """
+INSERT INTO manufacturing_workorder VALUES
+    ('WO3', 5, 1, 'S3', NULL, 'v1', 'M3', '2024-09-01 00:00:00'),
+    ('WO4', 5, 1, 'S4', 'MP', 'v1', 'M4', '2023-06-01 00:00:00');
+INSERT INTO manufacturing_serialnumber (workorder_id, serial_number, completed) VALUES
+    ('WO2', 'F', 1), ('WO1', 'G', 1), ('WO3', 'H', 1), ('WO4', 'I', 1), ('WO1', 'J', 1), ('WO1', 'K', 0);
+INSERT INTO manufacturing_testingresult (rowid, result, serial_number, station) VALUES
+    (20, NULL, 'F', 'FT'), (21, 1, 'F', 'ICT'),
+    (22, 1, 'G', 'FT'), (23, 1, 'G', 'ICT'),
+    (24, 0, 'H', 'FT'),
+    (25, 0, 'I', 'FT'),
+    (26, 0, 'J', NULL), (27, 1, 'J', 'FT'),
+    (28, 0, 'K', 'FT');
+"""
+
+ALLPASS_KEYS = ["model_name", "build_type", "skuno"]
+STATION_KEYS = ALLPASS_KEYS + ["station"]
+
+@pytest.fixture
+def kpi_db(manufacturing_db):
+    with dq.db_cursor() as cursor:
+        cursor.execute(KPI_ROWS)
+        cursor.execute("DROP MATERIALIZED VIEW IF EXISTS kpi_allpass_percentage, kpi_station_failure_percentage")
+    return manufacturing_db
+
+def _sorted(df, keys):
+    return df.sort_values(keys).reset_index(drop=True)
+
+def _assert_same(actual, expected, keys):
+    pd.testing.assert_frame_equal(_sorted(actual, keys), _sorted(expected[actual.columns], keys), check_dtype=False)
+
+def test_allpass_percentage_matches_the_notebook(kpi_db):
+    expected = allpass_percentage_notebook(dq.db_connect(dq.test_query))
+    actual = dq.allpass_percentage()
+    _assert_same(actual, expected, ALLPASS_KEYS)
+    # M1: B, C and J fail once, G passes; M2: F has a NULL result; M3 has no build_type
+    assert actual.set_index("model_name")["passed_sn"].to_dict() == {"M1": 1, "M2": 0}
+
+def test_station_failure_percentage_matches_the_notebook(kpi_db):
+    df = dq.db_connect(dq.test_query)
+    _assert_same(dq.station_failure_percentage(), station_failure_percentage_notebook(df, ()), STATION_KEYS)
+    actual = dq.station_failure_percentage(exclude_models=["M2"])
+    _assert_same(actual, station_failure_percentage_notebook(df, ("M2",)), STATION_KEYS)
+    assert actual["model_name"].unique().tolist() == ["M1"]
+
+def test_station_failure_percentage_is_null_without_results(kpi_db):
+    failure_df = dq.station_failure_percentage().set_index(STATION_KEYS)
+    # F's only FT result is NULL: nothing to divide by
+    assert failure_df.loc[("M2", "MP", "S2", "FT"), "total_tests"] == 0
+    assert pd.isna(failure_df.loc[("M2", "MP", "S2", "FT"), "failure_percentage"])
+
+def test_materialized_views_follow_refresh(kpi_db):
+    dq.create_kpi_views()
+    dq.create_kpi_views()  # idempotent
+    _assert_same(dq.allpass_percentage(materialized=True), dq.allpass_percentage(), ALLPASS_KEYS)
+    _assert_same(dq.station_failure_percentage(materialized=True), dq.station_failure_percentage(), STATION_KEYS)
+
+    with dq.db_cursor() as cursor:
+        cursor.execute("UPDATE manufacturing_testingresult SET result = 1 WHERE serial_number = 'F'")
+    stale = dq.allpass_percentage(materialized=True)
+    assert stale.set_index("model_name").loc["M2", "passed_sn"] == 0
+
+    dq.refresh_kpi_views(concurrently=True)
+    _assert_same(dq.allpass_percentage(materialized=True), dq.allpass_percentage(), ALLPASS_KEYS)
+    _assert_same(dq.station_failure_percentage(materialized=True), dq.station_failure_percentage(), STATION_KEYS)
+    assert dq.allpass_percentage(materialized=True).set_index("model_name").loc["M2", "passed_sn"] == 1
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+import data_query as dq
+from label_cycles import LabelCycleTracker
+from synthetic import symptom_results
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+def _failures(n_rows, seed):
+    """process_symptom_info rows with a testing_date at second resolution (many shared seconds)."""
+    rng = np.random.default_rng(seed)
+    df = dq.process_symptom_info(symptom_results(n_rows, seed=seed))
+    df["testing_date"] = pd.Timestamp("2025-04-01") + pd.to_timedelta(rng.integers(0, 3 * 3600, n_rows) // 20 * 20, unit="s")
+    df["rowid"] = range(n_rows)
+    return df.sort_values("testing_date", kind="mergesort").reset_index(drop=True)
+
+def _cycles_by_row(df):
+    return {
+        rowid: (label_cycle, label_message_cycle)
+        for rowid, label_cycle, label_message_cycle in zip(df["rowid"], df["label_cycle"], df["label_message_cycle"])
+    }
+
+@pytest.mark.parametrize("seed", range(10))
+def test_saved_and_loaded_runs_match_a_full_recompute(seed, tmp_path):
+    df = _failures(300, seed)
+    cuts = sorted(np.random.default_rng(seed).choice(df["testing_date"].unique(), size=4, replace=False))
+    # Some rows of each window's last second are committed late and only show up in the next window
+    late = df.index.isin(df.groupby("testing_date").tail(1).index) & df["testing_date"].isin(cuts)
+    arrival = []
+    start = df["testing_date"].min()
+    for cut in cuts + [df["testing_date"].max()]:
+        window = df[(df["testing_date"] >= start) & (df["testing_date"] <= cut)]
+        arrival.append(window[~late[window.index] | (window["testing_date"] != cut)])
+        # Overlapping windows: the next pull starts an hour before the current cut
+        start = cut - pd.Timedelta(hours=1)
+
+    seen = []
+    for window in arrival:
+        tracker = LabelCycleTracker.load(str(tmp_path))
+        seen.append(tracker.ingest(window.copy()))
+        tracker.save(str(tmp_path))
+    incremental = pd.concat(seen, ignore_index=True)
+
+    ordered = pd.concat(arrival).drop_duplicates("rowid")
+    full = LabelCycleTracker().ingest(ordered.copy())
+    assert sorted(incremental["rowid"]) == list(range(len(df)))
+    assert _cycles_by_row(incremental) == _cycles_by_row(full)
+
+def test_rows_without_a_time_are_ingested_once(tmp_path):
+    df = _failures(50, seed=1)
+    df.loc[df.index[:5], "testing_date"] = pd.NaT
+    tracker = LabelCycleTracker()
+    assert len(tracker.ingest(df.iloc[5:].copy())) == 45
+    # Undated rows showing up once a watermark exists are still counted, and only once
+    assert sorted(tracker.ingest(df.copy())["rowid"]) == sorted(df["rowid"].iloc[:5])
+    tracker.save(str(tmp_path))
+    assert LabelCycleTracker.load(str(tmp_path)).ingest(df.copy()).empty
+
+def test_missing_messages_are_counted():
+    df = pd.DataFrame({
+        "serial_number": ["A", "A", "B"],
+        "testing_date": pd.to_datetime(["2025-04-01 10:00", "2025-04-01 11:00", "2025-04-01 10:00"]),
+        "symptom_dict": [{"fan": [None, "low"]}, {"fan": [None]}, {None: ["x"]}],
+    })
+    result = LabelCycleTracker().ingest(df)
+    assert result["label_cycle"].tolist() == [{"fan": 1}, {"fan": 2}, {None: 1}]
+    assert result["label_message_cycle"].tolist() == [{("fan", None): 1, ("fan", "low"): 1}, {("fan", None): 2}, {(None, "x"): 1}]
@@ -0,0 +1,86 @@
+import json
+import pandas as pd
+import pytest
+import data_query as dq
+import extract_cache as ec
+
+pytest.importorskip("duckdb")
+
+@pytest.fixture
+def both_engines(manufacturing_db, tmp_path, monkeypatch):
+    """Runs a data_query call on the fixture database and on a cache extracted from it."""
+    import local_engine
+    monkeypatch.setattr(ec, "cache_dir", str(tmp_path))
+    ec.refresh_all(full=True)
+
+    def run(func, *args):
+        monkeypatch.setattr(dq, "engine", "remote")
+        remote = func(*args)
+        monkeypatch.setattr(dq, "engine", "local")
+        local = func(*args)
+        return remote, local
+
+    yield run
+    local_engine.close()
+
+def _sorted(df, columns=None):
+    columns = columns or list(df.columns)
+    df = df[columns].astype(object).where(df[columns].notna(), None)
+    return df.sort_values(columns, key=lambda col: col.astype(str)).reset_index(drop=True)
+
+def _symptoms(df):
+    """(serial_number, label, msg) of every symptom, trimmed and lowercased like the local extracts."""
+    return sorted(
+        (sn, symptom["symptom_label"].strip().lower(), symptom["symptom_msg"].strip().lower())
+        for sn, info in zip(df["serial_number"], df["symptom_info"]) if info
+        for symptom in json.loads(info).values()
+    )
+
+def test_repair_table_includes_passing_tests(both_engines):
+    remote, local = both_engines(dq.create_repair_table, "A", "FT")
+    assert (remote["result"] == 1).any()
+    pd.testing.assert_frame_equal(_sorted(local), _sorted(remote), check_dtype=False)
+
+def test_normalized_repair_table(both_engines):
+    remote, local = both_engines(lambda sn, st: dq.create_repair_table(sn, st, normalized_symptoms=True), "A", "FT")
+    pd.testing.assert_frame_equal(_sorted(local), _sorted(remote), check_dtype=False)
+
+def test_find_matching_repairs(both_engines):
+    remote, local = both_engines(dq.create_repair_table, "A", "FT")
+    remote_set, remote_match = dq.find_matching_repairs(remote, "A")
+    local_set, local_match = dq.find_matching_repairs(local, "A")
+    assert local_set == remote_set == {"fan fail"}
+    assert sorted(local_match["serial_number"].unique()) == ["B", "C"]
+    pd.testing.assert_frame_equal(_sorted(local_match), _sorted(remote_match), check_dtype=False)
+
+def test_intel_table_keeps_passing_tests(both_engines):
+    remote, local = both_engines(dq.create_intel_table, ["A", "B", "C", "D"])
+    assert (local["result"] == 1).sum() == (remote["result"] == 1).sum() == 3
+    columns = [col for col in remote.columns if col != "symptom_info"]
+    pd.testing.assert_frame_equal(_sorted(local, columns), _sorted(remote, columns), check_dtype=False)
+    assert _symptoms(local) == _symptoms(remote)
+
+def test_symptom_result_has_failed_tests_only(both_engines):
+    remote, local = both_engines(dq.symptom_result, ["A", "B", "C"])
+    assert (local["serial_number"] + local["station"]).tolist() == (remote["serial_number"] + remote["station"]).tolist()
+    assert len(local) == 4
+    assert _symptoms(local) == _symptoms(remote)
+
+def test_recommend_repairs_batch(both_engines):
+    remote, local = both_engines(dq.recommend_repairs_batch, ["A", "D"], "FT")
+    assert list(local) == list(remote) == ["A", "D"]
+    for sn in remote:
+        assert local[sn]["symptoms"] == remote[sn]["symptoms"]
+        pd.testing.assert_frame_equal(
+            _sorted(local[sn]["matching_repairs"]), _sorted(remote[sn]["matching_repairs"]), check_dtype=False
+        )
+        local_counts, remote_counts = local[sn]["symptom_counts"], remote[sn]["symptom_counts"]
+        assert local_counts["occurrence_count"].tolist() == remote_counts["occurrence_count"].tolist()
+        assert local_counts["repair_codes"].tolist() == remote_counts["repair_codes"].tolist()
+
+def test_legacy_extracts_keep_failed_tests_only(manufacturing_db):
+    # testing_result.csv / testing_symptom.csv hold failed tests; the cached extracts every test
+    assert sorted(dq.db_connect(dq.mtr_query)["rowid"]) == [1, 2, 4, 6]
+    assert sorted(dq.db_connect(dq.sym_query)["rowid"].unique()) == [1, 2, 4, 6]
+    assert sorted(dq.db_connect(ec.EXTRACTS["mtr_data"]["query"](dq.extract_start))["rowid"]) == list(range(1, 8))
+    assert ec.EXTRACTS["sym_data"]["query"] is dq.sym_all_extract_query
@@ -0,0 +1,48 @@
+import random
+import re
+import pytest
+import message_classifier as mc
+import reference
+from synthetic import MESSAGE_FRAGMENTS, failure_messages, random_message
+
+def _all_patterns(messages):
+    """Static patterns of PATTERN_DICT plus the ones its callable entries generate for `messages`."""
+    patterns = set()
+    for entry in mc.PATTERN_DICT.values():
+        for message in (messages if callable(entry) else [None]):
+            patterns.update(entry(message) if callable(entry) else entry)
+    return sorted(patterns)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matcher_agrees_with_re_search(seed):
+    rng = random.Random(seed)
+    messages = [random_message(rng) for _ in range(50)]
+    # Also random text, including regex metacharacters and newlines
+    messages += ["".join(rng.choice("abcXYZ019 .:-\n\r*()[]") for _ in range(rng.randint(0, 40))) for _ in range(20)]
+    pool = _all_patterns(MESSAGE_FRAGMENTS)
+    for _ in range(20):
+        patterns = tuple(rng.sample(pool, rng.randint(1, 8)))
+        for message in messages:
+            expected = tuple(i for i, pattern in enumerate(patterns) if re.search(pattern, message, mc.PATTERN_FLAGS))
+            assert mc.matched_patterns(patterns, message) == expected, (patterns, message)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_select_best_message_matches_reference(seed):
+    labels = list(mc.PATTERN_DICT) + ["other"]
+    failures, suggestions = failure_messages(300, labels, seed=seed)
+    for label, message in zip(failures["symptom_label"], failures["message"]):
+        candidates = suggestions[suggestions["symptom_label"] == label]
+        expected = reference.select_best_message(candidates, label, message, mc.PATTERN_DICT)
+        assert mc.select_best_message(candidates, label, message).name == expected.name
+
+def test_classify_messages_matches_reference():
+    labels = list(mc.PATTERN_DICT) + ["other"]
+    failures, suggestions = failure_messages(2000, labels, seed=42)
+    failures.loc[5, "symptom_label"] = "unknown label"
+    expected = [
+        reference.select_best_message(suggestions[suggestions["symptom_label"] == label], label, message, mc.PATTERN_DICT).name
+        if label in set(suggestions["symptom_label"]) else None
+        for label, message in zip(failures["symptom_label"], failures["message"])
+    ]
+    result = mc.classify_messages(failures, suggestions)
+    assert [None if value != value else value for value in result] == expected
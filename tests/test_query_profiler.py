@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from query_profiler import QueryProfiler, fingerprint, normalize_query
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT * FROM t WHERE id = 42;", "select * from t where id = ?"),
+    ("select *\n  from t -- trailing note\n where name = 'O''Brien'", "select * from t where name = ?"),
+    ("SELECT /* hint */ a FROM t WHERE x IN (%s, %s) AND y = %(y)s", "select a from t where x in (?, ?) and y = ?"),
+    ("SELECT a FROM t WHERE x = $1 AND y > ? AND z < 1.5", "select a from t where x = ? and y > ? and z < ?"),
+    ("SELECT col1, t2.col FROM t2", "select col1, t2.col from t2"),
+])
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+def test_fingerprint_groups_calls_differing_only_in_values():
+    assert fingerprint("SELECT * FROM t WHERE id = 1") == fingerprint("select *  from t\nwhere id = 2;")
+    assert fingerprint("SELECT * FROM t WHERE name = 'a'") == fingerprint("SELECT * FROM t WHERE name = %s")
+    assert fingerprint("SELECT * FROM t WHERE id = 1") != fingerprint("SELECT * FROM u WHERE id = 1")
+    assert len(fingerprint("SELECT 1")) == 12
+
+def _profiled_calls():
+    profiler = QueryProfiler()
+    df = pd.DataFrame({"a": range(3), "b": ["x", "y", "z"]})
+    profiler.record("postgres", "SELECT * FROM t WHERE id = 1", df, 0.5, 0.1)
+    profiler.record("postgres", "SELECT * FROM t WHERE id = 2", df.head(1), 1.5, 0.2)
+    profiler.record("access", "SELECT * FROM t WHERE id = 3", None, 0.25)
+    profiler.record("postgres", "SELECT * FROM u", df, 1.0, 0.3)
+    return profiler
+
+def test_summary_aggregates_per_source_and_fingerprint():
+    summary = _profiled_calls().summary()
+    assert summary[["source", "query", "calls", "rows"]].values.tolist() == [
+        ["postgres", "select * from t where id = ?", 2, 4],
+        ["postgres", "select * from u", 1, 3],
+        ["access", "select * from t where id = ?", 1, 0],
+    ]
+    first = summary.iloc[0]
+    assert first["total_wall_time"] == pytest.approx(2.0)
+    assert first["mean_wall_time"] == pytest.approx(1.0)
+    assert first["max_wall_time"] == pytest.approx(1.5)
+    assert first["total_build_time"] == pytest.approx(0.3)
+
+def test_bytes_are_shallow_unless_deep_memory():
+    df = pd.DataFrame({"s": ["a long string value " * 10] * 100})
+    shallow, deep = QueryProfiler(), QueryProfiler(deep_memory=True)
+    shallow.record("postgres", "SELECT s FROM t", df, 0.1)
+    deep.record("postgres", "SELECT s FROM t", df, 0.1)
+    assert shallow.to_frame()["bytes"].iloc[0] == df.memory_usage(index=False).sum()
+    assert deep.to_frame()["bytes"].iloc[0] == df.memory_usage(index=False, deep=True).sum()
+    assert deep.to_frame()["bytes"].iloc[0] > shallow.to_frame()["bytes"].iloc[0]
+
+def test_disabled_profiler_records_nothing():
+    profiler = QueryProfiler(enabled=False)
+    profiler.record("postgres", "SELECT 1", pd.DataFrame({"a": [1]}), 0.1)
+    assert profiler.to_frame().empty
+
+def test_max_records_keeps_the_latest_calls():
+    profiler = QueryProfiler(max_records=2)
+    for i in range(3):
+        profiler.record("postgres", f"SELECT * FROM t{i}", None, 0.1)
+    assert profiler.to_frame()["query"].tolist() == ["select * from t1", "select * from t2"]
+
+def test_to_csv_writes_calls_and_summary(tmp_path):
+    profiler = _profiled_calls()
+    profiler.to_csv(tmp_path / "calls.csv")
+    profiler.to_csv(tmp_path / "summary.csv", summary=True)
+    calls = pd.read_csv(tmp_path / "calls.csv", dtype={"fingerprint": str})
+    summary = pd.read_csv(tmp_path / "summary.csv", dtype={"fingerprint": str})
+    assert len(calls) == 4 and list(calls.columns) == list(profiler.to_frame().columns)
+    assert summary["calls"].tolist() == [2, 1, 1]
+    assert summary["fingerprint"].tolist() == profiler.summary()["fingerprint"].tolist()
+    profiler.clear()
+    assert profiler.to_frame().empty
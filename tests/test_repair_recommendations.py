@@ -0,0 +1,33 @@
+import data_query as dq
+
+def test_recommend_repairs_batch_matches_repaired_boards(manufacturing_db):
+    results = dq.recommend_repairs_batch(["'A'"], "FT")
+    assert list(results) == ["A"]
+    assert results["A"]["symptoms"] == {"fan fail"}
+    assert sorted(results["A"]["matching_repairs"]["serial_number"].unique()) == ["B", "C"]
+    assert results["A"]["symptom_counts"]["symptom_label"].tolist() == ["Fan Fail"]
+
+def test_recommend_repairs_batch_reports_unresolved_serials(manufacturing_db, capsys):
+    results = dq.recommend_repairs_batch(["A", "D", "E"], {"A": "FT", "E": "FT"})
+    assert list(results) == ["A"]
+    out = capsys.readouterr().out
+    assert "No work order found for: E" in out
+    assert "No station given for: D" in out
+
+def test_recommend_repairs_batch_follows_the_engine_switch(monkeypatch):
+    import local_engine
+    calls = []
+    monkeypatch.setattr(dq, "engine", "local")
+    monkeypatch.setattr(dq, "db_query", lambda *args, **kwargs: calls.append("remote"))
+    for name in ("serial_info", "repair_group_table", "symptom_result"):
+        monkeypatch.setattr(local_engine, name, lambda *args, name=name: calls.append(name) or _empty(name))
+    assert dq.recommend_repairs_batch(["A"], "FT") == {}
+    assert calls == ["serial_info", "symptom_result"]
+
+def _empty(name):
+    import pandas as pd
+    columns = {
+        "serial_info": ["serial_number", "model_name", "build_type", "skuno"],
+        "symptom_result": ["serial_number", "station", "test_start_time", "test_end_time", "symptom_info", "repair_code", "repaired_description"],
+    }
+    return pd.DataFrame(columns=columns.get(name, []))
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import schema as sc
+
+def _results():
+    return pd.DataFrame({
+        "serial_number": ["A", "B", "A", "C"],
+        "result": [0, 1, 1, 0],
+        "target_qty": [16777217, None, 3, 2**31 - 1],
+        "test_start_time": ["2024-08-01 10:00:00", "2024-08-02 10:00:00", None, "bad"],
+        "failed": ["x", "1", "0", "1"],
+        "notes": ["a", "b", "c", "d"],
+    })
+
+def test_apply_schema_casts_known_columns():
+    df = _results()
+    compact = sc.apply_schema(df)
+    assert compact["serial_number"].dtype == "category"
+    assert compact["result"].dtype == "int8"
+    assert compact["test_start_time"].dtype == "datetime64[ns]"
+    assert compact["test_start_time"].isna().tolist() == [False, False, True, True]
+    # Not convertible: left as it was; not in the schema: untouched
+    assert compact["failed"].dtype == object
+    assert compact["notes"].dtype == object
+    # The input frame is not modified
+    assert df["result"].dtype == "int64"
+
+def test_apply_schema_keeps_large_integers_with_nulls():
+    compact = sc.apply_schema(_results())
+    assert compact["target_qty"].dtype == "float64"
+    assert compact["target_qty"].tolist()[0] == 16777217
+    assert compact["target_qty"].tolist()[3] == 2**31 - 1
+    assert np.isnan(compact["target_qty"].tolist()[1])
+    # NULL is not a pass, as without the schema
+    nullable = sc.apply_schema(pd.DataFrame({"test_result": [1, None]}))
+    assert (nullable["test_result"] == 1).tolist() == [True, False]
+    assert sc.apply_schema(pd.DataFrame({"target_qty": [1, 2]}))["target_qty"].dtype == "int32"
+
+def test_apply_schema_lock_screw():
+    df = pd.DataFrame({
+        "LockScrewTime": pd.to_datetime(["2024-08-01 10:00:00", "2024-08-01 10:00:05"]),
+        "SN": ["A", "A"], "PointNumber": [1, 2], "LockScrewTable": ["L", "R"], "LockScrewResult": ["OK", "NG"],
+    })
+    compact = sc.apply_schema(df, sc.LOCK_SCREW_SCHEMA)
+    assert compact.dtypes.astype(str).to_dict() == sc.LOCK_SCREW_SCHEMA
+
+def test_apply_schema_report():
+    df = pd.DataFrame({"station": ["FT", "ICT"] * 500, "result": [0, 1] * 500})
+    compact, report = sc.apply_schema(df, report=True)
+    assert report["column"].tolist() == ["station", "result", "total"]
+    rows = report.set_index("column")
+    assert rows.loc["station", "dtype_before"] == "object" and rows.loc["station", "dtype_after"] == "category"
+    assert rows.loc["result", "bytes_before"] == 8000 and rows.loc["result", "bytes_after"] == 1000
+    assert rows.loc["result", "saved_pct"] == 87.5
+    assert rows.loc["total", "bytes_before"] == rows["bytes_before"].iloc[:2].sum()
+    assert rows.loc["total", "bytes_after"] == compact.memory_usage(index=False, deep=True).sum()
+
+def test_memory_report_of_dropped_column():
+    before = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    report = sc.memory_report(before, before[["a"]]).set_index("column")
+    assert np.isnan(report.loc["b", "bytes_after"])
+    assert report.loc["total", "bytes_after"] == 16
+
+def test_read_csv_applies_the_schema(tmp_path):
+    file_path = tmp_path / "testing_result.csv"
+    _results().to_csv(file_path, index=False)
+    df = sc.read_csv(file_path)
+    assert df["serial_number"].dtype == "category"
+    assert df["serial_number"].tolist() == ["A", "B", "A", "C"]
+    assert df["result"].dtype == "int8"
+    assert df["target_qty"].dtype == "float64" and df["target_qty"].tolist()[0] == 16777217
+    assert df["test_start_time"].dtype == "datetime64[ns]"
+    pd.testing.assert_frame_equal(df, sc.apply_schema(pd.read_csv(file_path)))
+    assert sc.read_csv(file_path, usecols=["serial_number", "result"]).columns.tolist() == ["serial_number", "result"]
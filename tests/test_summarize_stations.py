@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+import screw_utils as su
+from synthetic import lock_screw_records
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+RECORDS = lock_screw_records(100, seed=4, days=1)
+
+def _fail_for(bad_file, result):
+    def summarize(station_file, *args):
+        if station_file == bad_file:
+            raise OSError(f"{station_file} is locked")
+        return result(*args)
+    return summarize
+
+@pytest.mark.parametrize("current_month", [True, False])
+def test_one_failing_station_does_not_abort_the_others(monkeypatch, capsys, current_month):
+    if current_month:
+        monkeypatch.setattr(su, "_station_table_summary", _fail_for(
+            "bad.accdb", lambda side: su.summarize_hours(RECORDS.copy(), side)
+        ))
+    else:
+        monkeypatch.setattr(su, "backup_month_summaries", _fail_for(
+            "bad.accdb", lambda: su.summarize_hours(RECORDS.copy(), "Left") + su.summarize_hours(RECORDS.copy(), "Right")
+        ))
+    summaries = su.summarize_stations({"station1": "good.accdb", "station2": "bad.accdb"}, current_month=current_month)
+    assert sorted(summaries) == [("station1", "Left"), ("station1", "Right")]
+    assert "Error summarizing station2" in capsys.readouterr().out
+
+    overview = su.station_yield_overview(summaries, RECORDS["LockScrewTime"].iloc[0])
+    assert overview["Station"].tolist() == ["station1", "station1"]
+    assert overview["Total_Boards"].sum() > 0
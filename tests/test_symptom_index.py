@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+import data_query as dq
+from symptom_index import SymptomIndex
+from synthetic import repair_table
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+def _reindex(df, how, seed):
+    """Same rows under a non-RangeIndex: shuffled, string or duplicated labels."""
+    if how == "shuffled":
+        return df.set_axis(np.random.default_rng(seed).permutation(len(df)) * 10)
+    if how == "string":
+        return df.set_axis([f"row{i}" for i in range(len(df))])
+    if how == "duplicated":
+        return df.set_axis(np.arange(len(df)) // 3)
+    return df
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("normalized", [False, True])
+@pytest.mark.parametrize("how", ["range", "shuffled", "string", "duplicated"])
+def test_index_and_batch_match_the_scan(seed, normalized, how):
+    repair_df = _reindex(repair_table(80, seed=seed, normalized=normalized), how, seed)
+    serials = sorted(repair_df["serial_number"].unique()) + ["SN-unknown"]
+    index = SymptomIndex.from_repair_table(repair_df)
+    batch = dq.find_matching_repairs_batch(repair_df, serials)
+    for sn in serials:
+        scan_set, scan_df = dq.find_matching_repairs(repair_df.copy(), sn)
+        index_set, index_df = dq.find_matching_repairs(repair_df.copy(), sn, index=index)
+        assert index_set == scan_set == batch[sn][0]
+        pd.testing.assert_frame_equal(index_df, scan_df)
+        pd.testing.assert_frame_equal(batch[sn][1], scan_df)
+
+def test_add_appends_positions():
+    repair_df = repair_table(60, seed=1)
+    index = SymptomIndex.from_repair_table(repair_df.iloc[:30])
+    index.add(repair_df.iloc[30:])
+    full = SymptomIndex.from_repair_table(repair_df)
+    assert index.n_rows == full.n_rows == 60
+    for sn in repair_df["serial_number"].unique():
+        assert index.rows_for([sn]) == full.rows_for([sn])
+        assert index.matching_serials(sn) == full.matching_serials(sn)
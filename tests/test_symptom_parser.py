@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+import data_query as dq
+import reference
+from synthetic import symptom_results
+
+@pytest.mark.parametrize("seed", range(100))
+def test_process_symptom_info_matches_reference(seed):
+    df = symptom_results(60, seed=seed)
+    pd.testing.assert_frame_equal(dq.process_symptom_info(df.copy()), reference.process_symptom_info(df.copy()))
+
+@pytest.mark.parametrize("seed", range(100))
+def test_extract_symptom_info_matches_reference(seed):
+    df = symptom_results(60, seed=seed)
+    pd.testing.assert_frame_equal(dq.extract_symptom_info(df), reference.extract_symptom_info(df))
+
+@pytest.mark.parametrize("seed", range(100))
+def test_count_symptom_occurrences_matches_reference(seed):
+    df = symptom_results(60, seed=seed)
+    result = dq.count_symptom_occurrences_with_repairs(df)
+    expected = reference.count_symptom_occurrences_with_repairs(df)
+    # Ties in occurrence_count have no defined order
+    key = ["occurrence_count", "symptom_msg", "symptom_label"]
+    pd.testing.assert_frame_equal(
+        result.sort_values(key, ascending=[False, True, True]).reset_index(drop=True),
+        expected.sort_values(key, ascending=[False, True, True]).reset_index(drop=True),
+    )
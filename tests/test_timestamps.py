@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+import data_query as dq
+import schema as sc
+
+# Both sides of the 2024-03-31 switch to summer time in Europe/Berlin
+QUERY = '''
+    SELECT ts, ts::timestamp AS naive, ts::date AS day
+    FROM unnest(ARRAY['2024-03-30 12:00:00+00', NULL, '2024-04-01 12:00:00+00']::timestamptz[]) ts
+'''
+
+@pytest.mark.parametrize("timezone, expected", [
+    ("Europe/Berlin", ["2024-03-30 13:00:00", None, "2024-04-01 14:00:00"]),
+    ("UTC", ["2024-03-30 12:00:00", None, "2024-04-01 12:00:00"]),
+])
+def test_timestamptz_converted_to_timezone(dq_pool, monkeypatch, timezone, expected):
+    monkeypatch.setattr(sc, "TIMEZONE", timezone)
+    df = dq.db_connect(QUERY)
+    assert df["ts"].dtype == "datetime64[ns]"
+    pd.testing.assert_series_equal(df["ts"], pd.Series(pd.to_datetime(expected), name="ts"))
+    # timestamp without time zone is the server's wall clock in the UTC session
+    pd.testing.assert_series_equal(df["naive"], pd.Series(pd.to_datetime(["2024-03-30 12:00:00", None, "2024-04-01 12:00:00"]), name="naive"))
+    assert df["day"].dtype == "datetime64[ns]"
+
+def test_streamed_chunks_match(dq_pool, monkeypatch):
+    monkeypatch.setattr(sc, "TIMEZONE", "Europe/Berlin")
+    streamed = pd.concat(dq.db_stream(QUERY, itersize=2), ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, dq.db_connect(QUERY))
+
+def test_sessions_not_in_utc_are_normalized_too(monkeypatch):
+    offsets = pd.Series([
+        pd.Timestamp("2024-03-30 13:00:00+01:00").to_pydatetime(),
+        None,
+        pd.Timestamp("2024-04-01 14:00:00+02:00").to_pydatetime(),
+    ], dtype=object)
+    monkeypatch.setattr(sc, "TIMEZONE", "UTC")
+    pd.testing.assert_series_equal(sc._naive_timestamps(offsets), pd.Series(pd.to_datetime(["2024-03-30 12:00:00", None, "2024-04-01 12:00:00"])))
+
+@pytest.mark.parametrize("prepared", [False, True])
+def test_timestamp_parameters_are_wall_clock_time_in_timezone(dq_pool, monkeypatch, prepared):
+    from query_templates import QueryTemplate
+    monkeypatch.setattr(sc, "TIMEZONE", "Asia/Taipei")
+    # 10:00 in Taipei is 02:00 UTC
+    aware = QueryTemplate("t_since_tz", "SELECT count(*) AS n FROM (VALUES (TIMESTAMPTZ '2024-08-01 02:00:00+00')) v(t) WHERE t >= %(since)s", since="timestamptz")
+    naive = QueryTemplate("t_since", "SELECT count(*) AS n FROM (VALUES (TIMESTAMP '2024-08-01 10:00:00')) v(t) WHERE t >= %(since)s", since="timestamp")
+    for template in (aware, naive):
+        assert dq.db_query(template, {"since": "2024-08-01 10:00:00"}, prepared=prepared)["n"].tolist() == [1]
+        assert dq.db_query(template, {"since": pd.Timestamp("2024-08-01 10:00:01")}, prepared=prepared)["n"].tolist() == [0]
+        assert dq.db_query(template, {"since": pd.Timestamp("2024-08-01 02:00:00", tz="UTC")}, prepared=prepared)["n"].tolist() == [1]
+
+def test_timestamp_param_of_dst_changes(monkeypatch):
+    monkeypatch.setattr(sc, "TIMEZONE", "Europe/Berlin")
+    assert sc.timestamp_param("2024-03-31 02:30:00") == "2024-03-31T01:59:59+01:00"
+    assert sc.timestamp_param("2024-10-27 02:30:00") == "2024-10-27T02:30:00+02:00"
+    assert sc.timestamp_param(pd.Timestamp("2024-08-01 10:00:00.123456789")) == "2024-08-01T10:00:00.123456+02:00"
+    assert sc.naive_timestamp("2024-10-27T00:30:00+00:00") == pd.Timestamp("2024-10-27 02:30:00")